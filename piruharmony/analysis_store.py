@@ -0,0 +1,161 @@
+import hashlib
+import json
+import sqlite3
+
+import numpy as np
+
+from instruments import MUTED
+from voicing_index import frets_array
+
+
+"""
+Songs are looked up by batches of at most LOOKUP_BATCH_SIZE digests,
+one query per batch, below the number of parameters SQLite accepts in
+a statement.
+"""
+LOOKUP_BATCH_SIZE = 500
+DIGEST_FORMAT = b'piruharmony-frets-2'
+
+
+def frets_digest(instrument, frets_vectors):
+    """
+    Returns the normalized digest of a song played on a strings
+    instrument.
+
+    The digest only depends on the sounding notes: the open strings are
+    refered to by their keyboard notes indices, so that enharmonic
+    tunings match, and fret vectors where all the strings are muted,
+    which stand for the spacing of the tab, are dropped. Copies of a
+    tab which only differ by whitespace, bar lines or spacing thus
+    share their digest, while repeated chords are kept.
+
+    Parameters
+    ----------
+    instrument : StringsInstrument
+        The instrument the song is played on.
+    frets_vectors : list of lists of int or None, or numpy array
+        Fret of each string of each voicing of the song, as given to
+        StringsInstrument.to_keyboard, or an array of them where muted
+        strings are set to MUTED.
+
+    Returns
+    -------
+    out : bytes
+        SHA-256 digest of the tuning and the normalized fret vectors.
+
+    Examples
+    --------
+    >>> frets_digest(guitar(), [[None, 3, 2, 0, 1, 0], [None] * 6, [None, 3, 2, 0, 1, 0]]) == frets_digest(guitar(), [[None, 3, 2, 0, 1, 0]] * 2)
+    True
+    >>> frets_digest(guitar(), [[None, 3, 2, 0, 1, 0]] * 2) == frets_digest(guitar(), [[None, 3, 2, 0, 1, 0]])
+    False
+    """
+    frets = np.asarray(frets_vectors, dtype = np.int8) if isinstance(frets_vectors, np.ndarray) else frets_array(frets_vectors, instrument.count_strings())
+    frets = frets.reshape(len(frets), instrument.count_strings())
+    frets = frets[np.any(frets != MUTED, axis = 1)]
+    digest = hashlib.sha256(DIGEST_FORMAT)
+    digest.update(np.asarray(instrument.open_strings(), dtype = '<i8').tobytes())
+    digest.update(np.ascontiguousarray(frets).tobytes())
+    return digest.digest()
+
+
+def analysis_store(path):
+    """
+    Returns an instance of class AnalysisStore.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite database, created if it does not exist.
+
+    Returns
+    -------
+    out : AnalysisStore
+        The instance of class AnalysisStore backed by the database.
+
+    See Also
+    --------
+    AnalysisStore : a class that stores the analyses of songs by
+        digest.
+
+    Examples
+    --------
+    >>> with analysis_store('analyses.sqlite') as store:
+    ...     digests = [frets_digest(guitar(), song) for song in songs]
+    ...     missing_digests = store.missing(digests)
+    """
+    return AnalysisStore(path)
+
+
+class AnalysisStore:
+    """
+    A class that stores the analyses of songs by digest.
+
+    Analyses are kept in a local SQLite database, keyed by the digest
+    returned by frets_digest, so that batch jobs skip songs already
+    analyzed, whatever the copy of the tab they were read from.
+    Analyses are any JSON serializable value. Lookups and insertions
+    are batched: a single query reads LOOKUP_BATCH_SIZE digests, and
+    a single transaction stores a whole batch of analyses.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite database, created if it does not exist.
+
+    Examples
+    --------
+    >>> store = AnalysisStore('analyses.sqlite')
+    >>> digest = frets_digest(guitar(), [[None, 3, 2, 0, 1, 0]])
+    >>> store.store([digest], [['C', 'MAJOR_TRIAD']])
+    >>> store.analyses([digest])
+    [['C', 'MAJOR_TRIAD']]
+    >>> store.close()
+    """
+    def __init__(self, path):
+        """ Builds an instance of AnalysisStore """
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS analyses (digest BLOB PRIMARY KEY, analysis TEXT NOT NULL) WITHOUT ROWID')
+
+    def __enter__(self):
+        """ Returns the store, closed when leaving the with block """
+        return self
+
+    def __exit__(self, *exception):
+        """ Closes the store """
+        self.close()
+
+    def close(self):
+        """ Closes the database """
+        self._connection.close()
+
+    def count_analyses(self):
+        """ Returns the number of stored analyses """
+        return self._connection.execute('SELECT COUNT(*) FROM analyses').fetchone()[0]
+
+    def _stored_analyses(self, digests):
+        """ Returns the JSON text of the stored analyses by digest """
+        digests = list(set(digests))
+        stored_analyses = {}
+        for batch_start in range(0, len(digests), LOOKUP_BATCH_SIZE):
+            batch = digests[batch_start:batch_start + LOOKUP_BATCH_SIZE]
+            query = 'SELECT digest, analysis FROM analyses WHERE digest IN ({})'.format(', '.join(['?'] * len(batch)))
+            stored_analyses.update(self._connection.execute(query, batch).fetchall())
+        return stored_analyses
+
+    def missing(self, digests):
+        """ Returns the digests, in order and without duplicates, which have no stored analysis """
+        stored_analyses = self._stored_analyses(digests)
+        return list(dict.fromkeys([digest for digest in digests if digest not in stored_analyses]))
+
+    def analyses(self, digests):
+        """ Returns the stored analysis of each digest, None if it has none """
+        stored_analyses = self._stored_analyses(digests)
+        return [json.loads(stored_analyses[digest]) if digest in stored_analyses else None for digest in digests]
+
+    def store(self, digests, analyses):
+        """ Stores the analyses of digests in a single transaction, keeping already stored analyses """
+        with self._connection:
+            self._connection.executemany('INSERT OR IGNORE INTO analyses (digest, analysis) VALUES (?, ?)',
+                                         [(digest, json.dumps(analysis)) for (digest, analysis) in zip(digests, analyses)])
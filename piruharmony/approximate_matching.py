@@ -0,0 +1,159 @@
+import numpy as np
+
+from theory import ChordHarmonicProperties, IntervalsTypes, KEYS_SPELLINGS, PITCH_CLASSES_TONALITIES, N_SEMITONES_IN_OCTAVE, chord_type_mask, pitch_classes_mask
+from chroma import CHROMA_CHORDS_TYPES
+from set_classes import N_PITCH_CLASSES_SETS, voicings_masks
+from shared_tables import table
+
+
+DEFAULT_MISSING_ROOT_WEIGHT = 2.
+DEFAULT_MISSING_FIFTH_WEIGHT = .25
+DEFAULT_MISSING_NOTE_WEIGHT = 1.
+DEFAULT_EXTRA_NOTE_WEIGHT = .5
+DEFAULT_TOLERANCE = 1.
+APPROXIMATE_MATCHING_TABLE = 'approximate_matching'
+
+
+def approximate_chord_matcher(chords_types = CHROMA_CHORDS_TYPES, missing_root_weight = DEFAULT_MISSING_ROOT_WEIGHT, missing_fifth_weight = DEFAULT_MISSING_FIFTH_WEIGHT,
+                              missing_note_weight = DEFAULT_MISSING_NOTE_WEIGHT, extra_note_weight = DEFAULT_EXTRA_NOTE_WEIGHT):
+    """
+    Returns an instance of class ApproximateChordMatcher.
+
+    Parameters
+    ----------
+    chords_types : list of fields of enum ChordsTypes, optional
+        Overrides CHROMA_CHORDS_TYPES. The chords types voicings are
+        matched against.
+    missing_root_weight : float, optional
+        Overrides DEFAULT_MISSING_ROOT_WEIGHT. Cost of a chord's root
+        missing from the voicing.
+    missing_fifth_weight : float, optional
+        Overrides DEFAULT_MISSING_FIFTH_WEIGHT. Cost of a chord's
+        perfect fifth missing from the voicing.
+    missing_note_weight : float, optional
+        Overrides DEFAULT_MISSING_NOTE_WEIGHT. Cost of any other note
+        of a chord missing from the voicing.
+    extra_note_weight : float, optional
+        Overrides DEFAULT_EXTRA_NOTE_WEIGHT. Cost of each pitch class
+        of the voicing out of the chord.
+
+    Returns
+    -------
+    out : ApproximateChordMatcher
+        The instance of class ApproximateChordMatcher built with the
+        input parameters.
+
+    See Also
+    --------
+    ApproximateChordMatcher : a class that matches voicings against
+        chords, tolerating missing and extra notes.
+
+    Examples
+    --------
+    >>> matcher = approximate_chord_matcher()
+    >>> matcher.best_chord_properties([27, 29, 31, 34]).base_type().name # C, D, E, G: D is a passing note
+    'MAJOR_TRIAD'
+    """
+    return ApproximateChordMatcher(chords_types, missing_root_weight, missing_fifth_weight, missing_note_weight, extra_note_weight)
+
+
+def _approximate_matching_arrays(chords_types, missing_root_weight, missing_fifth_weight, missing_note_weight, extra_note_weight):
+    """ Returns the costs of every label for every pitch classes bitmask, and the labels sorted by cost """
+    pitch_classes = np.arange(N_SEMITONES_IN_OCTAVE)
+    weights, membership = [], []
+    for chord_type in chords_types:
+        type_membership = ((chord_type_mask(chord_type) >> pitch_classes) & 1).astype(np.float32)
+        type_weights = np.zeros(N_SEMITONES_IN_OCTAVE, dtype = np.float32)
+        type_weights[type_membership == 1] = missing_note_weight
+        if IntervalsTypes.FIFTH in chord_type.value:
+            type_weights[IntervalsTypes.FIFTH.value.count_semitones()] = missing_fifth_weight
+        type_weights[0] = missing_root_weight
+        weights += [np.roll(type_weights, root) for root in pitch_classes]
+        membership += [np.roll(type_membership, root) for root in pitch_classes]
+    weights, membership = np.array(weights), np.array(membership)
+    masks_bits = ((np.arange(N_PITCH_CLASSES_SETS)[:, np.newaxis] >> pitch_classes) & 1).astype(np.float32)
+    missing_costs = (1. - masks_bits) @ weights.T
+    extra_costs = extra_note_weight * (masks_bits @ (1. - membership).T)
+    costs = missing_costs + extra_costs
+    sorted_labels = np.argsort(costs, axis = 1, kind = 'stable').astype(np.int16)
+    return {'costs': costs, 'sorted_labels': sorted_labels, 'sorted_costs': np.take_along_axis(costs, sorted_labels, axis = 1)}
+
+
+class ApproximateChordMatcher:
+    """
+    A class that matches voicings against chords, tolerating missing
+    and extra notes.
+
+    The cost of a (root, chord type) label is a weighted Hamming
+    distance between pitch classes bitmasks: the weights of the chord's
+    notes missing from the voicing, plus a weight per voicing's note
+    out of the chord. Costs of every label are precomputed for all the
+    4096 pitch classes bitmasks, as well as labels sorted by cost, so
+    that matching a voicing takes constant time. These arrays form a
+    table of module shared_tables, named after the chords types and
+    weights, so that worker processes can attach them from shared
+    memory.
+    Labels are laid out as in ChromaChordMatcher.
+
+    Parameters
+    ----------
+    chords_types : list of fields of enum ChordsTypes, optional
+        Overrides CHROMA_CHORDS_TYPES.
+    missing_root_weight : float, optional
+        Overrides DEFAULT_MISSING_ROOT_WEIGHT.
+    missing_fifth_weight : float, optional
+        Overrides DEFAULT_MISSING_FIFTH_WEIGHT.
+    missing_note_weight : float, optional
+        Overrides DEFAULT_MISSING_NOTE_WEIGHT.
+    extra_note_weight : float, optional
+        Overrides DEFAULT_EXTRA_NOTE_WEIGHT.
+
+    Examples
+    --------
+    >>> matcher = ApproximateChordMatcher()
+    >>> [(cost, tonality, chord_type.name) for (cost, (tonality, chord_type)) in matcher.matches([22, 26, 29, 32, 33], tolerance = .5)] # G7 and a sloppy F#
+    [(0.5, 'G', 'SEVENTH'), (0.5, 'G', 'MAJOR_SEVENTH')]
+    """
+    def __init__(self, chords_types = CHROMA_CHORDS_TYPES, missing_root_weight = DEFAULT_MISSING_ROOT_WEIGHT, missing_fifth_weight = DEFAULT_MISSING_FIFTH_WEIGHT,
+                 missing_note_weight = DEFAULT_MISSING_NOTE_WEIGHT, extra_note_weight = DEFAULT_EXTRA_NOTE_WEIGHT):
+        """ Builds an instance of ApproximateChordMatcher """
+        self._chords_types = list(chords_types)
+        self._labels = [(PITCH_CLASSES_TONALITIES[root], chord_type) for chord_type in self._chords_types for root in range(N_SEMITONES_IN_OCTAVE)]
+        weights = (missing_root_weight, missing_fifth_weight, missing_note_weight, extra_note_weight)
+        table_name = APPROXIMATE_MATCHING_TABLE + repr(([chord_type.name for chord_type in self._chords_types], weights))
+        arrays = table(table_name, lambda: _approximate_matching_arrays(self._chords_types, *weights))
+        self._costs = arrays['costs']
+        self._sorted_labels = arrays['sorted_labels']
+        self._sorted_costs = arrays['sorted_costs']
+
+    def labels(self):
+        """ Returns the (tonality, base type) label of each template """
+        return self._labels
+
+    def count_labels(self):
+        """ Returns the number of labels """
+        return self._costs.shape[1]
+
+    def costs(self, masks):
+        """ Returns the (n_masks, n_labels) costs of pitch classes bitmasks """
+        return self._costs[masks]
+
+    def best_labels_indices(self, voicings):
+        """ Returns the index of the cheapest label and its cost for each voicing """
+        masks = voicings_masks(voicings)
+        return self._sorted_labels[masks, 0].astype(np.intp), self._sorted_costs[masks, 0]
+
+    def matches(self, i_notes_on_keyboard, tolerance = DEFAULT_TOLERANCE):
+        """ Returns the (cost, (tonality, base type)) of the labels within tolerance of a voicing, cheapest first """
+        mask = pitch_classes_mask(i_notes_on_keyboard)
+        n_matches = int(np.searchsorted(self._sorted_costs[mask], tolerance, side = 'right'))
+        return [(float(cost), self._labels[i_label]) for (cost, i_label) in zip(self._sorted_costs[mask, :n_matches], self._sorted_labels[mask, :n_matches])]
+
+    def best_chord_properties(self, i_notes_on_keyboard, tolerance = DEFAULT_TOLERANCE, key = None):
+        """ Returns the ChordHarmonicProperties of the cheapest label, spelled in key if given, None if its cost exceeds tolerance """
+        mask = pitch_classes_mask(i_notes_on_keyboard)
+        if self._sorted_costs[mask, 0] > tolerance:
+            return None
+        i_type, root = divmod(int(self._sorted_labels[mask, 0]), N_SEMITONES_IN_OCTAVE)
+        tonality = KEYS_SPELLINGS[key][root] if key != None else PITCH_CLASSES_TONALITIES[root]
+        return ChordHarmonicProperties(tonality, self._chords_types[i_type], [])
@@ -0,0 +1,199 @@
+from functools import lru_cache
+
+from theory import CHORDS_TYPES, ChordHarmonicProperties, ChordsTypes, IntervalsTypes, VALID_TONES, compact_harmonic_properties, enrichments_mask, mask_enrichments
+
+
+"""
+Symbol of each chord type, written right after the chord's tonality.
+"""
+CHORDS_TYPES_SYMBOLS = {
+    ChordsTypes.MAJOR_TRIAD               : '',
+    ChordsTypes.MINOR_TRIAD               : 'm',
+    ChordsTypes.AUGMENTED_TRIAD           : 'aug',
+    ChordsTypes.DIMINISHED_TRIAD          : 'dim',
+    ChordsTypes.SEVENTH                   : '7',
+    ChordsTypes.MAJOR_SEVENTH             : 'maj7',
+    ChordsTypes.MINOR_SEVENTH             : 'm7',
+    ChordsTypes.MINOR_MAJOR_SEVENTH       : 'mmaj7',
+    ChordsTypes.SEVENTH_TRIAD             : '7no5',
+    ChordsTypes.MAJOR_SEVENTH_TRIAD       : 'maj7no5',
+    ChordsTypes.MINOR_SEVENTH_TRIAD       : 'm7no5',
+    ChordsTypes.MINOR_MAJOR_SEVENTH_TRIAD : 'mmaj7no5',
+    ChordsTypes.HALF_DIMINISHED_SEVENTH   : 'm7b5',
+    ChordsTypes.AUGMENTED_MAJOR_SEVENTH   : 'maj7#5',
+    ChordsTypes.DIMINISHED_SEVENTH        : 'dim7',
+    ChordsTypes.POWER_CHORD               : '5',
+    ChordsTypes.MAJOR_THIRD_ALONE         : 'no5',
+    ChordsTypes.MINOR_THIRD_ALONE         : 'mno5',
+    ChordsTypes.UNKNOWN                   : '?'
+}
+
+
+"""
+Symbol of each interval type when written as an enrichment, between
+parentheses after the chord type's symbol.
+"""
+ENRICHMENTS_SYMBOLS = {
+    IntervalsTypes.DIMINISHED_NINTH   : 'b9',
+    IntervalsTypes.NINTH              : '9',
+    IntervalsTypes.AUGMENTED_NINTH    : '#9',
+    IntervalsTypes.DIMINISHED_THIRD   : 'bb3',
+    IntervalsTypes.MINOR_THIRD        : 'b3',
+    IntervalsTypes.MAJOR_THIRD        : '3',
+    IntervalsTypes.AUGMENTED_THIRD    : '#3',
+    IntervalsTypes.DIMINISHED_FOURTH  : 'b11',
+    IntervalsTypes.FOURTH             : '11',
+    IntervalsTypes.AUGMENTED_FOURTH   : '#11',
+    IntervalsTypes.DIMINISHED_FIFTH   : 'b5',
+    IntervalsTypes.FIFTH              : '5',
+    IntervalsTypes.AUGMENTED_FIFTH    : '#5',
+    IntervalsTypes.DIMINISHED_SIXTH   : 'b13',
+    IntervalsTypes.SIXTH              : '13',
+    IntervalsTypes.AUGMENTED_SIXTH    : '#13',
+    IntervalsTypes.DIMINISHED_SEVENTH : 'bb7',
+    IntervalsTypes.MINOR_SEVENTH      : 'b7',
+    IntervalsTypes.MAJOR_SEVENTH      : '7',
+    IntervalsTypes.DIMINISHED_OCTAVE  : 'b8',
+    IntervalsTypes.UNKNOWN            : '?'
+}
+
+
+"""
+Alternative spellings of chords types symbols accepted by the parser.
+"""
+CHORDS_TYPES_SYMBOLS_ALIASES = {
+    'M'     : ChordsTypes.MAJOR_TRIAD,
+    'maj'   : ChordsTypes.MAJOR_TRIAD,
+    'min'   : ChordsTypes.MINOR_TRIAD,
+    '-'     : ChordsTypes.MINOR_TRIAD,
+    '+'     : ChordsTypes.AUGMENTED_TRIAD,
+    '°'     : ChordsTypes.DIMINISHED_TRIAD,
+    'M7'    : ChordsTypes.MAJOR_SEVENTH,
+    'Δ'     : ChordsTypes.MAJOR_SEVENTH,
+    'Δ7'    : ChordsTypes.MAJOR_SEVENTH,
+    'min7'  : ChordsTypes.MINOR_SEVENTH,
+    '-7'    : ChordsTypes.MINOR_SEVENTH,
+    'mM7'   : ChordsTypes.MINOR_MAJOR_SEVENTH,
+    'ø'     : ChordsTypes.HALF_DIMINISHED_SEVENTH,
+    'ø7'    : ChordsTypes.HALF_DIMINISHED_SEVENTH,
+    '-7b5'  : ChordsTypes.HALF_DIMINISHED_SEVENTH,
+    '+M7'   : ChordsTypes.AUGMENTED_MAJOR_SEVENTH,
+    '°7'    : ChordsTypes.DIMINISHED_SEVENTH
+}
+ENRICHMENTS_SEPARATOR = ','
+
+
+"""
+Symbol tables used by the parser, compiled once from the tables above.
+"""
+_SYMBOLS_CHORDS_TYPES = dict(CHORDS_TYPES_SYMBOLS_ALIASES, **{symbol: chord_type for (chord_type, symbol) in CHORDS_TYPES_SYMBOLS.items()})
+_SYMBOLS_ENRICHMENTS = {symbol: interval_type for (interval_type, symbol) in ENRICHMENTS_SYMBOLS.items()}
+_ALTERATIONS_CHARS = '#b'
+SYMBOLS_CACHE_SIZE = 1 << 12
+
+
+@lru_cache(maxsize = SYMBOLS_CACHE_SIZE)
+def _rendered_suffix(base_type_code, enrichments_code):
+    """ Returns the part of a chord symbol following the tonality """
+    enrichments = mask_enrichments(enrichments_code)
+    suffix = CHORDS_TYPES_SYMBOLS[CHORDS_TYPES[base_type_code]]
+    if len(enrichments) > 0:
+        suffix += '(' + ENRICHMENTS_SEPARATOR.join([ENRICHMENTS_SYMBOLS[interval_type] for interval_type in enrichments]) + ')'
+    return suffix
+
+
+@lru_cache(maxsize = SYMBOLS_CACHE_SIZE)
+def _parsed_suffix(suffix):
+    """ Returns the base type and sorted enrichments of the part of a chord symbol following the tonality """
+    i_enrichments = suffix.find('(')
+    if i_enrichments < 0:
+        type_symbol, enrichments_symbols = suffix, []
+    elif suffix.endswith(')'):
+        type_symbol, enrichments_symbols = suffix[:i_enrichments], suffix[i_enrichments + 1:-1].split(ENRICHMENTS_SEPARATOR)
+    else:
+        raise ValueError('Unbalanced enrichments parentheses: ' + suffix)
+    if type_symbol not in _SYMBOLS_CHORDS_TYPES:
+        raise ValueError('Unknown chord type symbol: ' + type_symbol)
+    enrichments = []
+    for enrichment_symbol in enrichments_symbols:
+        if enrichment_symbol.strip() not in _SYMBOLS_ENRICHMENTS:
+            raise ValueError('Unknown enrichment symbol: ' + enrichment_symbol)
+        enrichments.append(_SYMBOLS_ENRICHMENTS[enrichment_symbol.strip()])
+    return _SYMBOLS_CHORDS_TYPES[type_symbol], tuple(mask_enrichments(enrichments_mask(enrichments)))
+
+
+def chord_symbol(chord_properties):
+    """
+    Returns the conventional symbol of a chord.
+
+    Parameters
+    ----------
+    chord_properties : ChordHarmonicProperties
+        The properties of the chord.
+
+    Returns
+    -------
+    out : str
+        The chord's tonality, followed by the symbol of its base type
+        and by its enrichments between parentheses, sorted as the
+        intervals of a chord are.
+
+    See Also
+    --------
+    parsed_chord_symbol : Returns the harmonic properties of a chord
+        symbol.
+
+    Examples
+    --------
+    >>> chord_symbol(ChordHarmonicProperties('F#', ChordsTypes.HALF_DIMINISHED_SEVENTH, [IntervalsTypes.FOURTH]))
+    'F#m7b5(11)'
+    >>> chord_symbol(ChordHarmonicProperties('Bb', ChordsTypes.SEVENTH, [IntervalsTypes.AUGMENTED_FOURTH, IntervalsTypes.NINTH]))
+    'Bb7(9,#11)'
+    """
+    compact_properties = compact_harmonic_properties(chord_properties)
+    return chord_properties.tonality() + _rendered_suffix(compact_properties.base_type_code(), compact_properties.enrichments_code())
+
+
+def parsed_chord_symbol(symbol):
+    """
+    Returns the harmonic properties of a chord symbol.
+
+    Parameters
+    ----------
+    symbol : str
+        Chord symbol, as rendered by chord_symbol. Aliases of
+        CHORDS_TYPES_SYMBOLS_ALIASES are accepted.
+
+    Returns
+    -------
+    out : ChordHarmonicProperties
+        The properties of the chord, enrichments sorted as the
+        intervals of a chord are.
+
+    Raises
+    ------
+    ValueError
+        If the symbol does not start with a tonality or holds an
+        unknown chord type or enrichment.
+
+    Examples
+    --------
+    >>> chord_properties = parsed_chord_symbol('F#m7b5(11)')
+    >>> chord_properties.tonality(), chord_properties.base_type().name, [interval.name for interval in chord_properties.enrichments()]
+    ('F#', 'HALF_DIMINISHED_SEVENTH', ['FOURTH'])
+    """
+    if len(symbol) == 0 or symbol[0] not in VALID_TONES:
+        raise ValueError('Chord symbol does not start with a tonality: ' + symbol)
+    tonality_length = 2 if len(symbol) > 1 and symbol[1] in _ALTERATIONS_CHARS else 1
+    base_type, enrichments = _parsed_suffix(symbol[tonality_length:])
+    return ChordHarmonicProperties(symbol[:tonality_length], base_type, list(enrichments))
+
+
+def chords_symbols(chords_properties):
+    """ Returns the symbol of each ChordHarmonicProperties of a list, None where there is no chord """
+    return [chord_symbol(chord_properties) if chord_properties != None else None for chord_properties in chords_properties]
+
+
+def parsed_chords_symbols(symbols):
+    """ Returns the ChordHarmonicProperties of each symbol of a list """
+    return [parsed_chord_symbol(symbol) for symbol in symbols]
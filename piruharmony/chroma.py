@@ -0,0 +1,137 @@
+import numpy as np
+
+from theory import ChordsTypes, PITCH_CLASSES_TONALITIES, N_SEMITONES_IN_OCTAVE, chord_type_mask
+
+
+"""
+Gathers the chords types that are matched against chroma vectors.
+UNKNOWN has no template and is left out.
+"""
+CHROMA_CHORDS_TYPES = [chord_type for chord_type in ChordsTypes if chord_type != ChordsTypes.UNKNOWN]
+DEFAULT_BLOCK_SIZE = 4096
+
+
+def chroma_templates(chords_types = CHROMA_CHORDS_TYPES):
+    """
+    Returns the chroma templates of chords types built over all roots.
+
+    Parameters
+    ----------
+    chords_types : list of fields of enum ChordsTypes, optional
+        Overrides CHROMA_CHORDS_TYPES. The compiled chords types.
+
+    Returns
+    -------
+    out : numpy array of shape (len(chords_types) * 12, 12)
+        Unit-norm binary templates. Row i_type * 12 + i_root is the
+        template of chords_types[i_type] built over pitch class
+        i_root, C being pitch class 0.
+
+    Examples
+    --------
+    >>> templates = chroma_templates([ChordsTypes.MAJOR_TRIAD])
+    >>> templates.shape
+    (12, 12)
+    >>> np.flatnonzero(templates[0])
+    array([0, 4, 7])
+    """
+    pitch_classes = np.arange(N_SEMITONES_IN_OCTAVE)
+    masks = np.array([chord_type_mask(chord_type, root) for chord_type in chords_types for root in pitch_classes])
+    templates = ((masks[:, np.newaxis] >> pitch_classes) & 1).astype(np.float32)
+    return templates / np.linalg.norm(templates, axis = 1, keepdims = True)
+
+
+def chroma_chord_matcher(chords_types = CHROMA_CHORDS_TYPES):
+    """
+    Returns an instance of class ChromaChordMatcher.
+
+    Parameters
+    ----------
+    chords_types : list of fields of enum ChordsTypes, optional
+        Overrides CHROMA_CHORDS_TYPES. The chords types chroma frames
+        are matched against.
+
+    Returns
+    -------
+    out : ChromaChordMatcher
+        The instance of class ChromaChordMatcher compiled for
+        chords_types.
+
+    See Also
+    --------
+    ChromaChordMatcher : a class that labels chroma frames with chords.
+
+    Examples
+    --------
+    >>> matcher = chroma_chord_matcher()
+    >>> chroma = np.zeros((1, 12)); chroma[0, [2, 6, 9]] = 1. # D, F#, A
+    >>> [(tonality, base_type.name) for (tonality, base_type) in matcher.best_labels(chroma)]
+    [('D', 'MAJOR_TRIAD')]
+    """
+    return ChromaChordMatcher(chords_types)
+
+
+class ChromaChordMatcher:
+    """
+    A class that labels chroma frames with chords.
+
+    Every chord type is compiled with its 12 roots into a template
+    matrix, so that a whole block of chroma frames is scored with a
+    single matrix product. Scores are cosine similarities.
+
+    Parameters
+    ----------
+    chords_types : list of fields of enum ChordsTypes, optional
+        Overrides CHROMA_CHORDS_TYPES. The chords types chroma frames
+        are matched against.
+
+    Examples
+    --------
+    >>> matcher = ChromaChordMatcher()
+    >>> chroma = np.array([[1., 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0]]) # C, Eb, G
+    >>> i_labels, scores = matcher.best_labels_indices(chroma)
+    >>> tonality, base_type = matcher.labels()[i_labels[0]]
+    >>> tonality, base_type.name
+    ('C', 'MINOR_TRIAD')
+    """
+    def __init__(self, chords_types = CHROMA_CHORDS_TYPES):
+        """ Builds an instance of ChromaChordMatcher """
+        self._chords_types = list(chords_types)
+        self._templates = chroma_templates(self._chords_types)
+
+    def templates(self):
+        """ Returns the (n_labels, 12) template matrix """
+        return self._templates
+
+    def labels(self):
+        """ Returns the (tonality, base type) label of each template """
+        return [(PITCH_CLASSES_TONALITIES[root], chord_type) for chord_type in self._chords_types for root in range(N_SEMITONES_IN_OCTAVE)]
+
+    def count_labels(self):
+        """ Returns the number of templates """
+        return len(self._templates)
+
+    def scores(self, chroma):
+        """ Returns the (n_frames, n_labels) cosine similarities between chroma frames and templates """
+        chroma = np.asarray(chroma, dtype = np.float32)
+        norms = np.linalg.norm(chroma, axis = 1, keepdims = True)
+        return (chroma / np.maximum(norms, np.finfo(np.float32).tiny)) @ self._templates.T
+
+    def best_labels_indices(self, chroma, block_size = DEFAULT_BLOCK_SIZE):
+        """ Returns the index of the best template and its score for each chroma frame """
+        chroma = np.asarray(chroma, dtype = np.float32)
+        i_labels, best_scores = np.empty(len(chroma), dtype = np.intp), np.empty(len(chroma), dtype = np.float32)
+        for i_start in range(0, len(chroma), block_size):
+            block = chroma[i_start:i_start + block_size]
+            # Frames are normalized after the argmax: a frame's norm does not change its best template
+            block_scores = block @ self._templates.T
+            block_i_labels = block_scores.argmax(axis = 1)
+            block_norms = np.sqrt(np.einsum('ij,ij->i', block, block))
+            i_labels[i_start:i_start + block_size] = block_i_labels
+            best_scores[i_start:i_start + block_size] = block_scores[np.arange(len(block)), block_i_labels] / np.maximum(block_norms, np.finfo(np.float32).tiny)
+        return i_labels, best_scores
+
+    def best_labels(self, chroma, block_size = DEFAULT_BLOCK_SIZE):
+        """ Returns the best (tonality, base type) label for each chroma frame """
+        labels = self.labels()
+        return [labels[i_label] for i_label in self.best_labels_indices(chroma, block_size)[0]]
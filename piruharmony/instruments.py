@@ -1,5 +1,5 @@
 from keyboard import notes_references
-from theory import keyboard_to_chord_properties
+from theory import keyboard_to_chord_properties, pitch_class
 
 
 def guitar():
@@ -30,7 +30,7 @@ def guitar():
     6
     >>> i_frets = [None, 3, 2, 0, 1, 0]
     >>> my_guitar.to_keyboard(i_frets)
-    [None, 39, 43, 46, 51, 55]
+    [39, 43, 46, 51, 55]
     """
     regular_guitar_tuning = ['E3', 'A3', 'D4', 'G4', 'B4', 'E5']
     return strings_instrument(tuning = regular_guitar_tuning)
@@ -169,6 +169,40 @@ def ukulele():
     return strings_instrument(tuning = regular_ukulele_tuning)
 
 
+"""
+Fret value standing for a muted string where fret vectors are stored
+as integer arrays, None being used in fret lists.
+"""
+MUTED = -1
+
+
+def keyboard_masks(i_notes_on_keyboard):
+    """
+    Returns the pitch classes bitmask of rows of keyboard notes indices.
+
+    Parameters
+    ----------
+    i_notes_on_keyboard : numpy array of shape (n_voicings, n_notes)
+        Keyboard notes indices of each voicing, set to MUTED where
+        there is no note.
+
+    Returns
+    -------
+    out : numpy array of n_voicings ints
+        Bitmask where bit i is set if pitch class i is played, as
+        returned by pitch_classes_mask for each voicing.
+
+    Examples
+    --------
+    >>> keyboard_masks(np.array([[MUTED, 39, 43, 46, 51, 55]])) # C major
+    array([145])
+    """
+    import numpy as np # imported on first use, so that importing instruments stays cheap
+    i_notes_on_keyboard = np.asarray(i_notes_on_keyboard, dtype = np.int64)
+    bits = np.where(i_notes_on_keyboard != MUTED, np.left_shift(1, pitch_class(i_notes_on_keyboard)), 0)
+    return np.bitwise_or.reduce(bits, axis = -1)
+
+
 def strings_instrument(tuning):
     """
     Returns a StringsInstrument with custom tuning.
@@ -236,11 +270,23 @@ class StringsInstrument:
     def __init__(self, tuning):
         """ Constructor of class StringsIntrument's instances """
         self._tuning = tuning
+        self._open_strings = None
 
     def _single_string_to_keyboard(self, i_string, i_fret):
         """ Returns piano's key id corresponding to (i_string, i_fret) """
         return notes_references[self._tuning[i_string]] + i_fret if i_fret != None else None
 
+    def tuning(self):
+        """ Returns the notes names of the open strings """
+        return self._tuning
+
+    def open_strings(self):
+        """ Returns piano's keys ids of the open strings """
+        if self._open_strings is None:
+            import numpy as np
+            self._open_strings = np.array([notes_references[note_name] for note_name in self._tuning], dtype = np.int64)
+        return self._open_strings
+
     def count_strings(self):
         """ Returns instrument's number of strings """
         return len(self._tuning)
@@ -248,9 +294,17 @@ class StringsInstrument:
     def to_keyboard(self, i_frets):
         """ Returns piano's keys ids corresponding to i_frets """
         i_strings = range(self.count_strings())
-        return list(filter(None, [self._single_string_to_keyboard(i_string, i_fret) for (i_string, i_fret) in zip(i_strings, i_frets)]))
-
-    def to_chord_properties(self, i_frets):
-        """ Returns most likely ChordHarmonicProperties corresponding to i_frets """
+        i_notes_on_keyboard = [self._single_string_to_keyboard(i_string, i_fret) for (i_string, i_fret) in zip(i_strings, i_frets)]
+        return [i_note for i_note in i_notes_on_keyboard if i_note != None]
+
+    def frets_to_keyboard(self, frets):
+        """ Returns piano's keys ids of (n_voicings, n_strings) frets, MUTED on muted strings, and the pitch classes bitmask of each voicing """
+        import numpy as np
+        frets = np.asarray(frets, dtype = np.int64)
+        i_notes_on_keyboard = np.where(frets != MUTED, frets + self.open_strings(), MUTED)
+        return i_notes_on_keyboard, keyboard_masks(i_notes_on_keyboard)
+
+    def to_chord_properties(self, i_frets, key = None):
+        """ Returns most likely ChordHarmonicProperties corresponding to i_frets, spelled in key if given """
         i_notes_on_keyboard = self.to_keyboard(i_frets)
-        return keyboard_to_chord_properties(i_notes_on_keyboard)
+        return keyboard_to_chord_properties(i_notes_on_keyboard, key)
@@ -0,0 +1,323 @@
+import functools
+import hashlib
+import json
+import os
+import os.path
+import time
+
+from instruments import StringsInstrument
+
+
+"""
+A job writes the results of each shard into its own file, named after
+the shard's index, then records the shard as complete in the checkpoint
+file. Both are written to a temporary file first and renamed, so that a
+crash leaves either the previous or the new version on disk. The
+checkpoint records the digest of the job, so that it only resumes the
+same function, with the same bound arguments, on the same shards.
+"""
+CHECKPOINT_FILE_NAME = 'checkpoint.json'
+SHARD_FILE_NAME = 'shard_{:06d}.json'
+TEMPORARY_SUFFIX = '.tmp'
+
+
+def chords_properties_shard(instrument, frets_vectors):
+    """
+    Returns the most likely harmonic properties of fret vectors.
+
+    Parameters
+    ----------
+    instrument : StringsInstrument
+        The instrument the fret vectors are played on.
+    frets_vectors : list of lists of int or None
+        Fret of each string of each voicing, as given to
+        StringsInstrument.to_chord_properties.
+
+    Returns
+    -------
+    out : list of lists
+        The [tonality, base type name, enrichments names] of each
+        voicing, None where no chord is found or all the strings are
+        muted.
+
+    Examples
+    --------
+    >>> chords_properties_shard(guitar(), [[None, 3, 2, 0, 1, 0]])
+    [['C', 'MAJOR_TRIAD', []]]
+    """
+    shard_properties = []
+    for i_frets in frets_vectors:
+        chord_properties = instrument.to_chord_properties(i_frets) if any([i_fret != None for i_fret in i_frets]) else None
+        shard_properties.append([chord_properties.tonality(), chord_properties.base_type().name, [enrichment.name for enrichment in chord_properties.enrichments()]]
+                                if chord_properties != None else None)
+    return shard_properties
+
+
+def job_digest(function, shards, job_key = None):
+    """
+    Returns the digest of a job.
+
+    Parameters
+    ----------
+    function : function
+        Called on each shard. Partial functions are refered to by the
+        function they wrap and their bound arguments, instruments
+        being refered to by their tuning.
+    shards : list of lists
+        JSON serializable inputs of the job.
+    job_key : JSON serializable, optional
+        Overrides None. Identifies the bound arguments of function in
+        place of their values, required if any of them is neither an
+        instrument nor JSON serializable.
+
+    Returns
+    -------
+    out : str
+        SHA-256 hex digest of the module and qualified name of the
+        function, of its bound arguments or job_key, and of the shards.
+
+    Raises
+    ------
+    ValueError
+        If the bound arguments cannot be digested and job_key is None,
+        or if the shards are not JSON serializable.
+
+    Examples
+    --------
+    >>> job_digest(len, [[1, 2], [3]]) == job_digest(len, [[1, 2], [4]])
+    False
+    >>> job_digest(functools.partial(chords_properties_shard, guitar()), []) == job_digest(functools.partial(chords_properties_shard, bass()), [])
+    False
+    """
+    bound_arguments = []
+    while isinstance(function, functools.partial):
+        bound_arguments.append([function.args, function.keywords])
+        function = function.func
+    function_name = getattr(function, '__module__', None), getattr(function, '__qualname__', type(function).__qualname__)
+    try:
+        job = json.dumps([function_name, bound_arguments if job_key == None else job_key, shards], sort_keys = True, default = _digested_argument)
+    except TypeError as error:
+        raise ValueError('Job cannot be digested, give a job key for its bound arguments: {}'.format(error))
+    return hashlib.sha256(job.encode('utf-8')).hexdigest()
+
+
+def _digested_argument(argument):
+    """ Returns the JSON serializable value a bound argument is digested as """
+    if isinstance(argument, StringsInstrument):
+        return {'tuning': argument.tuning()}
+    raise TypeError('Bound argument of type {} is not digested'.format(type(argument).__name__))
+
+
+def checkpointed_job(function, shards, directory, job_key = None):
+    """
+    Returns an instance of class CheckpointedJob.
+
+    Parameters
+    ----------
+    function : function
+        Called on each shard, returns its JSON serializable results.
+        It must be picklable, that is defined at module level, to run
+        on a process pool.
+    shards : list of lists
+        Inputs of the job, each item of a shard counting as one
+        voicing in throughput reports.
+    directory : str
+        Directory results and checkpoints are written to, created if
+        it does not exist.
+    job_key : JSON serializable, optional
+        Overrides None. Identifies the bound arguments of function, as
+        given to job_digest.
+
+    Returns
+    -------
+    out : CheckpointedJob
+        The instance of class CheckpointedJob, resumed from the
+        checkpoint of directory if there is one.
+
+    Raises
+    ------
+    ValueError
+        If the checkpoint of directory was written by a job of another
+        function, other bound arguments or other shards, or if the job
+        cannot be digested.
+
+    See Also
+    --------
+    CheckpointedJob : a class that runs a job shard by shard and
+        resumes it after a crash.
+
+    Examples
+    --------
+    >>> shards = [songs_frets[i:i + 1000] for i in range(0, len(songs_frets), 1000)]
+    >>> job = checkpointed_job(functools.partial(chords_properties_shard, guitar()), shards, 'corpus_run')
+    >>> with multiprocessing.Pool() as pool:
+    ...     job.run(pool.imap_unordered, report = print)
+    """
+    return CheckpointedJob(function, shards, directory, job_key)
+
+
+class CheckpointedJob:
+    """
+    A class that runs a job shard by shard and resumes it after a
+    crash.
+
+    Shards are mapped with any execution backend, given as a function
+    with the signature of map: the builtin map runs them serially,
+    multiprocessing.Pool.imap_unordered on a process pool. As soon as
+    a shard is done, its results file and the checkpoint are written
+    atomically, so that a new run skips the shards already complete.
+    The checkpoint holds the digest of the job, as returned by
+    job_digest, and a job only resumes a checkpoint of the same digest.
+    Progress is reported after each shard.
+
+    Parameters
+    ----------
+    function : function
+        Called on each shard, returns its JSON serializable results.
+    shards : list of lists
+        Inputs of the job.
+    directory : str
+        Directory results and checkpoints are written to.
+    job_key : JSON serializable, optional
+        Overrides None. Identifies the bound arguments of function.
+
+    Examples
+    --------
+    >>> job = CheckpointedJob(sum, [[1, 2], [3]], 'sums')
+    >>> job.run().count_completed_shards()
+    2
+    >>> list(job.results())
+    [3, 3]
+    """
+    def __init__(self, function, shards, directory, job_key = None):
+        """ Builds an instance of CheckpointedJob """
+        self._function = function
+        self._shards = shards
+        self._directory = directory
+        self._digest = job_digest(function, shards, job_key)
+        os.makedirs(directory, exist_ok = True)
+        self._completed_shards = set()
+        checkpoint_path = os.path.join(directory, CHECKPOINT_FILE_NAME)
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+            if checkpoint['n_shards'] != len(shards):
+                raise ValueError('Checkpoint of {} shards cannot resume a job of {} shards: {}'.format(checkpoint['n_shards'], len(shards), directory))
+            if checkpoint.get('digest') != self._digest:
+                raise ValueError('Checkpoint of another function, other bound arguments or other shards cannot resume the job: ' + directory)
+            self._completed_shards = set(checkpoint['completed_shards'])
+
+    def count_shards(self):
+        """ Returns the number of shards of the job """
+        return len(self._shards)
+
+    def pending_shards(self):
+        """ Returns the indices of the shards which are not complete """
+        return [i_shard for i_shard in range(len(self._shards)) if i_shard not in self._completed_shards]
+
+    def _shard_path(self, i_shard):
+        """ Returns the path of the results file of a shard """
+        return os.path.join(self._directory, SHARD_FILE_NAME.format(i_shard))
+
+    def _progress(self, n_voicings, duration):
+        """ Returns the progress of the job after n_voicings were processed in duration seconds """
+        n_pending_voicings = sum([len(self._shards[i_shard]) for i_shard in self.pending_shards()])
+        voicings_per_second = n_voicings / duration if duration > 0 else 0.
+        eta = n_pending_voicings / voicings_per_second if voicings_per_second > 0 else (0. if n_pending_voicings == 0 else float('inf'))
+        return JobProgress(len(self._completed_shards), len(self._shards), n_voicings, voicings_per_second, eta)
+
+    def run(self, map_function = map, report = None):
+        """ Processes the pending shards with map_function, calling report with the JobProgress after each one, and returns the final JobProgress """
+        start, n_voicings = time.perf_counter(), 0
+        tasks = [(self._function, i_shard, self._shards[i_shard]) for i_shard in self.pending_shards()]
+        for (i_shard, shard_results) in map_function(_processed_shard, tasks):
+            _atomic_json_dump(shard_results, self._shard_path(i_shard))
+            self._completed_shards.add(i_shard)
+            _atomic_json_dump({'n_shards': len(self._shards), 'digest': self._digest, 'completed_shards': sorted(self._completed_shards)},
+                              os.path.join(self._directory, CHECKPOINT_FILE_NAME))
+            n_voicings += len(self._shards[i_shard])
+            if report != None:
+                report(self._progress(n_voicings, time.perf_counter() - start))
+        return self._progress(n_voicings, time.perf_counter() - start)
+
+    def results(self):
+        """ Yields the results of each shard, in order, once the job is complete """
+        if len(self.pending_shards()) > 0:
+            raise ValueError('Job is not complete, {} shards are pending: {}'.format(len(self.pending_shards()), self._directory))
+        for i_shard in range(len(self._shards)):
+            with open(self._shard_path(i_shard)) as shard_file:
+                yield json.load(shard_file)
+
+
+def _processed_shard(task):
+    """ Returns the index of a shard and the results of the function of a (function, shard index, shard) task """
+    function, i_shard, shard = task
+    return i_shard, function(shard)
+
+
+def _atomic_json_dump(value, path):
+    """ Writes value as JSON into path, through a temporary file renamed once on disk """
+    temporary_path = path + TEMPORARY_SUFFIX
+    with open(temporary_path, 'w') as temporary_file:
+        json.dump(value, temporary_file)
+        temporary_file.flush()
+        os.fsync(temporary_file.fileno())
+    os.replace(temporary_path, path)
+
+
+class JobProgress(tuple):
+    """
+    A class that describes the progress of a job.
+
+    Parameters
+    ----------
+    n_completed_shards : int
+        Number of complete shards, including those of previous runs.
+    n_shards : int
+        Number of shards of the job.
+    n_voicings : int
+        Number of voicings processed by the current run.
+    voicings_per_second : float
+        Throughput of the current run.
+    eta : float
+        Estimated number of seconds until the job is complete.
+
+    Examples
+    --------
+    >>> progress = JobProgress(3, 4, 3000, 1500., 0.5)
+    >>> print(progress)
+    3/4 shards, 1500 voicings/s, ETA 0.5 s
+    """
+    __slots__ = ()
+
+    def __new__(cls, n_completed_shards, n_shards, n_voicings, voicings_per_second, eta):
+        """ Builds an instance of JobProgress """
+        return tuple.__new__(cls, (n_completed_shards, n_shards, n_voicings, voicings_per_second, eta))
+
+    def __getnewargs__(self):
+        """ Returns the arguments rebuilding the progress when unpickled """
+        return tuple(self)
+
+    def __str__(self):
+        """ Returns a readable report of the progress """
+        return '{}/{} shards, {:.0f} voicings/s, ETA {:.1f} s'.format(self[0], self[1], self[3], self[4])
+
+    def count_completed_shards(self):
+        """ Returns the number of complete shards """
+        return self[0]
+
+    def count_shards(self):
+        """ Returns the number of shards of the job """
+        return self[1]
+
+    def count_voicings(self):
+        """ Returns the number of voicings processed by the current run """
+        return self[2]
+
+    def voicings_per_second(self):
+        """ Returns the throughput of the current run """
+        return self[3]
+
+    def eta(self):
+        """ Returns the estimated number of seconds until the job is complete """
+        return self[4]
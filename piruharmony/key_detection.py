@@ -0,0 +1,189 @@
+from collections import deque
+
+import numpy as np
+
+from theory import PITCH_CLASSES_TONALITIES, MINOR_KEY_SUFFIX, N_SEMITONES_IN_OCTAVE, chord_properties_mask, tonality_pitch_class
+
+
+"""
+Krumhansl-Kessler probe-tone profiles of major and minor keys, from
+the tonic upwards by semitone.
+"""
+MAJOR_PITCH_CLASSES_PROFILE = [6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88]
+MINOR_PITCH_CLASSES_PROFILE = [6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17]
+
+
+"""
+Weights of chords roots in major and minor keys, from the tonic
+upwards by semitone: the tonic, dominant and subdominant roots weigh
+the most, chromatic roots nothing.
+"""
+MAJOR_ROOTS_PROFILE = [1., 0., .4, 0., .3, .7, 0., .8, 0., .5, 0., .2]
+MINOR_ROOTS_PROFILE = [1., 0., .2, .5, 0., .7, 0., .8, .5, 0., .4, .2]
+
+
+"""
+Gathers the 24 major and minor keys, majors first, as refered to in
+KEYS_SPELLINGS. Key i_mode * 12 + i_tonic has pitch class i_tonic as
+tonic.
+"""
+KEYS = PITCH_CLASSES_TONALITIES + [tonality + MINOR_KEY_SUFFIX for tonality in PITCH_CLASSES_TONALITIES]
+DEFAULT_WINDOW_SIZE = 16
+DEFAULT_ROOT_WEIGHT = 1.
+DEFAULT_SWITCH_MARGIN = 1.
+
+
+def key_profiles(major_profile = MAJOR_PITCH_CLASSES_PROFILE, minor_profile = MINOR_PITCH_CLASSES_PROFILE):
+    """
+    Returns the profiles of the 24 keys.
+
+    Parameters
+    ----------
+    major_profile : list of 12 floats, optional
+        Overrides MAJOR_PITCH_CLASSES_PROFILE. Profile of a major key
+        from its tonic.
+    minor_profile : list of 12 floats, optional
+        Overrides MINOR_PITCH_CLASSES_PROFILE. Profile of a minor key
+        from its tonic.
+
+    Returns
+    -------
+    out : numpy array of shape (24, 12)
+        Row i is the profile of KEYS[i] over pitch classes, C being
+        pitch class 0, centered and scaled to unit norm so that a
+        histogram's scores are its correlations with the keys.
+
+    Examples
+    --------
+    >>> profiles = key_profiles()
+    >>> int(profiles[KEYS.index('G')].argmax())
+    7
+    """
+    profiles = []
+    for profile in [major_profile, minor_profile]:
+        centered_profile = np.asarray(profile, dtype = np.float64) - np.mean(profile)
+        centered_profile /= np.linalg.norm(centered_profile)
+        profiles += [np.roll(centered_profile, tonic) for tonic in range(N_SEMITONES_IN_OCTAVE)]
+    return np.array(profiles)
+
+
+def key_tracker(window_size = DEFAULT_WINDOW_SIZE, root_weight = DEFAULT_ROOT_WEIGHT, switch_margin = DEFAULT_SWITCH_MARGIN):
+    """
+    Returns an instance of class KeyTracker.
+
+    Parameters
+    ----------
+    window_size : int, optional
+        Overrides DEFAULT_WINDOW_SIZE. Number of chords the key is
+        estimated over.
+    root_weight : float, optional
+        Overrides DEFAULT_ROOT_WEIGHT. Weight of the chords roots
+        scores against the pitch classes scores.
+    switch_margin : float, optional
+        Overrides DEFAULT_SWITCH_MARGIN. Score by which a key has to
+        beat the current key to replace it.
+
+    Returns
+    -------
+    out : KeyTracker
+        The instance of class KeyTracker built with the input
+        parameters.
+
+    See Also
+    --------
+    KeyTracker : a class that estimates the local key of a stream of
+        chords.
+
+    Examples
+    --------
+    >>> tracker = key_tracker(window_size = 4)
+    >>> tracker.push(ChordHarmonicProperties('A', ChordsTypes.MINOR_TRIAD, []))
+    'Am'
+    """
+    return KeyTracker(window_size, root_weight, switch_margin)
+
+
+class KeyTracker:
+    """
+    A class that estimates the local key of a stream of chords.
+
+    Histograms of the pitch classes and of the roots of the last
+    window_size chords are kept up to date as chords come in and out of
+    the window, and scored against the 24 keys profiles. Each chord is
+    processed in constant time, so that a stream of any length is
+    labelled in linear time.
+
+    Parameters
+    ----------
+    window_size : int, optional
+        Overrides DEFAULT_WINDOW_SIZE.
+    root_weight : float, optional
+        Overrides DEFAULT_ROOT_WEIGHT.
+    switch_margin : float, optional
+        Overrides DEFAULT_SWITCH_MARGIN.
+
+    Examples
+    --------
+    >>> tracker = KeyTracker(window_size = 4)
+    >>> progression = ['C', 'F', 'G7', 'C', 'D', 'A7', 'D', 'G', 'A7', 'D']
+    >>> base_types = {1: ChordsTypes.MAJOR_TRIAD, 2: ChordsTypes.SEVENTH}
+    >>> list(tracker.key_changes([ChordHarmonicProperties(name[0], base_types[len(name)], []) for name in progression]))
+    [(0, 'C'), (6, 'D')]
+    """
+    def __init__(self, window_size = DEFAULT_WINDOW_SIZE, root_weight = DEFAULT_ROOT_WEIGHT, switch_margin = DEFAULT_SWITCH_MARGIN):
+        """ Builds an instance of KeyTracker """
+        self._window_size = window_size
+        self._root_weight = root_weight
+        self._switch_margin = switch_margin
+        self._pitch_classes_profiles = key_profiles()
+        self._roots_profiles = key_profiles(MAJOR_ROOTS_PROFILE, MINOR_ROOTS_PROFILE)
+        self._window = deque()
+        self._pitch_classes_histogram = np.zeros(N_SEMITONES_IN_OCTAVE, dtype = np.int64)
+        self._roots_histogram = np.zeros(N_SEMITONES_IN_OCTAVE, dtype = np.int64)
+        self._i_key = None
+
+    def _counted(self, window_chord, increment):
+        """ Adds increment to the histograms bins of a (pitch classes bitmask, root) window chord """
+        mask, root = window_chord
+        self._pitch_classes_histogram += increment * ((mask >> np.arange(N_SEMITONES_IN_OCTAVE)) & 1)
+        if root != None:
+            self._roots_histogram[root] += increment
+
+    def push(self, chord_properties):
+        """ Adds a ChordHarmonicProperties, or None, to the window and returns the current key """
+        window_chord = (0, None)
+        if chord_properties != None:
+            window_chord = (chord_properties_mask(chord_properties), tonality_pitch_class(chord_properties.tonality()))
+        self._window.append(window_chord)
+        self._counted(window_chord, 1)
+        if len(self._window) > self._window_size:
+            self._counted(self._window.popleft(), -1)
+        scores = self.scores()
+        i_best_key = int(scores.argmax())
+        if scores[i_best_key] > 0. and (self._i_key == None or scores[i_best_key] > scores[self._i_key] + self._switch_margin):
+            self._i_key = i_best_key
+        return self.key()
+
+    def key(self):
+        """ Returns the current key, None before any chord has been pushed """
+        return KEYS[self._i_key] if self._i_key != None else None
+
+    def scores(self):
+        """ Returns the score of each key of KEYS over the current window """
+        return self._pitch_classes_histogram @ self._pitch_classes_profiles.T + self._root_weight * (self._roots_histogram @ self._roots_profiles.T)
+
+    def pitch_classes_histogram(self):
+        """ Returns the number of chords of the window containing each pitch class """
+        return self._pitch_classes_histogram
+
+    def roots_histogram(self):
+        """ Returns the number of chords of the window built over each root """
+        return self._roots_histogram
+
+    def key_changes(self, chords_properties):
+        """ Pushes chords one by one and yields (index of the chord, new key) each time the key changes """
+        for i_chord, chord_properties in enumerate(chords_properties):
+            previous_key = self.key()
+            key = self.push(chord_properties)
+            if key != previous_key:
+                yield i_chord, key
@@ -0,0 +1,234 @@
+import xml.etree.ElementTree as ElementTree
+from xml.parsers import expat
+from fractions import Fraction
+from functools import reduce
+from itertools import zip_longest
+from math import lcm
+
+from keyboard import notes_references
+from theory import N_SEMITONES_IN_OCTAVE, _keyboard_to_possible_notes_names, chord_explorer, guess_most_likely_harmonic_properties, tonality_pitch_class
+
+
+"""
+Alteration written after the step of a MusicXML pitch, by value of its
+alter element. Flat C are refered to in the octave of the B they sound
+as in notes_references, whereas MusicXML counts them in the octave of
+their step.
+"""
+ALTERATIONS = {-1: 'b', 0: '', 1: '#'}
+FLAT_C_OCTAVE_SHIFT = -1
+DEFAULT_DIVISIONS = 1
+
+
+"""
+Parts are located in the file by a first expat pass, which reports the
+byte offset of their tags, each one being then parsed on its own, fed
+by chunks of READ_CHUNK_SIZE bytes.
+"""
+READ_CHUNK_SIZE = 1 << 16
+
+
+def pitch_note_name(step, alter, octave):
+    """
+    Returns the name, as refered to in notes_references, of a MusicXML
+    pitch.
+
+    Parameters
+    ----------
+    step : str
+        Step of the pitch, from 'A' to 'G'.
+    alter : int
+        Alteration of the pitch in semitones.
+    octave : int
+        Octave of the pitch, middle C being in octave 4.
+
+    Returns
+    -------
+    out : str
+        The note's name, keeping the score's spelling. Double
+        alterations, which notes_references does not spell, are
+        respelled, naturals first.
+
+    Raises
+    ------
+    ValueError
+        If the pitch is out of the keyboard.
+
+    Examples
+    --------
+    >>> pitch_note_name('E', -1, 4), pitch_note_name('C', -1, 4)
+    ('Eb4', 'Cb3')
+    """
+    if alter in ALTERATIONS:
+        note_name = step + ALTERATIONS[alter] + str(octave + FLAT_C_OCTAVE_SHIFT if step == 'C' and alter < 0 else octave)
+        if note_name in notes_references:
+            return note_name
+    i_note = notes_references['C4'] + N_SEMITONES_IN_OCTAVE * (octave - 4) + tonality_pitch_class(step) + alter
+    notes_names = _keyboard_to_possible_notes_names(i_note)
+    if len(notes_names) == 0:
+        raise ValueError('Pitch out of the keyboard: step {}, alter {}, octave {}'.format(step, alter, octave))
+    return min(notes_names, key = len)
+
+
+def musicxml_reader(path):
+    """
+    Returns an instance of class MusicXmlReader.
+
+    Parameters
+    ----------
+    path : str
+        Path to an uncompressed partwise MusicXML score.
+
+    Returns
+    -------
+    out : MusicXmlReader
+        The instance of class MusicXmlReader of the score.
+
+    See Also
+    --------
+    MusicXmlReader : a class that streams the chords of a MusicXML
+        score.
+
+    Examples
+    --------
+    >>> reader = musicxml_reader('chorale.musicxml')
+    >>> next(reader.slices())
+    ('1', Fraction(0, 1), ['G2', 'B3', 'D4', 'G4'])
+    """
+    return MusicXmlReader(path)
+
+
+class MusicXmlReader:
+    """
+    A class that streams the chords of a MusicXML score.
+
+    The score is read with incremental ElementTree parsers, each
+    measure being cleared once read, so that memory holds a single
+    measure per part whatever the score's length. As partwise scores
+    list all the measures of a part before the next part, the bytes
+    range of each part is first located by a pass of expat, which
+    keeps no element, then parts are parsed side by side from their
+    own range and merged measure by measure. A time slice gathers the
+    notes sounding at each onset of a measure, in all parts, spelled as
+    in the score. Notes out of the keyboard are skipped. Parts are
+    expected to be encoded in UTF-8.
+
+    Parameters
+    ----------
+    path : str
+        Path to an uncompressed partwise MusicXML score.
+
+    Examples
+    --------
+    >>> reader = MusicXmlReader('opera.musicxml')
+    >>> reader.parts_ids()[:2]
+    ['P1', 'P2']
+    >>> for (measure_number, offset, chord_properties) in reader.chords_properties():
+    ...     pass
+    """
+    def __init__(self, path):
+        """ Builds an instance of MusicXmlReader """
+        self._path = path
+        self._parts_ids, self._parts_ranges = _score_parts(path)
+
+    def parts_ids(self):
+        """ Returns the ids of the score's parts """
+        return self._parts_ids
+
+    def _part_measures(self, i_part):
+        """ Yields the number and the (onset, end, divisions per quarter note, note name) of the notes of each measure of a part """
+        part_start, part_end = self._parts_ranges[i_part]
+        parser, divisions = ElementTree.XMLPullParser(events = ('start', 'end')), DEFAULT_DIVISIONS
+        with open(self._path, 'rb') as score:
+            score.seek(part_start)
+            for chunk_start in range(part_start, part_end, READ_CHUNK_SIZE):
+                parser.feed(score.read(min(READ_CHUNK_SIZE, part_end - chunk_start)))
+                for (event, element) in parser.read_events():
+                    if event == 'start' and element.tag == 'part':
+                        part = element
+                    elif event == 'end' and element.tag == 'measure':
+                        divisions, measure_notes = _measure_notes(element, divisions)
+                        part.clear()
+                        yield element.get('number'), measure_notes
+
+    def slices(self):
+        """ Yields the measure number, offset in quarter notes and sorted sounding notes names of each onset of the score """
+        parts_measures = [self._part_measures(i_part) for i_part in range(len(self._parts_ids))]
+        for measures in zip_longest(*parts_measures, fillvalue = (None, [])):
+            measure_number = next(number for (number, _) in measures if number != None)
+            measure_notes = [note for (_, part_notes) in measures for note in part_notes]
+            # Times are counted in divisions of each part, brought to a common number of divisions per quarter note
+            divisions = reduce(lcm, [note_divisions for (_, _, note_divisions, _) in measure_notes], 1)
+            measure_notes = [(onset * (divisions // note_divisions), end * (divisions // note_divisions), note_name)
+                             for (onset, end, note_divisions, note_name) in measure_notes]
+            for onset in sorted(set([onset for (onset, _, _) in measure_notes])):
+                notes_names = set([note_name for (note_onset, note_end, note_name) in measure_notes if note_onset <= onset < note_end])
+                yield measure_number, Fraction(onset, divisions), sorted(notes_names, key = lambda note_name: (notes_references[note_name], note_name))
+
+    def chords_properties(self):
+        """ Yields the measure number, offset in quarter notes and most likely ChordHarmonicProperties of each slice, None where there is no chord """
+        for (measure_number, offset, notes_names) in self.slices():
+            yield measure_number, offset, _notes_chord_properties(notes_names)
+
+
+def _score_parts(path):
+    """ Returns the ids of the parts of a partwise MusicXML file and the range of bytes of each part element, empty for empty elements """
+    parts_ids, starts, ends = [], [], []
+    parser = expat.ParserCreate()
+    def started_element(tag, attributes):
+        if tag == 'score-timewise':
+            raise ValueError('Timewise MusicXML scores are not supported: ' + path)
+        if tag == 'score-part':
+            parts_ids.append(attributes.get('id'))
+        elif tag == 'part':
+            starts.append(parser.CurrentByteIndex)
+    def ended_element(tag):
+        if tag == 'part':
+            ends.append(parser.CurrentByteIndex)
+    parser.StartElementHandler, parser.EndElementHandler = started_element, ended_element
+    with open(path, 'rb') as score:
+        parser.ParseFile(score)
+        # End events are reported at the '<' of closing tags but after empty elements tags, parts end after their '>'
+        for (i_part, end) in enumerate(ends):
+            score.seek(end)
+            chunk = score.read(READ_CHUNK_SIZE)
+            if chunk.startswith(b'</part'):
+                ends[i_part] = end + chunk.index(b'>') + 1
+            else:
+                starts[i_part] = end
+    return parts_ids, list(zip(starts, ends))
+
+
+def _measure_notes(measure, divisions):
+    """ Returns the divisions per quarter note after a measure element and the (onset, end, divisions per quarter note, note name) of its pitched notes """
+    position, onset, measure_notes = 0, 0, []
+    for element in measure:
+        if element.tag == 'attributes' and element.find('divisions') != None:
+            divisions = int(element.findtext('divisions'))
+        elif element.tag == 'backup':
+            position -= int(element.findtext('duration'))
+        elif element.tag == 'forward':
+            position += int(element.findtext('duration'))
+        elif element.tag == 'note' and element.find('grace') == None:
+            duration = int(element.findtext('duration', '0'))
+            # Notes of a chord start with the note before them, which set the position after it
+            if element.find('chord') == None:
+                onset, position = position, position + duration
+            pitch = element.find('pitch')
+            if pitch != None and element.find('cue') == None:
+                alter = int(round(float(pitch.findtext('alter', '0'))))
+                try:
+                    note_name = pitch_note_name(pitch.findtext('step'), alter, int(pitch.findtext('octave')))
+                except ValueError: # out of the keyboard
+                    continue
+                measure_notes.append((onset, onset + duration, divisions, note_name))
+    return divisions, measure_notes
+
+
+def _notes_chord_properties(notes_names):
+    """ Returns the most likely ChordHarmonicProperties of spelled notes, rooted on the bass if possible, None if there is none """
+    if len(notes_names) == 0:
+        return None
+    most_likely = guess_most_likely_harmonic_properties(chord_explorer(notes_names).possible_harmonic_properties())
+    fundamentals = [chord_properties for chord_properties in most_likely if chord_properties.tonality() == notes_names[0][:-1]]
+    return (fundamentals + most_likely)[0] if len(most_likely) > 0 else None
@@ -0,0 +1,234 @@
+import os.path
+
+import numpy as np
+
+from theory import CHORDS_TYPES, N_SEMITONES_IN_OCTAVE, compact_harmonic_properties, tonality_pitch_class
+
+
+"""
+A chord of a progression is encoded as a token gathering the interval
+from the previous chord's root and the index of its base type in
+CHORDS_TYPES, so that tokens are the same in all transpositions. Grams
+running past the end of a song are padded with PADDING_TOKEN.
+"""
+N_CHORDS_TOKENS = N_SEMITONES_IN_OCTAVE * len(CHORDS_TYPES)
+PADDING_TOKEN = N_CHORDS_TOKENS
+TOKENS_BASE = N_CHORDS_TOKENS + 1
+DEFAULT_NGRAM_SIZE = 3
+MAX_NGRAM_SIZE = int(np.log(np.iinfo(np.int64).max) / np.log(TOKENS_BASE))
+INDEX_ARRAYS_NAMES = ['ngram_size', 'tokens', 'songs_starts', 'grams_keys', 'grams_starts', 'positions']
+
+
+def progression_tokens(chords_properties):
+    """
+    Returns the transposition-normalized tokens of a chords
+    progression.
+
+    Parameters
+    ----------
+    chords_properties : list of ChordHarmonicProperties
+        The properties of each chord. None elements, where there is no
+        chord, are skipped.
+
+    Returns
+    -------
+    out : numpy array of uint8
+        Token of each chord: the interval in semitones from the
+        previous chord's root times len(CHORDS_TYPES), plus the code of
+        the chord's base type. The first chord's interval is 0.
+
+    Examples
+    --------
+    >>> progression_tokens([ChordHarmonicProperties('D', ChordsTypes.MINOR_SEVENTH, []), ChordHarmonicProperties('G', ChordsTypes.SEVENTH, [])])
+    array([ 6, 99], dtype=uint8)
+    """
+    tokens, previous_root = [], None
+    for chord_properties in chords_properties:
+        if chord_properties != None:
+            root = tonality_pitch_class(chord_properties.tonality())
+            interval = (root - previous_root) % N_SEMITONES_IN_OCTAVE if previous_root != None else 0
+            tokens.append(interval * len(CHORDS_TYPES) + compact_harmonic_properties(chord_properties).base_type_code())
+            previous_root = root
+    return np.array(tokens, dtype = np.uint8)
+
+
+def progression_index(progressions, ngram_size = DEFAULT_NGRAM_SIZE):
+    """
+    Returns an instance of class ProgressionIndex built over songs.
+
+    Parameters
+    ----------
+    progressions : iterable of lists of ChordHarmonicProperties
+        The chords properties of each song.
+    ngram_size : int in [1 - MAX_NGRAM_SIZE], optional
+        Overrides DEFAULT_NGRAM_SIZE. Number of chords of the indexed
+        grams.
+
+    Returns
+    -------
+    out : ProgressionIndex
+        The instance of class ProgressionIndex of the songs, song i
+        being the i-th progression.
+
+    See Also
+    --------
+    ProgressionIndex : a class that finds chords patterns across songs.
+    load_progression_index : Loads an instance of class
+        ProgressionIndex saved on disk.
+
+    Examples
+    --------
+    >>> two_five_one = [ChordHarmonicProperties(tonality, base_type, []) for (tonality, base_type) in
+    ...                 [('D', ChordsTypes.MINOR_SEVENTH), ('G', ChordsTypes.SEVENTH), ('C', ChordsTypes.MAJOR_SEVENTH)]]
+    >>> index = progression_index([[ChordHarmonicProperties('F', ChordsTypes.MAJOR_TRIAD, [])] + two_five_one])
+    >>> index.search(two_five_one)
+    (array([0]), array([1]))
+    """
+    tokens = [progression_tokens(chords_properties) for chords_properties in progressions]
+    return ProgressionIndex(*_built_index_arrays(tokens, ngram_size))
+
+
+def _built_index_arrays(songs_tokens, ngram_size):
+    """ Returns the arrays of a ProgressionIndex of the songs tokens, in the order of INDEX_ARRAYS_NAMES """
+    if ngram_size < 1 or ngram_size > MAX_NGRAM_SIZE:
+        raise ValueError('ngram_size must be in [1 - {}]'.format(MAX_NGRAM_SIZE))
+    lengths = np.array([len(song_tokens) for song_tokens in songs_tokens], dtype = np.int64)
+    songs_starts = np.concatenate([[0], np.cumsum(lengths)])
+    tokens = np.concatenate(songs_tokens + [np.zeros(0, dtype = np.uint8)])
+    positions_ends = np.repeat(songs_starts[1:], lengths)
+    # The first chord of a gram keeps its base type only: the interval from the chord before is not part of the pattern
+    keys = (tokens % len(CHORDS_TYPES)).astype(np.int64)
+    for n_chords in range(1, ngram_size):
+        i_tokens = np.arange(len(tokens)) + n_chords
+        is_in_song = i_tokens < positions_ends
+        keys = keys * TOKENS_BASE + np.where(is_in_song, tokens[np.minimum(i_tokens, len(tokens) - 1)] if len(tokens) > 0 else 0, PADDING_TOKEN)
+    positions = np.argsort(keys, kind = 'stable')
+    sorted_keys = keys[positions]
+    is_new_key = np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]]) if len(sorted_keys) > 0 else np.zeros(0, dtype = bool)
+    grams_starts = np.concatenate([np.flatnonzero(is_new_key), [len(sorted_keys)]])
+    return np.int64(ngram_size), tokens, songs_starts, sorted_keys[is_new_key], grams_starts, positions
+
+
+def load_progression_index(directory, mmap_mode = 'r'):
+    """
+    Loads an instance of class ProgressionIndex saved on disk.
+
+    Parameters
+    ----------
+    directory : str
+        Directory the index was saved into by ProgressionIndex.save.
+    mmap_mode : str or None, optional
+        Overrides 'r'. Memory-map mode of the arrays, as in numpy.load,
+        so that a query only reads the pages it needs. None loads the
+        whole index in memory.
+
+    Returns
+    -------
+    out : ProgressionIndex
+        The loaded instance of class ProgressionIndex.
+
+    Examples
+    --------
+    >>> progression = [ChordHarmonicProperties('E', ChordsTypes.SEVENTH, []), ChordHarmonicProperties('A', ChordsTypes.MINOR_TRIAD, [])]
+    >>> progression_index([progression, progression]).save('index_directory')
+    >>> load_progression_index('index_directory').count_songs()
+    2
+    """
+    arrays = [np.load(os.path.join(directory, name + '.npy'), mmap_mode = mmap_mode) for name in INDEX_ARRAYS_NAMES]
+    return ProgressionIndex(int(arrays[0]), *arrays[1:])
+
+
+class ProgressionIndex:
+    """
+    A class that finds chords patterns across songs.
+
+    Songs tokens are concatenated, and the position of every gram of
+    ngram_size chords is listed in an inverted index sorted by gram.
+    A pattern of at most ngram_size chords is a contiguous range of
+    grams found by binary search; longer patterns are found from their
+    first gram and checked against the songs tokens. Patterns match in
+    any transposition.
+
+    Parameters
+    ----------
+    ngram_size : int
+        Number of chords of the indexed grams.
+    tokens : numpy array of uint8
+        Concatenated tokens of all songs.
+    songs_starts : numpy array of n_songs + 1 ints
+        Position of the first token of each song, followed by the
+        number of tokens.
+    grams_keys : numpy array of ints
+        Sorted distinct keys of the indexed grams.
+    grams_starts : numpy array of len(grams_keys) + 1 ints
+        First element of positions of each key, followed by the number
+        of positions.
+    positions : numpy array of ints
+        Positions of the grams, sorted by key.
+
+    Examples
+    --------
+    >>> five_one = [ChordHarmonicProperties('G', ChordsTypes.SEVENTH, []), ChordHarmonicProperties('C', ChordsTypes.MAJOR_TRIAD, [])]
+    >>> song = [ChordHarmonicProperties(tonality, base_type, []) for (tonality, base_type) in
+    ...         [('A', ChordsTypes.MAJOR_TRIAD), ('E', ChordsTypes.SEVENTH), ('A', ChordsTypes.MAJOR_TRIAD)]]
+    >>> index = progression_index([song, song[:2]], ngram_size = 2)
+    >>> index.search(five_one) # E7 to A, in another key
+    (array([0]), array([1]))
+    """
+    def __init__(self, ngram_size, tokens, songs_starts, grams_keys, grams_starts, positions):
+        """ Builds an instance of ProgressionIndex """
+        self._ngram_size = ngram_size
+        self._tokens = tokens
+        self._songs_starts = songs_starts
+        self._grams_keys = grams_keys
+        self._grams_starts = grams_starts
+        self._positions = positions
+
+    def ngram_size(self):
+        """ Returns the number of chords of the indexed grams """
+        return self._ngram_size
+
+    def count_songs(self):
+        """ Returns the number of indexed songs """
+        return len(self._songs_starts) - 1
+
+    def count_chords(self):
+        """ Returns the number of indexed chords """
+        return len(self._tokens)
+
+    def _grams_range(self, pattern_tokens):
+        """ Returns the range of positions of the grams starting as the first ngram_size pattern tokens """
+        n_key_chords = min(len(pattern_tokens), self._ngram_size)
+        key = int(pattern_tokens[0]) % len(CHORDS_TYPES)
+        for token in pattern_tokens[1:n_key_chords]:
+            key = key * TOKENS_BASE + int(token)
+        padding_factor = TOKENS_BASE ** (self._ngram_size - n_key_chords)
+        i_first_key, i_end_key = np.searchsorted(self._grams_keys, [key * padding_factor, (key + 1) * padding_factor])
+        return self._grams_starts[i_first_key], self._grams_starts[i_end_key]
+
+    def search_positions(self, pattern_tokens):
+        """ Returns the sorted positions, among all songs tokens, where tokens of a pattern start """
+        if len(pattern_tokens) == 0:
+            return np.zeros(0, dtype = np.int64)
+        i_first_position, i_end_position = self._grams_range(pattern_tokens)
+        positions = np.sort(self._positions[i_first_position:i_end_position])
+        if len(pattern_tokens) > self._ngram_size:
+            songs_ends = self._songs_starts[np.searchsorted(self._songs_starts, positions, side = 'right')]
+            positions = positions[positions + len(pattern_tokens) <= songs_ends]
+            for i_token in range(self._ngram_size, len(pattern_tokens)):
+                positions = positions[self._tokens[positions + i_token] == pattern_tokens[i_token]]
+        return positions
+
+    def search(self, pattern):
+        """ Returns the song index and chord offset of every occurrence of a list of ChordHarmonicProperties """
+        positions = self.search_positions(progression_tokens(pattern))
+        i_songs = np.searchsorted(self._songs_starts, positions, side = 'right') - 1
+        return i_songs, positions - self._songs_starts[i_songs]
+
+    def save(self, directory):
+        """ Saves the index arrays into a directory, created if needed """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        arrays = [self._ngram_size, self._tokens, self._songs_starts, self._grams_keys, self._grams_starts, self._positions]
+        for (name, array) in zip(INDEX_ARRAYS_NAMES, arrays):
+            np.save(os.path.join(directory, name + '.npy'), np.asarray(array))
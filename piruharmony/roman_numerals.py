@@ -0,0 +1,210 @@
+from functools import lru_cache
+
+from theory import ChordsTypes, IntervalsTypes, KEYS_SPELLINGS, MINOR_KEY_SUFFIX, N_SEMITONES_IN_OCTAVE, TONALITIES, VALID_TONES, chord_type_mask, tonality_pitch_class
+from scales import ScalesTypes, scale_type_mask
+
+
+NUMERALS = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII']
+
+
+"""
+Suffix appended to the numeral of each chord type. The numeral itself
+is lower case when the chord type contains a minor third.
+"""
+CHORDS_TYPES_SUFFIXES = {
+    ChordsTypes.MAJOR_TRIAD               : '',
+    ChordsTypes.MINOR_TRIAD               : '',
+    ChordsTypes.AUGMENTED_TRIAD           : '+',
+    ChordsTypes.DIMINISHED_TRIAD          : '°',
+    ChordsTypes.SEVENTH                   : '7',
+    ChordsTypes.MAJOR_SEVENTH             : 'maj7',
+    ChordsTypes.MINOR_SEVENTH             : '7',
+    ChordsTypes.MINOR_MAJOR_SEVENTH       : 'maj7',
+    ChordsTypes.SEVENTH_TRIAD             : '7no5',
+    ChordsTypes.MAJOR_SEVENTH_TRIAD       : 'maj7no5',
+    ChordsTypes.MINOR_SEVENTH_TRIAD       : '7no5',
+    ChordsTypes.MINOR_MAJOR_SEVENTH_TRIAD : 'maj7no5',
+    ChordsTypes.HALF_DIMINISHED_SEVENTH   : 'ø7',
+    ChordsTypes.AUGMENTED_MAJOR_SEVENTH   : '+maj7',
+    ChordsTypes.DIMINISHED_SEVENTH        : '°7',
+    ChordsTypes.POWER_CHORD               : '5',
+    ChordsTypes.MAJOR_THIRD_ALONE         : 'no5',
+    ChordsTypes.MINOR_THIRD_ALONE         : 'no5',
+    ChordsTypes.UNKNOWN                   : '?'
+}
+DOMINANTS_TYPES = [ChordsTypes.MAJOR_TRIAD, ChordsTypes.SEVENTH, ChordsTypes.SEVENTH_TRIAD]
+LEADING_TONES_TYPES = [ChordsTypes.DIMINISHED_TRIAD, ChordsTypes.HALF_DIMINISHED_SEVENTH, ChordsTypes.DIMINISHED_SEVENTH]
+
+
+def _scale_semitones(scale_type):
+    """ Returns the number of semitones between the tonic and each degree of a scale type """
+    return [0] + [interval_type.value.count_semitones() for interval_type in scale_type.value]
+
+
+def _key_scale(key, mode):
+    """ Returns the tonic, the scale type degrees are read from and the diatonic pitch classes of a key or of a mode """
+    if mode != None:
+        if len(mode.value) != len(VALID_TONES) - 1:
+            raise ValueError('Roman numerals need a mode of {} degrees: {}'.format(len(VALID_TONES), mode.name))
+        return key, mode, scale_type_mask(mode, tonality_pitch_class(key))
+    if key.endswith(MINOR_KEY_SUFFIX):
+        tonic_pitch_class = tonality_pitch_class(key[:-1])
+        # Minor keys gather both the natural and the harmonic minor scales
+        return key[:-1], ScalesTypes.NATURAL_MINOR, scale_type_mask(ScalesTypes.NATURAL_MINOR, tonic_pitch_class) | scale_type_mask(ScalesTypes.HARMONIC_MINOR, tonic_pitch_class)
+    return key, ScalesTypes.MAJOR, scale_type_mask(ScalesTypes.MAJOR, tonality_pitch_class(key))
+
+
+def _numeral(tonic, scale_type, tonality, chord_type):
+    """ Returns the numeral of a chord type built over tonality, spelled along the degrees of scale_type built over tonic """
+    i_degree = (VALID_TONES.index(tonality[0]) - VALID_TONES.index(tonic[0])) % len(VALID_TONES)
+    n_semitones = (tonality_pitch_class(tonality) - tonality_pitch_class(tonic)) % N_SEMITONES_IN_OCTAVE
+    alteration = (n_semitones - _scale_semitones(scale_type)[i_degree] + 6) % N_SEMITONES_IN_OCTAVE - 6
+    if scale_type == ScalesTypes.NATURAL_MINOR and i_degree == len(VALID_TONES) - 1 and alteration == 1: # leading tone of the harmonic minor
+        alteration = 0
+    numeral = NUMERALS[i_degree].lower() if IntervalsTypes.MINOR_THIRD in chord_type.value else NUMERALS[i_degree]
+    return ('#' if alteration > 0 else 'b') * abs(alteration) + numeral + CHORDS_TYPES_SUFFIXES[chord_type]
+
+
+def _degrees_spelling(tonic, scale_type):
+    """ Returns the tonality of each degree of scale_type built over tonic, by pitch class """
+    i_tonic_tone = VALID_TONES.index(tonic[0])
+    spelling = {}
+    for (i_degree, n_semitones) in enumerate(_scale_semitones(scale_type)):
+        tone = VALID_TONES[(i_tonic_tone + i_degree) % len(VALID_TONES)]
+        i_pitch_class = (tonality_pitch_class(tonic) + n_semitones) % N_SEMITONES_IN_OCTAVE
+        alteration = (i_pitch_class - tonality_pitch_class(tone) + 6) % N_SEMITONES_IN_OCTAVE - 6
+        spelling[i_pitch_class] = tone + ('#' if alteration > 0 else 'b') * abs(alteration)
+    return spelling
+
+
+def _tonicized_degrees(key, mode):
+    """ Returns the numeral of each degree, the tonic excepted, holding a diatonic major or minor triad, by root pitch class """
+    tonic, scale_type, diatonic_mask = _key_scale(key, mode)
+    spelling = dict(enumerate(KEYS_SPELLINGS[key])) if mode == None else _degrees_spelling(tonic, scale_type)
+    tonic_pitch_class = tonality_pitch_class(tonic)
+    tonicized_degrees = {}
+    for (i_pitch_class, tonality) in spelling.items():
+        for triad_type in [ChordsTypes.MAJOR_TRIAD, ChordsTypes.MINOR_TRIAD]:
+            triad_mask = chord_type_mask(triad_type, i_pitch_class)
+            if i_pitch_class != tonic_pitch_class and triad_mask & diatonic_mask == triad_mask and i_pitch_class not in tonicized_degrees:
+                tonicized_degrees[i_pitch_class] = _numeral(tonic, scale_type, tonality, triad_type)
+    return tonicized_degrees
+
+
+@lru_cache(maxsize = None)
+def roman_numerals_table(key, mode = None):
+    """
+    Returns the roman numeral of every chord in a key or in a mode.
+
+    The table of a key or mode is built on first call, then shared.
+
+    Parameters
+    ----------
+    key : list of one to three chars
+        Key as refered to in KEYS_SPELLINGS if mode is None, tonic of
+        the mode otherwise.
+    mode : field of enum ScalesTypes, optional
+        Overrides None. Mode of seven degrees, such as
+        ScalesTypes.DORIAN, numerals are read along. Major and minor
+        keys are used if None.
+
+    Returns
+    -------
+    out : dict
+        Maps (tonality, chord type) pairs, for every tonality of
+        TONALITIES and every field of enum ChordsTypes, to their roman
+        numeral. Degrees are read from the tonality's tone, so that
+        enharmonic roots get distinct numerals. Non diatonic dominant
+        and leading tone chords of a diatonic degree are labelled as
+        applied chords.
+
+    Examples
+    --------
+    >>> table = roman_numerals_table('C')
+    >>> table[('D', ChordsTypes.MINOR_SEVENTH)], table[('D', ChordsTypes.SEVENTH)], table[('Bb', ChordsTypes.MAJOR_TRIAD)]
+    ('ii7', 'V7/V', 'bVII')
+    >>> roman_numerals_table('Am')[('G#', ChordsTypes.DIMINISHED_SEVENTH)]
+    'vii°7'
+    >>> table = roman_numerals_table('D', ScalesTypes.DORIAN)
+    >>> table[('G', ChordsTypes.SEVENTH)], table[('C', ChordsTypes.MAJOR_TRIAD)], table[('F#', ChordsTypes.DIMINISHED_TRIAD)]
+    ('IV7', 'VII', 'vii°/IV')
+    """
+    tonic, scale_type, diatonic_mask = _key_scale(key, mode)
+    tonicized_degrees = _tonicized_degrees(key, mode)
+    table = {}
+    for tonality in TONALITIES:
+        root_pitch_class = tonality_pitch_class(tonality)
+        dominated_degree = (root_pitch_class - IntervalsTypes.FIFTH.value.count_semitones()) % N_SEMITONES_IN_OCTAVE
+        led_degree = (root_pitch_class + 1) % N_SEMITONES_IN_OCTAVE
+        for chord_type in ChordsTypes:
+            chord_mask = chord_type_mask(chord_type, root_pitch_class)
+            if chord_mask & diatonic_mask != chord_mask and chord_type in DOMINANTS_TYPES and dominated_degree in tonicized_degrees:
+                table[(tonality, chord_type)] = 'V' + CHORDS_TYPES_SUFFIXES[chord_type] + '/' + tonicized_degrees[dominated_degree]
+            elif chord_mask & diatonic_mask != chord_mask and chord_type in LEADING_TONES_TYPES and led_degree in tonicized_degrees:
+                table[(tonality, chord_type)] = 'vii' + CHORDS_TYPES_SUFFIXES[chord_type] + '/' + tonicized_degrees[led_degree]
+            else:
+                table[(tonality, chord_type)] = _numeral(tonic, scale_type, tonality, chord_type)
+    return table
+
+
+def roman_numeral(chord_properties, key, mode = None):
+    """
+    Returns the roman numeral of a chord in a key or in a mode.
+
+    Parameters
+    ----------
+    chord_properties : ChordHarmonicProperties
+        The properties of the chord. Enrichments are not labelled.
+    key : list of one to three chars
+        Key as refered to in KEYS_SPELLINGS if mode is None, tonic of
+        the mode otherwise.
+    mode : field of enum ScalesTypes, optional
+        Overrides None. Mode of seven degrees numerals are read along,
+        as in roman_numerals_table.
+
+    Returns
+    -------
+    out : str
+        The roman numeral of the chord's tonality and base type.
+
+    Examples
+    --------
+    >>> roman_numeral(ChordHarmonicProperties('B', ChordsTypes.HALF_DIMINISHED_SEVENTH, []), 'Am')
+    'iiø7'
+    """
+    return roman_numerals_table(key, mode)[(chord_properties.tonality(), chord_properties.base_type())]
+
+
+def roman_numerals(chords_properties, keys, mode = None):
+    """
+    Returns the roman numerals of a sequence of chords.
+
+    Parameters
+    ----------
+    chords_properties : list of ChordHarmonicProperties
+        The properties of each chord, or None where there is no chord.
+    keys : list of one to three chars, or list of them
+        Either a single key as refered to in KEYS_SPELLINGS, or the
+        key of each chord, as estimated by a KeyTracker.
+    mode : field of enum ScalesTypes, optional
+        Overrides None. Mode of seven degrees numerals are read along,
+        keys being then the tonics of the mode, as in
+        roman_numerals_table.
+
+    Returns
+    -------
+    out : list of str
+        The roman numeral of each chord, None where there is no chord
+        or no key.
+
+    Examples
+    --------
+    >>> progression = [ChordHarmonicProperties(tonality, base_type, []) for (tonality, base_type) in
+    ...                [('F', ChordsTypes.MAJOR_TRIAD), ('A', ChordsTypes.SEVENTH), ('D', ChordsTypes.MINOR_TRIAD), ('C', ChordsTypes.SEVENTH)]]
+    >>> roman_numerals(progression, 'F')
+    ['I', 'V7/vi', 'vi', 'V7']
+    """
+    if isinstance(keys, str):
+        keys = [keys] * len(chords_properties)
+    return [roman_numerals_table(key, mode)[(chord_properties.tonality(), chord_properties.base_type())] if chord_properties != None and key != None else None
+            for (chord_properties, key) in zip(chords_properties, keys)]
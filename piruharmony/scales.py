@@ -0,0 +1,177 @@
+from enum import Enum
+
+import numpy as np
+
+from theory import IntervalsTypes, PITCH_CLASSES_TONALITIES, N_SEMITONES_IN_OCTAVE, chord_type_mask, pitch_classes_mask, tonality_pitch_class
+from chroma import CHROMA_CHORDS_TYPES
+
+
+class ScalesTypes(Enum):
+    """
+    Gathers regular scales and modes, as intervals from their tonic
+    """
+    MAJOR                 = [IntervalsTypes.NINTH, IntervalsTypes.MAJOR_THIRD, IntervalsTypes.FOURTH, IntervalsTypes.FIFTH, IntervalsTypes.SIXTH, IntervalsTypes.MAJOR_SEVENTH]
+    DORIAN                = [IntervalsTypes.NINTH, IntervalsTypes.MINOR_THIRD, IntervalsTypes.FOURTH, IntervalsTypes.FIFTH, IntervalsTypes.SIXTH, IntervalsTypes.MINOR_SEVENTH]
+    PHRYGIAN              = [IntervalsTypes.DIMINISHED_NINTH, IntervalsTypes.MINOR_THIRD, IntervalsTypes.FOURTH, IntervalsTypes.FIFTH, IntervalsTypes.DIMINISHED_SIXTH, IntervalsTypes.MINOR_SEVENTH]
+    LYDIAN                = [IntervalsTypes.NINTH, IntervalsTypes.MAJOR_THIRD, IntervalsTypes.AUGMENTED_FOURTH, IntervalsTypes.FIFTH, IntervalsTypes.SIXTH, IntervalsTypes.MAJOR_SEVENTH]
+    MIXOLYDIAN            = [IntervalsTypes.NINTH, IntervalsTypes.MAJOR_THIRD, IntervalsTypes.FOURTH, IntervalsTypes.FIFTH, IntervalsTypes.SIXTH, IntervalsTypes.MINOR_SEVENTH]
+    NATURAL_MINOR         = [IntervalsTypes.NINTH, IntervalsTypes.MINOR_THIRD, IntervalsTypes.FOURTH, IntervalsTypes.FIFTH, IntervalsTypes.DIMINISHED_SIXTH, IntervalsTypes.MINOR_SEVENTH]
+    LOCRIAN               = [IntervalsTypes.DIMINISHED_NINTH, IntervalsTypes.MINOR_THIRD, IntervalsTypes.FOURTH, IntervalsTypes.DIMINISHED_FIFTH, IntervalsTypes.DIMINISHED_SIXTH, IntervalsTypes.MINOR_SEVENTH]
+    HARMONIC_MINOR        = [IntervalsTypes.NINTH, IntervalsTypes.MINOR_THIRD, IntervalsTypes.FOURTH, IntervalsTypes.FIFTH, IntervalsTypes.DIMINISHED_SIXTH, IntervalsTypes.MAJOR_SEVENTH]
+    MELODIC_MINOR         = [IntervalsTypes.NINTH, IntervalsTypes.MINOR_THIRD, IntervalsTypes.FOURTH, IntervalsTypes.FIFTH, IntervalsTypes.SIXTH, IntervalsTypes.MAJOR_SEVENTH]
+    MAJOR_PENTATONIC      = [IntervalsTypes.NINTH, IntervalsTypes.MAJOR_THIRD, IntervalsTypes.FIFTH, IntervalsTypes.SIXTH]
+    MINOR_PENTATONIC      = [IntervalsTypes.MINOR_THIRD, IntervalsTypes.FOURTH, IntervalsTypes.FIFTH, IntervalsTypes.MINOR_SEVENTH]
+    BLUES                 = [IntervalsTypes.MINOR_THIRD, IntervalsTypes.FOURTH, IntervalsTypes.DIMINISHED_FIFTH, IntervalsTypes.FIFTH, IntervalsTypes.MINOR_SEVENTH]
+    WHOLE_TONE            = [IntervalsTypes.NINTH, IntervalsTypes.MAJOR_THIRD, IntervalsTypes.AUGMENTED_FOURTH, IntervalsTypes.AUGMENTED_FIFTH, IntervalsTypes.MINOR_SEVENTH]
+    WHOLE_HALF_DIMINISHED = [IntervalsTypes.NINTH, IntervalsTypes.MINOR_THIRD, IntervalsTypes.FOURTH, IntervalsTypes.DIMINISHED_FIFTH, IntervalsTypes.DIMINISHED_SIXTH, IntervalsTypes.SIXTH, IntervalsTypes.MAJOR_SEVENTH]
+    HALF_WHOLE_DIMINISHED = [IntervalsTypes.DIMINISHED_NINTH, IntervalsTypes.AUGMENTED_NINTH, IntervalsTypes.MAJOR_THIRD, IntervalsTypes.AUGMENTED_FOURTH, IntervalsTypes.FIFTH, IntervalsTypes.SIXTH, IntervalsTypes.MINOR_SEVENTH]
+    AUGMENTED             = [IntervalsTypes.MINOR_THIRD, IntervalsTypes.MAJOR_THIRD, IntervalsTypes.FIFTH, IntervalsTypes.AUGMENTED_FIFTH, IntervalsTypes.MAJOR_SEVENTH]
+    CHROMATIC             = [IntervalsTypes.DIMINISHED_NINTH, IntervalsTypes.NINTH, IntervalsTypes.MINOR_THIRD, IntervalsTypes.MAJOR_THIRD, IntervalsTypes.FOURTH, IntervalsTypes.AUGMENTED_FOURTH,
+                             IntervalsTypes.FIFTH, IntervalsTypes.DIMINISHED_SIXTH, IntervalsTypes.SIXTH, IntervalsTypes.MINOR_SEVENTH, IntervalsTypes.MAJOR_SEVENTH]
+
+
+SCALES_TYPES = list(ScalesTypes)
+
+
+def scale_type_mask(scale_type, root_pitch_class = 0):
+    """
+    Returns the pitch classes of a scale type as a bitmask.
+
+    Parameters
+    ----------
+    scale_type : one field among enum ScalesTypes
+        The scale type of which the pitch classes are requested.
+    root_pitch_class : int in [0 - 11], optional
+        Overrides the default C tonic. Pitch class of the scale's tonic.
+
+    Returns
+    -------
+    out : int in [0 - 4095]
+        Bitmask where bit i is set if pitch class i belongs to the
+        scale type built over root_pitch_class.
+
+    Examples
+    --------
+    >>> bin(scale_type_mask(ScalesTypes.MAJOR))
+    '0b101010110101'
+    >>> bin(scale_type_mask(ScalesTypes.MINOR_PENTATONIC, root_pitch_class = 9)) # A, C, D, E, G
+    '0b1010010101'
+    """
+    mask = 1 << root_pitch_class
+    for interval_type in scale_type.value:
+        mask |= 1 << ((root_pitch_class + interval_type.value.count_semitones()) % N_SEMITONES_IN_OCTAVE)
+    return mask
+
+
+def scale_matcher(scales_types = SCALES_TYPES, chords_types = CHROMA_CHORDS_TYPES):
+    """
+    Returns an instance of class ScaleMatcher.
+
+    Parameters
+    ----------
+    scales_types : list of fields of enum ScalesTypes, optional
+        Overrides SCALES_TYPES. The compiled scales types.
+    chords_types : list of fields of enum ChordsTypes, optional
+        Overrides CHROMA_CHORDS_TYPES. The chords types fitted into
+        scales.
+
+    Returns
+    -------
+    out : ScaleMatcher
+        The instance of class ScaleMatcher compiled for scales_types
+        and chords_types.
+
+    See Also
+    --------
+    ScaleMatcher : a class that matches chords and voicings against
+        scales.
+
+    Examples
+    --------
+    >>> matcher = scale_matcher()
+    >>> ('G', ScalesTypes.MIXOLYDIAN) in matcher.containing_scales_labels([27, 31, 38]) # C, E, B
+    True
+    """
+    return ScaleMatcher(scales_types, chords_types)
+
+
+class ScaleMatcher:
+    """
+    A class that matches chords and voicings against scales.
+
+    Every scale type and every chord type is compiled with its 12
+    roots into a pitch classes bitmask. A chord fits a scale when its
+    bitmask has no bit out of the scale's one, so that a whole
+    progression is matched against every scale with a few array
+    operations. Scales labels are laid out as chords labels in
+    ChromaChordMatcher: label i_type * 12 + i_root is
+    scales_types[i_type] built over pitch class i_root.
+
+    Parameters
+    ----------
+    scales_types : list of fields of enum ScalesTypes, optional
+        Overrides SCALES_TYPES. The compiled scales types.
+    chords_types : list of fields of enum ChordsTypes, optional
+        Overrides CHROMA_CHORDS_TYPES. The chords types fitted into
+        scales.
+
+    Examples
+    --------
+    >>> matcher = ScaleMatcher([ScalesTypes.MAJOR], [ChordsTypes.SEVENTH])
+    >>> matcher.fitting_chords('C', ScalesTypes.MAJOR) == [('G', ChordsTypes.SEVENTH)]
+    True
+    >>> fits = matcher.containing_scales([[27, 31, 34], [29, 32, 36]]) # C, then D minor
+    >>> [matcher.labels()[i_label][0] for i_label in np.flatnonzero(fits.all(axis = 0))]
+    ['C', 'F']
+    """
+    def __init__(self, scales_types = SCALES_TYPES, chords_types = CHROMA_CHORDS_TYPES):
+        """ Builds an instance of ScaleMatcher """
+        self._scales_types = list(scales_types)
+        self._chords_types = list(chords_types)
+        pitch_classes = range(N_SEMITONES_IN_OCTAVE)
+        self._masks = np.array([scale_type_mask(scale_type, root) for scale_type in self._scales_types for root in pitch_classes], dtype = np.int64)
+        self._chords_masks = np.array([chord_type_mask(chord_type, root) for chord_type in self._chords_types for root in pitch_classes], dtype = np.int64)
+        self._fitting_chords = self.containing_scales_masks(self._chords_masks).T
+
+    def masks(self):
+        """ Returns the pitch classes bitmask of each scale label """
+        return self._masks
+
+    def labels(self):
+        """ Returns the (tonality, scale type) of each scale label """
+        return [(PITCH_CLASSES_TONALITIES[root], scale_type) for scale_type in self._scales_types for root in range(N_SEMITONES_IN_OCTAVE)]
+
+    def count_labels(self):
+        """ Returns the number of scales labels """
+        return len(self._masks)
+
+    def label_index(self, tonality, scale_type):
+        """ Returns the index of the label of a (tonality, scale type) """
+        return self._scales_types.index(scale_type) * N_SEMITONES_IN_OCTAVE + tonality_pitch_class(tonality)
+
+    def chords_labels(self):
+        """ Returns the (tonality, chord type) of each chord label """
+        return [(PITCH_CLASSES_TONALITIES[root], chord_type) for chord_type in self._chords_types for root in range(N_SEMITONES_IN_OCTAVE)]
+
+    def fitting_chords_table(self):
+        """ Returns the (n_labels, n_chords_labels) boolean table of the chords fitting each scale """
+        return self._fitting_chords
+
+    def fitting_chords(self, tonality, scale_type):
+        """ Returns the (tonality, chord type) of the chords fitting a scale """
+        chords_labels = self.chords_labels()
+        return [chords_labels[i_chord] for i_chord in np.flatnonzero(self._fitting_chords[self.label_index(tonality, scale_type)])]
+
+    def containing_scales_masks(self, masks):
+        """ Returns the (n_masks, n_labels) boolean table of the scales containing each pitch classes bitmask """
+        masks = np.asarray(masks, dtype = np.int64)
+        return (masks[:, np.newaxis] & ~self._masks[np.newaxis, :]) == 0
+
+    def containing_scales(self, voicings):
+        """ Returns the (n_voicings, n_labels) boolean table of the scales containing each voicing """
+        return self.containing_scales_masks([pitch_classes_mask(voicing) for voicing in voicings])
+
+    def containing_scales_labels(self, voicing):
+        """ Returns the (tonality, scale type) of the scales containing a voicing """
+        labels = self.labels()
+        return [labels[i_label] for i_label in np.flatnonzero(self.containing_scales([voicing])[0])]
@@ -0,0 +1,289 @@
+from functools import lru_cache
+
+import numpy as np
+
+from shared_tables import table
+from theory import CHORDS_TYPES, ChordsTypes, N_SEMITONES_IN_OCTAVE, chord_type_mask, pitch_classes_mask
+
+
+N_PITCH_CLASSES_SETS = 1 << N_SEMITONES_IN_OCTAVE
+N_INTERVAL_CLASSES = N_SEMITONES_IN_OCTAVE // 2
+NO_CHORD_TYPE = -1
+PITCH_CLASSES_SYMBOLS = '0123456789te'
+
+
+def transposed_masks(masks, n_semitones):
+    """
+    Returns pitch classes bitmasks transposed by a number of semitones.
+
+    Parameters
+    ----------
+    masks : int or numpy array of ints
+        Pitch classes bitmasks, bit i standing for pitch class i.
+    n_semitones : int
+        Transposition, upwards if positive.
+
+    Returns
+    -------
+    out : int or numpy array of ints
+        The transposed bitmasks.
+
+    Examples
+    --------
+    >>> transposed_masks(0b10010001, 2) # C major to D major
+    580
+    """
+    n_semitones %= N_SEMITONES_IN_OCTAVE
+    full_mask = N_PITCH_CLASSES_SETS - 1
+    return ((masks << n_semitones) | (masks >> (N_SEMITONES_IN_OCTAVE - n_semitones))) & full_mask
+
+
+def _masks_bits(masks):
+    """ Returns the (n_masks, 12) bits of pitch classes bitmasks """
+    return ((np.asarray(masks)[..., np.newaxis] >> np.arange(N_SEMITONES_IN_OCTAVE)) & 1).astype(np.uint8)
+
+
+def _bits_masks(bits):
+    """ Returns the pitch classes bitmasks of (n_masks, 12) bits """
+    return (bits.astype(np.int64) << np.arange(N_SEMITONES_IN_OCTAVE)).sum(axis = -1)
+
+
+def _smallest_rotations(masks):
+    """ Returns the smallest transposition to 0 of masks over their own pitch classes, and the transposition """
+    smallest, roots = np.full(len(masks), N_PITCH_CLASSES_SETS), np.zeros(len(masks), dtype = np.int64)
+    for root in range(N_SEMITONES_IN_OCTAVE):
+        rotated = transposed_masks(masks, -root)
+        is_smaller = (((masks >> root) & 1) == 1) & (rotated < smallest)
+        smallest, roots = np.where(is_smaller, rotated, smallest), np.where(is_smaller, root, roots)
+    return np.where(masks == 0, 0, smallest), roots
+
+
+"""
+Forte's catalogue departs from its ordering principle for one pair of
+Z-related hexachords, listed here by prime form.
+"""
+FORTE_NAMES_EXCEPTIONS = {0b110010111: '6-Z17', 0b101100111: '6-Z43'} # 012478, 012568
+
+
+def _forte_style_names(prime_forms, cardinalities, interval_vectors, complements_prime_forms):
+    """ Returns the name of each distinct prime form, numbered by decreasing interval vectors, Z-related sets last """
+    names = {}
+    for cardinality in range(N_SEMITONES_IN_OCTAVE // 2 + 1):
+        same_vector_primes = {}
+        for prime_form in prime_forms[cardinalities[prime_forms] == cardinality]:
+            same_vector_primes.setdefault(tuple(interval_vectors[prime_form]), []).append(int(prime_form))
+        first_primes = sorted([min(primes) for primes in same_vector_primes.values()], key = lambda prime: [-int(n) for n in interval_vectors[prime]])
+        z_related_primes = [prime for first_prime in first_primes for prime in sorted(same_vector_primes[tuple(interval_vectors[first_prime])])[1:]]
+        for (i_set_class, prime) in enumerate(first_primes + z_related_primes):
+            z_tag = 'Z' if len(same_vector_primes[tuple(interval_vectors[prime])]) > 1 else ''
+            names[prime] = FORTE_NAMES_EXCEPTIONS.get(prime, '{}-{}{}'.format(cardinality, z_tag, i_set_class + 1))
+    for prime in prime_forms[cardinalities[prime_forms] > N_SEMITONES_IN_OCTAVE // 2]:
+        complement_name = names[int(complements_prime_forms[prime])]
+        names[int(prime)] = '{}-{}'.format(cardinalities[prime], complement_name.split('-')[1])
+    return names
+
+
+SET_CLASSES_TABLE = 'set_classes'
+
+
+def _chords_types_arrays():
+    """ Returns the ChordsTypes code and root of pitch classes sets that are exactly a chord type """
+    chords_types = np.full(N_PITCH_CLASSES_SETS, NO_CHORD_TYPE, dtype = np.int8)
+    chords_roots = np.full(N_PITCH_CLASSES_SETS, NO_CHORD_TYPE, dtype = np.int8)
+    for (code, chord_type) in reversed(list(enumerate(CHORDS_TYPES))):
+        if chord_type != ChordsTypes.UNKNOWN:
+            for root in reversed(range(N_SEMITONES_IN_OCTAVE)):
+                chords_types[chord_type_mask(chord_type, root)] = code
+                chords_roots[chord_type_mask(chord_type, root)] = root
+    return chords_types, chords_roots
+
+
+def _set_class_arrays():
+    """ Returns the arrays of the set class table, indexed by pitch classes bitmask """
+    masks = np.arange(N_PITCH_CLASSES_SETS)
+    bits = _masks_bits(masks)
+    cardinalities = bits.sum(axis = 1).astype(np.uint8)
+    interval_vectors = np.stack([(bits & np.roll(bits, -n, axis = 1)).sum(axis = 1) for n in range(1, N_INTERVAL_CLASSES + 1)], axis = 1)
+    interval_vectors[:, -1] //= 2
+    interval_vectors = interval_vectors.astype(np.uint8)
+    normal_forms, normal_forms_roots = _smallest_rotations(masks)
+    inversions_normal_forms = _smallest_rotations(_bits_masks(bits[:, -np.arange(N_SEMITONES_IN_OCTAVE) % N_SEMITONES_IN_OCTAVE]))[0]
+    prime_forms = np.minimum(normal_forms, inversions_normal_forms).astype(np.uint16)
+    distinct_prime_forms = np.unique(prime_forms)
+    complements_prime_forms = prime_forms[(N_PITCH_CLASSES_SETS - 1) ^ masks]
+    names = _forte_style_names(distinct_prime_forms, cardinalities, interval_vectors, complements_prime_forms)
+    chords_types, chords_roots = _chords_types_arrays()
+    return {'cardinalities': cardinalities, 'interval_vectors': interval_vectors, 'normal_forms_roots': normal_forms_roots.astype(np.uint8),
+            'prime_forms': prime_forms, 'names': np.array([names[int(prime_form)] for prime_form in distinct_prime_forms]),
+            'set_classes': np.searchsorted(distinct_prime_forms, prime_forms).astype(np.int16), 'chords_types': chords_types, 'chords_roots': chords_roots}
+
+
+@lru_cache(maxsize = None)
+def set_class_table():
+    """
+    Returns the set class table of all pitch classes sets.
+
+    The table is built once, on first call.
+
+    Returns
+    -------
+    out : SetClassTable
+        The shared instance of class SetClassTable.
+
+    See Also
+    --------
+    SetClassTable : a class that gathers set class descriptors of all
+        pitch classes sets.
+
+    Examples
+    --------
+    >>> set_class_table().names([0b10010001]) # C major triad
+    ['3-11']
+    """
+    return SetClassTable()
+
+
+class SetClassTable:
+    """
+    A class that gathers set class descriptors of all pitch classes
+    sets.
+
+    Descriptors of the 4096 pitch classes sets are precomputed into
+    compact arrays indexed by pitch classes bitmask, so that a whole
+    batch of voicings is classified by fancy indexing. Prime forms
+    follow Rahn's packing. Set classes names follow Forte's ordering
+    principle (decreasing interval vectors, Z-related sets appended
+    last, complements sharing their number) and match his catalogue.
+    The arrays form the SET_CLASSES_TABLE table of module
+    shared_tables, so that worker processes can attach them from shared
+    memory.
+
+    Examples
+    --------
+    >>> table = SetClassTable()
+    >>> masks = voicings_masks([[27, 31, 34], [29, 32, 36, 39]]) # C major, D minor seventh
+    >>> table.names(masks)
+    ['3-11', '4-26']
+    >>> table.interval_vectors(masks)
+    array([[0, 0, 1, 1, 1, 0],
+           [0, 1, 2, 1, 2, 0]], dtype=uint8)
+    """
+    def __init__(self):
+        """ Builds an instance of SetClassTable """
+        arrays = table(SET_CLASSES_TABLE, _set_class_arrays)
+        self._cardinalities = arrays['cardinalities']
+        self._interval_vectors = arrays['interval_vectors']
+        self._normal_forms_roots = arrays['normal_forms_roots']
+        self._prime_forms = arrays['prime_forms']
+        self._names = arrays['names'].tolist()
+        self._set_classes = arrays['set_classes']
+        self._chords_types = arrays['chords_types']
+        self._chords_roots = arrays['chords_roots']
+
+    def cardinalities(self, masks):
+        """ Returns the number of pitch classes of each mask """
+        return self._cardinalities[masks]
+
+    def interval_vectors(self, masks):
+        """ Returns the interval-class vector of each mask """
+        return self._interval_vectors[masks]
+
+    def normal_forms_roots(self, masks):
+        """ Returns the first pitch class of the normal form of each mask """
+        return self._normal_forms_roots[masks]
+
+    def prime_forms(self, masks):
+        """ Returns the prime form of each mask, as a bitmask """
+        return self._prime_forms[masks]
+
+    def set_classes(self, masks):
+        """ Returns the index of the set class of each mask in self.set_classes_names() """
+        return self._set_classes[masks]
+
+    def set_classes_names(self):
+        """ Returns the Forte-style name of each set class, sorted by prime form """
+        return self._names
+
+    def names(self, masks):
+        """ Returns the Forte-style name of the set class of each mask """
+        return [self._names[i_set_class] for i_set_class in self._set_classes[masks]]
+
+    def chords_types_codes(self, masks):
+        """ Returns the index in CHORDS_TYPES of the chord type each mask exactly is, NO_CHORD_TYPE otherwise """
+        return self._chords_types[masks]
+
+    def chords_roots(self, masks):
+        """ Returns the root pitch class of the chord type each mask exactly is, NO_CHORD_TYPE otherwise """
+        return self._chords_roots[masks]
+
+
+def normal_form(mask):
+    """
+    Returns the normal form of a pitch classes set.
+
+    Parameters
+    ----------
+    mask : int in [0 - 4095]
+        Pitch classes bitmask, bit i standing for pitch class i.
+
+    Returns
+    -------
+    out : list of ints
+        Pitch classes of the set in normal form order.
+
+    Examples
+    --------
+    >>> normal_form(0b100010010000) # E, G, B
+    [4, 7, 11]
+    >>> normal_form(0b1000010001) # C, E, A
+    [9, 0, 4]
+    """
+    root = int(set_class_table().normal_forms_roots(mask))
+    return [(root + n) % N_SEMITONES_IN_OCTAVE for n in range(N_SEMITONES_IN_OCTAVE) if (mask >> ((root + n) % N_SEMITONES_IN_OCTAVE)) & 1]
+
+
+def prime_form_symbol(mask):
+    """
+    Returns the prime form of a pitch classes set as a string.
+
+    Parameters
+    ----------
+    mask : int in [0 - 4095]
+        Pitch classes bitmask, bit i standing for pitch class i.
+
+    Returns
+    -------
+    out : str
+        Pitch classes of the prime form, 10 and 11 being written t
+        and e.
+
+    Examples
+    --------
+    >>> prime_form_symbol(0b10001001) # C minor triad
+    '037'
+    """
+    prime_form = int(set_class_table().prime_forms(mask))
+    return ''.join([PITCH_CLASSES_SYMBOLS[i] for i in range(N_SEMITONES_IN_OCTAVE) if (prime_form >> i) & 1])
+
+
+def voicings_masks(voicings):
+    """
+    Returns the pitch classes bitmasks of voicings.
+
+    Parameters
+    ----------
+    voicings : list of lists of int
+        Keyboard notes indices of each voicing, as returned by
+        StringsInstrument.to_keyboard.
+
+    Returns
+    -------
+    out : numpy array of ints
+        Pitch classes bitmask of each voicing.
+
+    Examples
+    --------
+    >>> voicings_masks([[27, 31, 34, 39]])
+    array([145])
+    """
+    return np.array([pitch_classes_mask(voicing) for voicing in voicings], dtype = np.int64)
@@ -0,0 +1,231 @@
+import functools
+
+import numpy as np
+
+from instruments import MUTED
+from jobs import chords_properties_shard
+from theory import ChordHarmonicProperties, ChordsTypes, IntervalsTypes
+
+
+DEFAULT_SPAN = 5
+DEFAULT_N_FRETS = 15
+DEFAULT_MIN_SOUNDING_STRINGS = 3
+ANALYSIS_CHUNK_SIZE = 256
+
+
+def position_voicings(instrument, position, span = DEFAULT_SPAN, n_frets = DEFAULT_N_FRETS, min_sounding_strings = DEFAULT_MIN_SOUNDING_STRINGS):
+    """
+    Returns the fret vectors of a position of a strings instrument, in
+    canonical order.
+
+    A fret vector belongs to the position of its lowest fretted note:
+    each string is muted, open or fretted between position and
+    position + span - 1, and at least one string is fretted at
+    position. Fret vectors without any fretted note belong to the
+    first position. Each fret vector thus belongs to a single position.
+
+    Parameters
+    ----------
+    instrument : StringsInstrument
+        The instrument the voicings are played on.
+    position : int
+        The lowest fretted fret, from 1 to n_frets.
+    span : int, optional
+        Overrides DEFAULT_SPAN. Number of frets under the hand.
+    n_frets : int, optional
+        Overrides DEFAULT_N_FRETS. Highest fret of the instrument.
+    min_sounding_strings : int, optional
+        Overrides DEFAULT_MIN_SOUNDING_STRINGS. Fret vectors with less
+        strings that are not muted are skipped.
+
+    Returns
+    -------
+    out : numpy array of shape (n_voicings, n_strings)
+        The fret vectors, muted strings being set to MUTED, sorted in
+        lexicographic order, lowest string first.
+
+    Examples
+    --------
+    >>> position_voicings(strings_instrument(['C4', 'E4', 'G4']), 1, span = 2, min_sounding_strings = 3)[:3]
+    array([[0, 0, 0],
+           [0, 0, 1],
+           [0, 1, 0]], dtype=int8)
+    """
+    strings_frets = np.array([MUTED, 0] + list(range(position, min(position + span, n_frets + 1))), dtype = np.int8)
+    n_strings = instrument.count_strings()
+    frets = strings_frets[np.indices([len(strings_frets)] * n_strings).reshape(n_strings, -1).T]
+    lowest_frets = np.where(frets > 0, frets, n_frets + 1).min(axis = 1)
+    is_in_position = (lowest_frets == position) | ((lowest_frets == n_frets + 1) & (position == 1))
+    return frets[is_in_position & (np.count_nonzero(frets != MUTED, axis = 1) >= min_sounding_strings)]
+
+
+def voicings_signatures(instrument, frets):
+    """
+    Returns the sounding notes signature of fret vectors.
+
+    The most likely harmonic properties of a voicing depend on its
+    notes, their octaves and their order, which drive the spelling of
+    the chord, so that the signature keeps them all: only the muted
+    strings are left out.
+
+    Parameters
+    ----------
+    instrument : StringsInstrument
+        The instrument the voicings are played on.
+    frets : numpy array of shape (n_voicings, n_strings)
+        Frets of each voicing, muted strings being set to MUTED.
+
+    Returns
+    -------
+    out : numpy array of shape (n_voicings, n_strings)
+        Keyboard notes indices of each voicing, lowest string first,
+        as returned by StringsInstrument.to_keyboard, followed by MUTED
+        for each muted string.
+
+    Examples
+    --------
+    >>> voicings_signatures(guitar(), np.array([[MUTED, 3, 2, 0, 1, 0], [3, MUTED, 2, 0, 1, 0]])) # C major, bass C then G
+    array([[27, 31, 34, 38, 43, -1],
+           [22, 31, 34, 38, 43, -1]], dtype=int8)
+    """
+    i_notes_on_keyboard = instrument.frets_to_keyboard(frets)[0]
+    sounding_first = np.argsort(i_notes_on_keyboard == MUTED, axis = 1, kind = 'stable')
+    return np.take_along_axis(i_notes_on_keyboard, sounding_first, axis = 1).astype(np.int8)
+
+
+def shape_atlas(instrument, span = DEFAULT_SPAN, n_frets = DEFAULT_N_FRETS, min_sounding_strings = DEFAULT_MIN_SOUNDING_STRINGS, map_function = map):
+    """
+    Returns an instance of class ShapeAtlas of every fret combination
+    within a span on a strings instrument.
+
+    Fret vectors are enumerated position by position in canonical
+    order, then gathered by signature, that is by sounding notes: only
+    the first fret vector of each signature is analyzed, as voicings
+    sounding the same notes on the same strings order share their most
+    likely harmonic properties.
+
+    Parameters
+    ----------
+    instrument : StringsInstrument
+        The instrument the voicings are played on.
+    span : int, optional
+        Overrides DEFAULT_SPAN. Number of frets under the hand.
+    n_frets : int, optional
+        Overrides DEFAULT_N_FRETS. Highest fret of the instrument.
+    min_sounding_strings : int, optional
+        Overrides DEFAULT_MIN_SOUNDING_STRINGS. Fret vectors with less
+        strings that are not muted are skipped.
+    map_function : function, optional
+        Overrides map. Execution backend positions and chunks of
+        signatures are mapped with, such as Pool.imap to distribute
+        them across cores.
+
+    Returns
+    -------
+    out : ShapeAtlas
+        The instance of class ShapeAtlas of the instrument.
+
+    See Also
+    --------
+    ShapeAtlas : a class that gathers the chord shapes of a strings
+        instrument by harmonic properties.
+
+    Examples
+    --------
+    >>> with multiprocessing.Pool() as pool:
+    ...     atlas = shape_atlas(strings_instrument(['D3', 'A3', 'D4', 'G4', 'A4', 'D5']), map_function = pool.imap)
+    >>> [0, 0, 0, 0, 0, 0] in atlas.shapes('D', ChordsTypes.MAJOR_TRIAD).tolist() # open DADGAD, D sus4
+    False
+    >>> [0, 0, 4, MUTED, 0, 0] in atlas.shapes('D', ChordsTypes.MAJOR_TRIAD).tolist()
+    True
+    """
+    position_function = functools.partial(_position_voicings_signatures, instrument, span = span, n_frets = n_frets, min_sounding_strings = min_sounding_strings)
+    frets, signatures = [np.concatenate(arrays) for arrays in zip(*map_function(position_function, range(1, n_frets + 1)))]
+    unique_signatures, i_first_voicings, voicings_entries = np.unique(signatures, return_index = True, return_inverse = True, axis = 0)
+    representatives = [[i_fret if i_fret != MUTED else None for i_fret in i_frets] for i_frets in frets[i_first_voicings].tolist()]
+    chunks = [representatives[chunk_start:chunk_start + ANALYSIS_CHUNK_SIZE] for chunk_start in range(0, len(representatives), ANALYSIS_CHUNK_SIZE)]
+    entries_properties = [chord_properties for chunk_properties in map_function(functools.partial(chords_properties_shard, instrument), chunks) for chord_properties in chunk_properties]
+    return ShapeAtlas(instrument, frets, voicings_entries.reshape(-1), unique_signatures, entries_properties)
+
+
+def _position_voicings_signatures(instrument, position, span, n_frets, min_sounding_strings):
+    """ Returns the fret vectors of a position and their signatures """
+    frets = position_voicings(instrument, position, span, n_frets, min_sounding_strings)
+    return frets, voicings_signatures(instrument, frets)
+
+
+class ShapeAtlas:
+    """
+    A class that gathers the chord shapes of a strings instrument by
+    harmonic properties.
+
+    Entries of the atlas are the distinct signatures of the voicings,
+    that is their sounding notes, sorted in lexicographic order. Each
+    one holds the most likely harmonic properties of its voicings,
+    which are kept in canonical order: by position, then in
+    lexicographic order of their frets.
+
+    Parameters
+    ----------
+    instrument : StringsInstrument
+        The instrument the voicings are played on.
+    frets : numpy array of shape (n_voicings, n_strings)
+        Fret vectors of the atlas, in canonical order.
+    voicings_entries : numpy array of n_voicings ints
+        Index of the entry of each voicing.
+    signatures : numpy array of shape (n_entries, n_strings)
+        Sorted signatures of the entries, as returned by
+        voicings_signatures.
+    entries_properties : list of lists
+        The [tonality, base type name, enrichments names] of each
+        entry, None where no chord is found.
+
+    Examples
+    --------
+    >>> atlas = shape_atlas(strings_instrument(['C3', 'E3', 'G3']), span = 2, n_frets = 4, min_sounding_strings = 2)
+    >>> atlas.count_voicings(), atlas.count_entries()
+    (122, 113)
+    >>> atlas.shapes('C', ChordsTypes.MAJOR_TRIAD).tolist()
+    [[0, 0, 0]]
+    """
+    def __init__(self, instrument, frets, voicings_entries, signatures, entries_properties):
+        """ Builds an instance of ShapeAtlas """
+        self._instrument = instrument
+        self._frets = frets
+        self._voicings_entries = voicings_entries
+        self._signatures = signatures
+        self._entries_properties = entries_properties
+
+    def instrument(self):
+        """ Returns the instrument the voicings are played on """
+        return self._instrument
+
+    def count_voicings(self):
+        """ Returns the number of fret vectors of the atlas """
+        return len(self._frets)
+
+    def count_entries(self):
+        """ Returns the number of distinct signatures of the atlas """
+        return len(self._signatures)
+
+    def signatures(self):
+        """ Returns the sorted signatures of the entries """
+        return self._signatures
+
+    def entry_properties(self, i_entry):
+        """ Returns the most likely ChordHarmonicProperties of an entry, None if no chord is found """
+        entry_properties = self._entries_properties[i_entry]
+        if entry_properties == None:
+            return None
+        tonality, base_type_name, enrichments_names = entry_properties
+        return ChordHarmonicProperties(tonality, ChordsTypes[base_type_name], [IntervalsTypes[name] for name in enrichments_names])
+
+    def entry_shapes(self, i_entry):
+        """ Returns the fret vectors of an entry, in canonical order """
+        return self._frets[self._voicings_entries == i_entry]
+
+    def shapes(self, tonality, base_type):
+        """ Returns the fret vectors, in canonical order, of the entries with a tonality and base type, whatever their enrichments """
+        entries = [i_entry for (i_entry, entry_properties) in enumerate(self._entries_properties)
+                   if entry_properties != None and entry_properties[0] == tonality and entry_properties[1] == base_type.name]
+        return self._frets[np.isin(self._voicings_entries, entries)]
@@ -0,0 +1,210 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+"""
+Arrays of each shared table are laid out one after the other in a
+single shared memory segment, each one starting on a multiple of
+ARRAYS_ALIGNMENT bytes.
+"""
+ARRAYS_ALIGNMENT = 64
+_TABLES = {}
+_ATTACHED_SEGMENTS = []
+
+
+def table(name, builder):
+    """
+    Returns the arrays of a precomputed lookup table.
+
+    Parameters
+    ----------
+    name : str
+        Name of the table, which identifies it across processes.
+    builder : function
+        Called without arguments on first use when the table was
+        neither built nor attached in this process, returns a dict of
+        numpy arrays.
+
+    Returns
+    -------
+    out : dict of numpy arrays
+        The arrays of the table, read-only if they were attached from
+        shared memory.
+
+    See Also
+    --------
+    share_tables : Places the tables built in this process into shared
+        memory.
+    attach_tables : Attaches tables shared by another process.
+
+    Examples
+    --------
+    >>> table('squares', lambda: {'values': np.arange(4) ** 2})['values']
+    array([0, 1, 4, 9])
+    """
+    if name not in _TABLES:
+        _TABLES[name] = builder()
+    return _TABLES[name]
+
+
+def tables_names():
+    """ Returns the names of the tables built or attached in this process """
+    return list(_TABLES.keys())
+
+
+def share_tables(names = None):
+    """
+    Places lookup tables into a shared memory segment.
+
+    Parameters
+    ----------
+    names : list of str, optional
+        Overrides None. Names of the tables to share, all the tables
+        built in this process if None.
+
+    Returns
+    -------
+    out : SharedTables
+        The owner of the segment, whose handle is sent to workers.
+
+    See Also
+    --------
+    attach_tables : Attaches tables shared by another process.
+
+    Examples
+    --------
+    >>> set_class_table() # builds the table in the parent process
+    >>> shared_tables = share_tables()
+    >>> pool = multiprocessing.Pool(initializer = attach_tables, initargs = (shared_tables.handle(),))
+    """
+    names = tables_names() if names == None else names
+    layout, size = [], 0
+    for name in names:
+        arrays_layout = []
+        for (array_name, array) in _TABLES[name].items():
+            array = np.asarray(array)
+            arrays_layout.append((array_name, array.dtype.str, array.shape, size))
+            size += -(-array.nbytes // ARRAYS_ALIGNMENT) * ARRAYS_ALIGNMENT
+        layout.append((name, tuple(arrays_layout)))
+    segment = shared_memory.SharedMemory(create = True, size = max(size, 1))
+    handle = SharedTablesHandle(segment.name, tuple(layout))
+    for (name, arrays) in _segment_tables(segment, handle):
+        for (array_name, array) in arrays.items():
+            array[...] = _TABLES[name][array_name]
+    return SharedTables(segment, handle)
+
+
+def attach_tables(handle):
+    """
+    Attaches tables shared by another process, so that they are used
+    instead of being built in this process.
+
+    Parameters
+    ----------
+    handle : SharedTablesHandle
+        Handle of the tables, as returned by SharedTables.handle.
+
+    Examples
+    --------
+    >>> attach_tables(handle)
+    >>> set_class_table().names([0b10010001]) # read from shared memory
+    ['3-11']
+    """
+    try:
+        segment = shared_memory.SharedMemory(name = handle.segment_name(), track = False)
+    except TypeError:
+        # Before Python 3.13, attached segments are registered to the resource tracker workers share with their parent
+        segment = shared_memory.SharedMemory(name = handle.segment_name())
+    _ATTACHED_SEGMENTS.append(segment)
+    for (name, arrays) in _segment_tables(segment, handle):
+        for array in arrays.values():
+            array.flags.writeable = False
+        _TABLES[name] = arrays
+
+
+def _segment_tables(segment, handle):
+    """ Returns the (name, arrays) of the tables laid out in a shared memory segment """
+    return [(name, {array_name: np.ndarray(shape, dtype = np.dtype(dtype), buffer = segment.buf, offset = offset) for (array_name, dtype, shape, offset) in arrays_layout})
+            for (name, arrays_layout) in handle.layout()]
+
+
+class SharedTablesHandle(tuple):
+    """
+    A class that describes lookup tables placed in shared memory.
+
+    Handles are small picklable tuples gathering the name of the shared
+    memory segment and the name, dtype, shape and offset of each array
+    of each table.
+
+    Parameters
+    ----------
+    segment_name : str
+        Name of the shared memory segment.
+    layout : tuple of tuples
+        The (table name, arrays layout) of each table, arrays layout
+        being a tuple of (array name, dtype, shape, offset).
+
+    Examples
+    --------
+    >>> handle = share_tables().handle()
+    >>> [name for (name, _) in handle.layout()]
+    ['set_classes']
+    """
+    __slots__ = ()
+
+    def __new__(cls, segment_name, layout):
+        """ Builds an instance of SharedTablesHandle """
+        return tuple.__new__(cls, (segment_name, layout))
+
+    def __getnewargs__(self):
+        """ Returns the arguments rebuilding the handle when unpickled """
+        return tuple(self)
+
+    def segment_name(self):
+        """ Returns the name of the shared memory segment """
+        return self[0]
+
+    def layout(self):
+        """ Returns the (table name, arrays layout) of each shared table """
+        return self[1]
+
+
+class SharedTables:
+    """
+    A class that owns lookup tables placed in shared memory.
+
+    The owner keeps the segment alive, and unlinks it once workers are
+    done with it.
+
+    Parameters
+    ----------
+    segment : multiprocessing.shared_memory.SharedMemory
+        The segment holding the tables.
+    handle : SharedTablesHandle
+        The handle of the tables.
+
+    Examples
+    --------
+    >>> shared_tables = share_tables()
+    >>> with multiprocessing.Pool(initializer = attach_tables, initargs = (shared_tables.handle(),)) as pool:
+    ...     names = pool.map(set_classes_names, voicings_batches)
+    >>> shared_tables.unlink()
+    """
+    def __init__(self, segment, handle):
+        """ Builds an instance of SharedTables """
+        self._segment = segment
+        self._handle = handle
+
+    def handle(self):
+        """ Returns the picklable handle workers attach the tables with """
+        return self._handle
+
+    def size(self):
+        """ Returns the size in bytes of the shared memory segment """
+        return self._segment.size
+
+    def unlink(self):
+        """ Closes and destroys the shared memory segment """
+        self._segment.close()
+        self._segment.unlink()
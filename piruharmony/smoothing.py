@@ -0,0 +1,267 @@
+import numpy as np
+
+from theory import PITCH_CLASSES_TONALITIES, N_SEMITONES_IN_OCTAVE, chord_type_mask, tonality_pitch_class
+from chroma import CHROMA_CHORDS_TYPES
+
+
+DEFAULT_SELF_TRANSITION_PENALTY = .5
+DEFAULT_ROOT_MOVEMENT_WEIGHT = .1
+DEFAULT_TYPE_CHANGE_WEIGHT = .1
+
+
+def fifths_distances():
+    """
+    Returns the distance along the circle of fifths of each root
+    movement.
+
+    Returns
+    -------
+    out : numpy array of 12 ints in [0 - 6]
+        Element k is the number of fifths separating two roots that
+        are k semitones apart.
+
+    Examples
+    --------
+    >>> fifths_distances()
+    array([0, 5, 2, 3, 4, 1, 6, 1, 4, 3, 2, 5])
+    """
+    n_fifths = (7 * np.arange(N_SEMITONES_IN_OCTAVE)) % N_SEMITONES_IN_OCTAVE
+    return np.minimum(n_fifths, N_SEMITONES_IN_OCTAVE - n_fifths)
+
+
+def chords_types_distances(chords_types = CHROMA_CHORDS_TYPES):
+    """
+    Returns the distances between chords types.
+
+    Parameters
+    ----------
+    chords_types : list of fields of enum ChordsTypes, optional
+        Overrides CHROMA_CHORDS_TYPES. The compared chords types.
+
+    Returns
+    -------
+    out : numpy array of shape (len(chords_types), len(chords_types))
+        One minus the Jaccard similarity of the pitch classes of the
+        chords types built over the same root.
+
+    Examples
+    --------
+    >>> chords_types_distances([ChordsTypes.MAJOR_TRIAD, ChordsTypes.SEVENTH])
+    array([[0.  , 0.25],
+           [0.25, 0.  ]])
+    """
+    masks = [chord_type_mask(chord_type) for chord_type in chords_types]
+    return np.array([[1. - bin(mask_a & mask_b).count('1') / bin(mask_a | mask_b).count('1') for mask_b in masks] for mask_a in masks])
+
+
+def viterbi_decode(scores, transitions):
+    """
+    Returns the best labels path through frame-level scores.
+
+    Parameters
+    ----------
+    scores : numpy array of shape (n_frames, n_labels)
+        Log-domain scores of each label at each frame, higher is
+        better.
+    transitions : numpy array of shape (n_labels, n_labels)
+        Log-domain score of moving from label i to label j.
+
+    Returns
+    -------
+    out : numpy array of n_frames ints
+        Index of the label chosen at each frame, empty if there is no
+        frame.
+
+    See Also
+    --------
+    ChordSequenceSmoother : decodes chords labels with a structured
+        transition matrix in O(n_frames * n_labels * (12 + n_types)).
+
+    Examples
+    --------
+    >>> scores = np.array([[1., 0.], [.4, .6], [1., 0.]])
+    >>> viterbi_decode(scores, np.array([[0., -.5], [-.5, 0.]]))
+    array([0, 0, 0])
+    """
+    scores = np.asarray(scores, dtype = np.float64)
+    n_frames, n_labels = scores.shape
+    if n_frames == 0:
+        return np.empty(0, dtype = np.int32)
+    back_pointers = np.empty((n_frames, n_labels), dtype = np.int32)
+    delta = scores[0].copy()
+    for i_frame in range(1, n_frames):
+        candidates = delta[:, np.newaxis] + transitions
+        back_pointers[i_frame] = candidates.argmax(axis = 0)
+        delta = candidates[back_pointers[i_frame], np.arange(n_labels)] + scores[i_frame]
+    return _backtracked(back_pointers, int(delta.argmax()))
+
+
+def _backtracked(back_pointers, i_last_label):
+    """ Returns the labels path ending with i_last_label """
+    path = np.empty(len(back_pointers), dtype = np.int32)
+    path[-1] = i_last_label
+    for i_frame in range(len(back_pointers) - 1, 0, -1):
+        path[i_frame - 1] = back_pointers[i_frame, path[i_frame]]
+    return path
+
+
+def labels_segments(path):
+    """
+    Returns the segments of constant label in a labels path.
+
+    Parameters
+    ----------
+    path : numpy array of ints
+        Index of the label chosen at each frame.
+
+    Returns
+    -------
+    out : tuple of three numpy arrays
+        First frame, end frame (excluded) and label index of each
+        segment.
+
+    Examples
+    --------
+    >>> labels_segments(np.array([3, 3, 5, 5, 5, 3]))
+    (array([0, 2, 5]), array([2, 5, 6]), array([3, 5, 3]))
+    """
+    path = np.asarray(path)
+    if len(path) == 0:
+        return np.empty(0, dtype = np.intp), np.empty(0, dtype = np.intp), path
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(path)) + 1])
+    ends = np.concatenate([starts[1:], [len(path)]])
+    return starts, ends, path[starts]
+
+
+def chord_sequence_smoother(chords_types = CHROMA_CHORDS_TYPES, self_transition_penalty = DEFAULT_SELF_TRANSITION_PENALTY,
+                            root_movement_weight = DEFAULT_ROOT_MOVEMENT_WEIGHT, type_change_weight = DEFAULT_TYPE_CHANGE_WEIGHT):
+    """
+    Returns an instance of class ChordSequenceSmoother.
+
+    Parameters
+    ----------
+    chords_types : list of fields of enum ChordsTypes, optional
+        Overrides CHROMA_CHORDS_TYPES. Chords types of the labels.
+    self_transition_penalty : float, optional
+        Overrides DEFAULT_SELF_TRANSITION_PENALTY. Penalty paid for
+        leaving a label, that is the advantage of self transitions.
+    root_movement_weight : float, optional
+        Overrides DEFAULT_ROOT_MOVEMENT_WEIGHT. Penalty of a root
+        movement across the whole circle of fifths.
+    type_change_weight : float, optional
+        Overrides DEFAULT_TYPE_CHANGE_WEIGHT. Penalty of a change
+        between chords types sharing no pitch class.
+
+    Returns
+    -------
+    out : ChordSequenceSmoother
+        The instance of class ChordSequenceSmoother built with the
+        input parameters.
+
+    See Also
+    --------
+    ChordSequenceSmoother : a class that smoothes frame-level chords
+        scores.
+
+    Examples
+    --------
+    >>> smoother = chord_sequence_smoother(self_transition_penalty = 1.)
+    >>> smoother.count_labels()
+    216
+    """
+    return ChordSequenceSmoother(chords_types, self_transition_penalty, root_movement_weight, type_change_weight)
+
+
+class ChordSequenceSmoother:
+    """
+    A class that smoothes frame-level chords scores with a Viterbi
+    decoder.
+
+    Labels are laid out as in ChromaChordMatcher: label
+    i_type * 12 + i_root is chords_types[i_type] built over pitch
+    class i_root. Leaving a label costs self_transition_penalty, plus
+    a root movement penalty growing with the distance along the circle
+    of fifths, plus a type change penalty growing with the pitch
+    classes the chords types do not share. This transition matrix
+    factorizes over roots and types, so that each frame is decoded in
+    O(n_labels * (12 + n_types)) rather than O(n_labels ** 2).
+
+    Parameters
+    ----------
+    chords_types : list of fields of enum ChordsTypes, optional
+        Overrides CHROMA_CHORDS_TYPES. Chords types of the labels.
+    self_transition_penalty : float, optional
+        Overrides DEFAULT_SELF_TRANSITION_PENALTY.
+    root_movement_weight : float, optional
+        Overrides DEFAULT_ROOT_MOVEMENT_WEIGHT.
+    type_change_weight : float, optional
+        Overrides DEFAULT_TYPE_CHANGE_WEIGHT.
+
+    Examples
+    --------
+    >>> smoother = ChordSequenceSmoother()
+    >>> scores = np.zeros((3, smoother.count_labels()))
+    >>> scores[:, 0], scores[1, 7] = .8, 1. # C, C, then G would flicker
+    >>> smoother.decoded(scores)
+    array([0, 0, 0], dtype=int32)
+    """
+    def __init__(self, chords_types = CHROMA_CHORDS_TYPES, self_transition_penalty = DEFAULT_SELF_TRANSITION_PENALTY,
+                 root_movement_weight = DEFAULT_ROOT_MOVEMENT_WEIGHT, type_change_weight = DEFAULT_TYPE_CHANGE_WEIGHT):
+        """ Builds an instance of ChordSequenceSmoother """
+        self._chords_types = list(chords_types)
+        self._penalty = self_transition_penalty
+        root_intervals = (np.arange(N_SEMITONES_IN_OCTAVE)[np.newaxis, :] - np.arange(N_SEMITONES_IN_OCTAVE)[:, np.newaxis]) % N_SEMITONES_IN_OCTAVE
+        self._roots_transitions = -root_movement_weight * fifths_distances()[root_intervals] / (N_SEMITONES_IN_OCTAVE // 2)
+        self._types_transitions = -type_change_weight * chords_types_distances(self._chords_types)
+
+    def count_labels(self):
+        """ Returns the number of labels """
+        return len(self._chords_types) * N_SEMITONES_IN_OCTAVE
+
+    def labels(self):
+        """ Returns the (tonality, base type) of each label """
+        return [(PITCH_CLASSES_TONALITIES[root], chord_type) for chord_type in self._chords_types for root in range(N_SEMITONES_IN_OCTAVE)]
+
+    def label_index(self, tonality, base_type):
+        """ Returns the index of the label of a (tonality, base type) """
+        return self._chords_types.index(base_type) * N_SEMITONES_IN_OCTAVE + tonality_pitch_class(tonality)
+
+    def properties_scores(self, chords_properties):
+        """ Returns a (n_frames, n_labels) scores matrix where each frame's ChordHarmonicProperties scores 1, None frames scoring 0 everywhere """
+        scores = np.zeros((len(chords_properties), self.count_labels()))
+        for i_frame, chord_properties in enumerate(chords_properties):
+            if chord_properties != None and chord_properties.base_type() in self._chords_types:
+                scores[i_frame, self.label_index(chord_properties.tonality(), chord_properties.base_type())] = 1.
+        return scores
+
+    def transition_matrix(self):
+        """ Returns the full (n_labels, n_labels) log-domain transition matrix """
+        transitions = self._types_transitions[:, np.newaxis, :, np.newaxis] + self._roots_transitions[np.newaxis, :, np.newaxis, :] - self._penalty
+        transitions = transitions.reshape(self.count_labels(), self.count_labels())
+        np.fill_diagonal(transitions, 0.)
+        return transitions
+
+    def decoded(self, scores):
+        """ Returns the index of the label chosen at each frame of a (n_frames, n_labels) scores matrix """
+        scores = np.asarray(scores, dtype = np.float64)
+        n_frames, n_types = len(scores), len(self._chords_types)
+        if n_frames == 0:
+            return np.empty(0, dtype = np.int32)
+        back_pointers = np.empty((n_frames, self.count_labels()), dtype = np.int32)
+        delta = scores[0].reshape(n_types, N_SEMITONES_IN_OCTAVE)
+        for i_frame in range(1, n_frames):
+            # Best previous root for each (previous type, next root), then best previous type for each next label
+            over_roots = delta[:, :, np.newaxis] + self._roots_transitions[np.newaxis, :, :]
+            best_roots = over_roots.argmax(axis = 1)
+            over_types = np.take_along_axis(over_roots, best_roots[:, np.newaxis, :], axis = 1)[:, 0, :][:, np.newaxis, :] + self._types_transitions[:, :, np.newaxis]
+            best_types = over_types.argmax(axis = 0)
+            switched = np.take_along_axis(over_types, best_types[np.newaxis], axis = 0)[0] - self._penalty
+            origins = best_types * N_SEMITONES_IN_OCTAVE + best_roots[best_types, np.arange(N_SEMITONES_IN_OCTAVE)]
+            stays = delta >= switched
+            back_pointers[i_frame] = np.where(stays.ravel(), np.arange(self.count_labels()), origins.ravel())
+            delta = np.maximum(delta, switched) + scores[i_frame].reshape(n_types, N_SEMITONES_IN_OCTAVE)
+        return _backtracked(back_pointers, int(delta.argmax()))
+
+    def segments(self, scores):
+        """ Returns first frame, end frame (excluded) and label index of each smoothed segment """
+        return labels_segments(self.decoded(scores))
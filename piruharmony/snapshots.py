@@ -0,0 +1,268 @@
+import hashlib
+import zipfile
+
+import numpy as np
+
+from shared_tables import attach_tables, table
+from theory import CHORDS_TYPES, INTERVALS_TYPES, TONALITIES, ChordHarmonicProperties, ChordSignature, add_harmonic_properties_lookup, cache_harmonic_properties, \
+                   cached_harmonic_properties
+
+
+"""
+Snapshots are numpy .npz archives of integer codes, saved and loaded
+without pickle. Tonalities, chords types and enrichments are refered to
+by their index in TONALITIES, CHORDS_TYPES and INTERVALS_TYPES, so that
+a snapshot is only valid for the definitions it was saved with: their
+digest is saved along with the codes and checked on load.
+"""
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_ARRAYS_NAMES = ['format', 'digest', 'bass_notes_names', 'intervals_starts', 'intervals_codes',
+                         'properties_starts', 'properties_codes', 'enrichments_starts', 'enrichments_codes']
+
+
+"""
+The same codes form the HARMONIC_PROPERTIES_TABLE table of module
+shared_tables, so that worker processes look up the harmonic properties
+analyzed by their parent in shared memory: signatures are refered to by
+the UTF-8 bytes of their repr, sorted so that they are found by binary
+search.
+"""
+HARMONIC_PROPERTIES_TABLE = 'harmonic_properties'
+
+
+def definitions_digest():
+    """
+    Returns the digest of the definitions harmonic properties are
+    encoded with.
+
+    Returns
+    -------
+    out : str
+        SHA-256 hex digest of TONALITIES, of the name and intervals of
+        each field of ChordsTypes, and of the name, number of semitones
+        and tones range of each field of IntervalsTypes.
+
+    Examples
+    --------
+    >>> len(definitions_digest())
+    64
+    """
+    definitions = (TONALITIES,
+                   [(chord_type.name, [interval_type.name for interval_type in chord_type.value]) for chord_type in CHORDS_TYPES],
+                   [(interval_type.name, interval_type.value.count_semitones(), interval_type.value.tones_range()) for interval_type in INTERVALS_TYPES])
+    return hashlib.sha256(repr(definitions).encode('utf-8')).hexdigest()
+
+
+def _encoded_harmonic_properties(signatures_properties):
+    """ Returns the arrays of codes of (signature, harmonic properties) pairs, named as in SNAPSHOT_ARRAYS_NAMES """
+    tonalities_codes = {tonality: code for (code, tonality) in enumerate(TONALITIES)}
+    chords_types_codes = {chord_type: code for (code, chord_type) in enumerate(CHORDS_TYPES)}
+    intervals_types_codes = {interval_type: code for (code, interval_type) in enumerate(INTERVALS_TYPES)}
+    bass_notes_names, intervals_codes, properties_codes, enrichments_codes = [], [], [], []
+    intervals_starts, properties_starts, enrichments_starts = [0], [0], [0]
+    for (signature, harmonic_properties) in signatures_properties:
+        bass_notes_names.append(signature.bass_note_name())
+        intervals_codes += signature.intervals_codes()
+        intervals_starts.append(len(intervals_codes))
+        for chord_properties in harmonic_properties:
+            properties_codes.append((tonalities_codes[chord_properties.tonality()], chords_types_codes[chord_properties.base_type()]))
+            enrichments_codes += [intervals_types_codes[interval_type] for interval_type in chord_properties.enrichments()]
+            enrichments_starts.append(len(enrichments_codes))
+        properties_starts.append(len(properties_codes))
+    return {'bass_notes_names': np.array(bass_notes_names, dtype = str),
+            'intervals_starts': np.array(intervals_starts, dtype = np.int64),
+            'intervals_codes': np.array(intervals_codes, dtype = np.int8).reshape(-1, 2),
+            'properties_starts': np.array(properties_starts, dtype = np.int64),
+            'properties_codes': np.array(properties_codes, dtype = np.int8).reshape(-1, 2),
+            'enrichments_starts': np.array(enrichments_starts, dtype = np.int64),
+            'enrichments_codes': np.array(enrichments_codes, dtype = np.int8)}
+
+
+def _decoded_harmonic_properties(arrays, i_signature):
+    """ Returns the harmonic properties of the i_signature-th signature of arrays of codes """
+    properties_start, properties_end = arrays['properties_starts'][i_signature], arrays['properties_starts'][i_signature + 1]
+    enrichments_starts, enrichments_codes = arrays['enrichments_starts'], arrays['enrichments_codes']
+    return tuple([ChordHarmonicProperties(TONALITIES[tonality_code], CHORDS_TYPES[base_type_code],
+                                          [INTERVALS_TYPES[code] for code in enrichments_codes[enrichments_starts[i_properties]:enrichments_starts[i_properties + 1]]])
+                  for (i_properties, (tonality_code, base_type_code)) in enumerate(arrays['properties_codes'][properties_start:properties_end], properties_start)])
+
+
+def save_chords_snapshot(path):
+    """
+    Saves the cached harmonic properties of chords into a snapshot.
+
+    Parameters
+    ----------
+    path : str
+        Path of the .npz file the snapshot is written to.
+
+    Returns
+    -------
+    out : int
+        Number of saved chords signatures.
+
+    See Also
+    --------
+    load_chords_snapshot : Loads a snapshot into the cache.
+
+    Examples
+    --------
+    >>> clear_harmonic_properties_cache()
+    >>> harmonic_properties = chord_explorer(['C3', 'E3', 'G3']).possible_harmonic_properties()
+    >>> save_chords_snapshot('chords_snapshot.npz')
+    1
+    """
+    arrays = _encoded_harmonic_properties(cached_harmonic_properties())
+    np.savez_compressed(path, format = np.int64(SNAPSHOT_FORMAT), digest = np.array(definitions_digest()), **arrays)
+    return len(arrays['bass_notes_names'])
+
+
+def load_chords_snapshot(path):
+    """
+    Loads a snapshot of harmonic properties of chords into the cache,
+    so that analyzing these chords does not compute them again.
+
+    Parameters
+    ----------
+    path : str
+        Path of a .npz file written by save_chords_snapshot.
+
+    Returns
+    -------
+    out : int
+        Number of loaded chords signatures.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a snapshot, was written in another format or
+        with other definitions of TONALITIES, ChordsTypes or
+        IntervalsTypes. The cache is left untouched.
+
+    Examples
+    --------
+    >>> load_chords_snapshot('chords_snapshot.npz')
+    1
+    >>> chord_explorer(['C3', 'E3', 'G3']).possible_harmonic_properties()[0].base_type().name # read from the cache
+    'MAJOR_TRIAD'
+    """
+    try:
+        with np.load(path, allow_pickle = False) as snapshot:
+            arrays = {name: snapshot[name] for name in SNAPSHOT_ARRAYS_NAMES}
+    except (KeyError, OSError, zipfile.BadZipFile) as error:
+        raise ValueError('Not a chords snapshot: {} ({})'.format(path, error))
+    if int(arrays['format']) != SNAPSHOT_FORMAT:
+        raise ValueError('Unsupported chords snapshot format: ' + path)
+    if str(arrays['digest']) != definitions_digest():
+        raise ValueError('Chords snapshot saved with other chords or intervals types definitions: ' + path)
+    intervals_starts, intervals_codes = arrays['intervals_starts'].tolist(), [tuple(codes) for codes in arrays['intervals_codes'].tolist()]
+    codes = {name: arrays[name].tolist() for name in ['properties_starts', 'properties_codes', 'enrichments_starts', 'enrichments_codes']}
+    cached_properties = []
+    for (i_signature, bass_note_name) in enumerate(arrays['bass_notes_names'].tolist()):
+        signature = ChordSignature(bass_note_name, tuple(intervals_codes[intervals_starts[i_signature]:intervals_starts[i_signature + 1]]))
+        cached_properties.append((signature, _decoded_harmonic_properties(codes, i_signature)))
+    for (signature, harmonic_properties) in cached_properties:
+        cache_harmonic_properties(signature, harmonic_properties)
+    return len(cached_properties)
+
+
+def share_harmonic_properties():
+    """
+    Places the cached harmonic properties of chords into the
+    HARMONIC_PROPERTIES_TABLE table, so that share_tables places them
+    into shared memory.
+
+    The table is built once per process: harmonic properties cached
+    afterwards are not shared.
+
+    Returns
+    -------
+    out : dict of numpy arrays
+        The arrays of the table.
+
+    See Also
+    --------
+    attach_harmonic_properties : Attaches the harmonic properties shared
+        by another process.
+
+    Examples
+    --------
+    >>> load_chords_snapshot('chords_snapshot.npz')
+    >>> arrays = share_harmonic_properties()
+    >>> shared_tables = share_tables([HARMONIC_PROPERTIES_TABLE])
+    >>> pool = multiprocessing.Pool(initializer = attach_harmonic_properties, initargs = (shared_tables.handle(),))
+    """
+    return table(HARMONIC_PROPERTIES_TABLE, _harmonic_properties_arrays)
+
+
+def _harmonic_properties_arrays():
+    """ Returns the arrays of the HARMONIC_PROPERTIES_TABLE table, built from the cached harmonic properties """
+    signatures_properties = sorted([(_signature_key(signature), signature, harmonic_properties) for (signature, harmonic_properties) in cached_harmonic_properties()],
+                                   key = lambda item: item[0])
+    arrays = _encoded_harmonic_properties([(signature, harmonic_properties) for (_, signature, harmonic_properties) in signatures_properties])
+    return {'digest': np.array(definitions_digest()), 'signatures_keys': np.array([key for (key, _, _) in signatures_properties], dtype = bytes),
+            'properties_starts': arrays['properties_starts'], 'properties_codes': arrays['properties_codes'],
+            'enrichments_starts': arrays['enrichments_starts'], 'enrichments_codes': arrays['enrichments_codes']}
+
+
+def _signature_key(signature):
+    """ Returns the bytes a signature is refered to by in the HARMONIC_PROPERTIES_TABLE table """
+    return repr(tuple(signature)).encode('utf-8')
+
+
+def attach_harmonic_properties(handle):
+    """
+    Attaches tables shared by another process, such as the harmonic
+    properties of chords placed by share_harmonic_properties, so that
+    chords are looked up in shared memory before being analyzed.
+
+    Parameters
+    ----------
+    handle : SharedTablesHandle
+        Handle of the tables, as returned by SharedTables.handle.
+
+    Raises
+    ------
+    ValueError
+        If the harmonic properties were shared with other definitions
+        of TONALITIES, ChordsTypes or IntervalsTypes.
+
+    Examples
+    --------
+    >>> attach_harmonic_properties(handle)
+    >>> chord_explorer(['C3', 'E3', 'G3']).possible_harmonic_properties()[0].base_type().name # read from shared memory
+    'MAJOR_TRIAD'
+    """
+    attach_tables(handle)
+    if str(share_harmonic_properties()['digest']) != definitions_digest():
+        raise ValueError('Harmonic properties shared with other chords or intervals types definitions')
+    add_harmonic_properties_lookup(shared_harmonic_properties)
+
+
+def shared_harmonic_properties(signature):
+    """
+    Returns the harmonic properties of a chord signature held by the
+    HARMONIC_PROPERTIES_TABLE table.
+
+    Parameters
+    ----------
+    signature : ChordSignature
+        The signature of the chord.
+
+    Returns
+    -------
+    out : tuple of ChordHarmonicProperties or None
+        Harmonic properties of the chord and its inversions, None if
+        the table does not hold them.
+
+    Examples
+    --------
+    >>> shared_harmonic_properties(chord_signature(['C3', 'E3', 'G3']))[0].base_type().name
+    'MAJOR_TRIAD'
+    """
+    arrays = share_harmonic_properties()
+    key, signatures_keys = _signature_key(signature), arrays['signatures_keys']
+    i_signature = int(np.searchsorted(signatures_keys, key))
+    if i_signature == len(signatures_keys) or signatures_keys[i_signature] != key:
+        return None
+    return _decoded_harmonic_properties(arrays, i_signature)
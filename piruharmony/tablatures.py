@@ -0,0 +1,289 @@
+import os.path
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from keyboard import notes_references
+from instruments import MUTED, banjo, bass, guitar, mandolin, strings_instrument, ukulele
+
+
+"""
+Named tunings accepted in a tablature's tuning header, with their open
+strings from the lowest string to the highest. 'standard' stands for
+the tuning read on the note names of the tablature's strings lines.
+"""
+NAMED_TUNINGS = {
+    'standard'       : None,
+    'drop d'         : ['D', 'A', 'D', 'G', 'B', 'E'],
+    'drop c'         : ['C', 'G', 'C', 'F', 'A', 'D'],
+    'dadgad'         : ['D', 'A', 'D', 'G', 'A', 'D'],
+    'open d'         : ['D', 'A', 'D', 'F#', 'A', 'D'],
+    'open e'         : ['E', 'B', 'E', 'G#', 'B', 'E'],
+    'open g'         : ['D', 'G', 'D', 'G', 'B', 'D'],
+    'open c'         : ['C', 'G', 'C', 'G', 'C', 'E'],
+    'half step down' : ['Eb', 'Ab', 'Db', 'Gb', 'Bb', 'Eb'],
+    'full step down' : ['D', 'G', 'C', 'F', 'A', 'D']
+}
+REFERENCE_INSTRUMENTS = [guitar, bass, mandolin, banjo, ukulele]
+FALLBACK_LOWEST_STRING = 'E3'
+MAX_FRET_DIGITS = 2
+SYSTEMS_CHUNK_SIZE = 1 << 12
+
+
+"""
+Patterns of tablature files. The tuning header is matched as a regular
+expression, whereas strings lines, starting with the string's note name
+followed by a bar such as 'e|--0--3--|', are found by array operations
+on the bytes of the file.
+"""
+_TUNING_HEADER = re.compile(rb'(?im)^[ \t]*tuning[ \t]*[:=][ \t]*([^\r\n]*)')
+_NOTES_LIST = re.compile(r'^(\s*[A-Ga-g][#b]?[0-9]?\s*[,-]?)+$')
+_NOTE = re.compile(r'([A-Ga-g][#b]?)([0-9]?)')
+_IS_NOTE_NAME_BYTE = np.isin(np.arange(256), list(b'ABCDEFGabcdefg'))
+_IS_ALTERATION_BYTE = np.isin(np.arange(256), list(b'#b'))
+_NEWLINE_BYTE, _CARRIAGE_RETURN_BYTE, _SPACE_BYTE, _BAR_BYTE, _DASH_BYTE = b'\n\r |-'
+_ZERO_BYTE, _NINE_BYTE = b'09'
+
+
+def _note_pitch_class(note_name):
+    """ Returns the index of a note name, without octave, within its octave """
+    return notes_references[note_name + '4'] - notes_references['C4']
+
+
+def _octave_note_name(note_name, i_reference):
+    """ Returns the note name with the octave bringing it closest to a keyboard index """
+    candidates = [note_name + str(octave) for octave in range(8) if note_name + str(octave) in notes_references]
+    return min(candidates, key = lambda candidate: abs(notes_references[candidate] - i_reference))
+
+
+@lru_cache(maxsize = None)
+def _octaves_tuning(strings_notes):
+    """ Returns the note names, with octave, of open strings notes as given to tablature_instrument """
+    notes = [_NOTE.fullmatch(string_note).groups() for string_note in strings_notes]
+    notes = [(note_name[0].upper() + note_name[1:], octave) for (note_name, octave) in notes]
+    references = [reference().tuning() for reference in REFERENCE_INSTRUMENTS if reference().count_strings() == len(notes)]
+    tuning = []
+    if len(references) > 0:
+        pitch_classes = [_note_pitch_class(note_name) for (note_name, _) in notes]
+        shared_notes = lambda reference: sum([_note_pitch_class(name[:-1]) == pitch_class for (name, pitch_class) in zip(reference, pitch_classes)])
+        reference = max(references, key = shared_notes)
+        i_references = [notes_references[name] for name in reference]
+    for (i_string, (note_name, octave)) in enumerate(notes):
+        if octave != '':
+            tuning.append(note_name + octave)
+        elif len(references) > 0:
+            tuning.append(_octave_note_name(note_name, i_references[i_string]))
+        else:
+            i_previous = notes_references[tuning[-1]] if len(tuning) > 0 else notes_references[FALLBACK_LOWEST_STRING] - 6
+            tuning.append(_octave_note_name(note_name, i_previous + 6))
+    return tuple(tuning)
+
+
+def tablature_instrument(strings_notes):
+    """
+    Returns the StringsInstrument of a tablature's tuning.
+
+    Parameters
+    ----------
+    strings_notes : list of str
+        Note name of each open string, from the lowest string to the
+        highest, with or without octave index, such as 'D' or 'D3'.
+
+    Returns
+    -------
+    out : StringsInstrument
+        The instrument tuned as the strings. Missing octaves are those
+        bringing each string closest to the matching string of the
+        regular instrument holding as many strings and sharing most of
+        their notes. Without such instrument, strings go up from the
+        octave of FALLBACK_LOWEST_STRING.
+
+    Examples
+    --------
+    >>> tablature_instrument(['D', 'A', 'D', 'G', 'B', 'E']).tuning()
+    ['D3', 'A3', 'D4', 'G4', 'B4', 'E5']
+    >>> tablature_instrument(['G', 'C', 'E', 'A']).tuning()
+    ['G4', 'C4', 'E4', 'A4']
+    """
+    return strings_instrument(list(_octaves_tuning(tuple(strings_notes))))
+
+
+def parsed_tuning(text):
+    """
+    Returns the open strings notes of a tuning header's value.
+
+    Parameters
+    ----------
+    text : str
+        Value of the header, either a key of NAMED_TUNINGS or a list of
+        notes from the lowest string to the highest, such as 'DADGAD',
+        'D A D G B E' or 'Eb-Ab-Db-Gb-Bb-Eb'.
+
+    Returns
+    -------
+    out : list of str, or None
+        Note name of each string, None for 'standard' or when the
+        tuning is not understood, strings being then read on the
+        strings lines.
+
+    Examples
+    --------
+    >>> parsed_tuning('Drop D')
+    ['D', 'A', 'D', 'G', 'B', 'E']
+    >>> parsed_tuning('Eb Ab Db Gb Bb Eb')
+    ['Eb', 'Ab', 'Db', 'Gb', 'Bb', 'Eb']
+    """
+    name = ' '.join(text.lower().split())
+    if name in NAMED_TUNINGS:
+        return NAMED_TUNINGS[name]
+    if _NOTES_LIST.match(text.strip()) == None:
+        return None
+    return [note_name + octave for (note_name, octave) in _NOTE.findall(text)]
+
+
+def tablature_file(path):
+    """
+    Returns an instance of class TablatureFile reading an ASCII
+    tablature.
+
+    Parameters
+    ----------
+    path : str
+        Path to the tablature text file.
+
+    Returns
+    -------
+    out : TablatureFile
+        The instance of class TablatureFile of the file, its instrument
+        being detected from its tuning header, else from the note names
+        of its first strings lines.
+
+    See Also
+    --------
+    TablatureFile : a class that reads fret vectors from an ASCII
+        tablature file.
+
+    Examples
+    --------
+    >>> tablature = tablature_file('song.txt')
+    >>> tablature.instrument().tuning()
+    ['E3', 'A3', 'D4', 'G4', 'B4', 'E5']
+    >>> list(tablature.frets_vectors())[:2]
+    [[None, 3, 2, 0, 1, 0], [3, 2, 0, 0, 0, 3]]
+    """
+    return TablatureFile(path)
+
+
+class TablatureFile:
+    """
+    A class that reads fret vectors from an ASCII tablature file.
+
+    The file is memory-mapped, and its strings lines such as
+    'e|--0--3--|' are found by array operations on its bytes rather
+    than line by line. Consecutive strings lines form a system. The
+    characters of chunks of SYSTEMS_CHUNK_SIZE systems are stacked into
+    a 3D array, so that their frets are decoded at once: a fret vector
+    is read at each column where a fret number starts on any string,
+    other strings being muted. Systems whose number of strings differs
+    from the instrument's are skipped.
+
+    Parameters
+    ----------
+    path : str
+        Path to the tablature text file.
+
+    Examples
+    --------
+    >>> tablature = TablatureFile('song.txt')
+    >>> tablature.count_systems(), tablature.frets().shape
+    (2, (28, 6))
+    """
+    def __init__(self, path):
+        """ Builds an instance of TablatureFile """
+        self._characters = np.memmap(path, dtype = np.uint8, mode = 'r').view(np.ndarray) if os.path.getsize(path) > 0 else np.zeros(0, dtype = np.uint8)
+        self._notes_starts, self._lines_starts, self._lines_ends, self._systems_starts = _strings_lines(self._characters)
+        # The tuning header stands before the first strings line
+        header = _TUNING_HEADER.search(self._characters[:self._notes_starts[0] if len(self._notes_starts) > 0 else len(self._characters)])
+        strings_notes = parsed_tuning(header.group(1).decode('ascii', 'replace')) if header != None else None
+        if strings_notes == None:
+            first_lines = range(self._systems_starts[0], self._systems_starts[1]) if len(self._systems_starts) > 1 else []
+            strings_notes = [self._note_name(i_line) for i_line in reversed(first_lines)]
+        self._instrument = tablature_instrument(strings_notes) if len(strings_notes) > 0 else None
+
+    def _note_name(self, i_line):
+        """ Returns the note name starting a string line """
+        note_start = self._notes_starts[i_line]
+        note_name = bytes(self._characters[note_start:note_start + 2]).decode('ascii')
+        return note_name if _IS_ALTERATION_BYTE[self._characters[note_start + 1]] else note_name[0]
+
+    def instrument(self):
+        """ Returns the StringsInstrument of the tablature, None if no tuning was found """
+        return self._instrument
+
+    def count_systems(self):
+        """ Returns the number of systems of consecutive strings lines """
+        return max(len(self._systems_starts) - 1, 0)
+
+    def frets_blocks(self):
+        """ Yields the (n_columns, n_strings) frets of chunks of consecutive systems, from the lowest string, muted strings being set to MUTED """
+        if self._instrument == None:
+            return
+        n_strings = self._instrument.count_strings()
+        systems_sizes = np.diff(self._systems_starts)
+        i_first_lines = self._systems_starts[:-1][systems_sizes == n_strings]
+        # Strings lines go from the highest string to the lowest
+        i_lines = i_first_lines[:, np.newaxis] + np.arange(n_strings - 1, -1, -1)
+        for i_chunk in range(0, len(i_lines), SYSTEMS_CHUNK_SIZE):
+            chunk_lines = i_lines[i_chunk:i_chunk + SYSTEMS_CHUNK_SIZE]
+            yield _systems_frets(self._characters, self._lines_starts[chunk_lines], self._lines_ends[chunk_lines])
+
+    def frets(self):
+        """ Returns the frets of all the systems stacked in a single (n_columns, n_strings) array """
+        n_strings = self._instrument.count_strings() if self._instrument != None else 0
+        return np.concatenate([np.zeros((0, n_strings), dtype = np.int8)] + list(self.frets_blocks()))
+
+    def frets_vectors(self):
+        """ Yields fret lists as given to StringsInstrument.to_keyboard, None standing for muted strings """
+        for frets in self.frets_blocks():
+            for i_frets in frets.tolist():
+                yield [i_fret if i_fret != MUTED else None for i_fret in i_frets]
+
+
+def _characters_at(characters, positions, ends):
+    """ Returns the characters at positions, 0 where positions reach ends """
+    return np.where(positions < ends, characters[np.minimum(positions, len(characters) - 1)], 0) if len(characters) > 0 else np.zeros(len(positions), dtype = np.uint8)
+
+
+def _strings_lines(characters):
+    """ Returns the starts, frets characters starts and ends of the strings lines of a file, and the first strings line of each system followed by the number of strings lines """
+    newlines = np.flatnonzero(characters == _NEWLINE_BYTE)
+    lines_starts = np.concatenate([[0], newlines + 1])
+    lines_ends = np.concatenate([newlines, [len(characters)]])
+    lines_ends -= _characters_at(characters, lines_ends - 1, lines_ends) == _CARRIAGE_RETURN_BYTE
+    # The note name holds an optional alteration and may be followed by a space before the bar
+    is_string_line = _IS_NOTE_NAME_BYTE[_characters_at(characters, lines_starts, lines_ends)]
+    bars = lines_starts + 1
+    bars += _IS_ALTERATION_BYTE[_characters_at(characters, bars, lines_ends)]
+    bars += _characters_at(characters, bars, lines_ends) == _SPACE_BYTE
+    is_string_line &= _characters_at(characters, bars, lines_ends) == _BAR_BYTE
+    i_lines = np.flatnonzero(is_string_line)
+    is_system_start = np.concatenate([[True], np.diff(i_lines) != 1]) if len(i_lines) > 0 else np.zeros(0, dtype = bool)
+    systems_starts = np.concatenate([np.flatnonzero(is_system_start), [len(i_lines)]])
+    return lines_starts[i_lines], bars[i_lines] + 1, lines_ends[i_lines], systems_starts
+
+
+def _systems_frets(characters, lines_starts, lines_ends):
+    """ Returns the (n_columns, n_strings) frets read on (n_systems, n_strings) strings lines """
+    # Lines are padded with dashes so that the last characters of a line are read as any other
+    width = int((lines_ends - lines_starts).max()) + MAX_FRET_DIGITS
+    positions = lines_starts[:, :, np.newaxis] + np.arange(width)
+    lines = np.where(positions < lines_ends[:, :, np.newaxis], characters[np.minimum(positions, len(characters) - 1)], _DASH_BYTE)
+    is_digit = (lines >= _ZERO_BYTE) & (lines <= _NINE_BYTE)
+    digits = lines.astype(np.int8) - _ZERO_BYTE
+    is_start = is_digit[:, :, :-1].copy()
+    is_start[:, :, 1:] &= ~is_digit[:, :, :-2]
+    # Fret numbers hold at most two digits, the first one standing at the column the fret is read at
+    values = np.where(is_digit[:, :, 1:], digits[:, :, :-1] * 10 + digits[:, :, 1:], digits[:, :, :-1])
+    i_systems, i_columns = np.nonzero(is_start.any(axis = 1))
+    return np.where(is_start[i_systems, :, i_columns], values[i_systems, :, i_columns], MUTED).astype(np.int8)
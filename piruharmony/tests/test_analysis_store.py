@@ -0,0 +1,45 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import analysis_store as analysis_store_module
+from analysis_store import *
+from instruments import MUTED, guitar, strings_instrument
+from tablatures import tablature_file
+
+
+C_MAJOR = [None, 3, 2, 0, 1, 0]
+G_MAJOR = [3, 2, 0, 0, 0, 3]
+TAB = 'e|--0---3--|\nB|--1---0--|\nG|--0---0--|\nD|--2---0--|\nA|--3---2--|\nE|------3--|\n'
+REPOSTED_TAB = 'Intro\n\ne|-0-3-|\nB|-1-0-|\nG|-0-0-|\nD|-2-0-|\nA|-3-2-|\nE|---3-|\n\n'
+
+
+def test_digest_ignores_spacing_and_keeps_repeats():
+    assert frets_digest(guitar(), [C_MAJOR, [None] * 6, C_MAJOR, [None] * 6, G_MAJOR]) == frets_digest(guitar(), np.array([[MUTED, 3, 2, 0, 1, 0]] * 2 + [[3, 2, 0, 0, 0, 3]]))
+    assert frets_digest(guitar(), [C_MAJOR] * 4) != frets_digest(guitar(), [C_MAJOR])
+    assert frets_digest(guitar(), [C_MAJOR, G_MAJOR]) != frets_digest(guitar(), [G_MAJOR, C_MAJOR])
+    assert frets_digest(guitar(), [C_MAJOR]) != frets_digest(strings_instrument(['D3', 'A3', 'D4', 'G4', 'B4', 'E5']), [C_MAJOR])
+
+def test_digest_of_empty_song():
+    assert frets_digest(guitar(), []) == frets_digest(guitar(), [[None] * 6]) == frets_digest(guitar(), np.zeros((0, 6), dtype = np.int8))
+    assert frets_digest(guitar(), []) != frets_digest(guitar(), [C_MAJOR])
+
+def test_digest_of_reposted_tabs(tmp_path):
+    digests = []
+    for (name, text) in [('tab.txt', TAB), ('reposted_tab.txt', REPOSTED_TAB)]:
+        (tmp_path / name).write_text(text)
+        tab = tablature_file(str(tmp_path / name))
+        digests.append(frets_digest(tab.instrument(), tab.frets()))
+    assert digests[0] == digests[1]
+
+def test_store_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis_store_module, 'LOOKUP_BATCH_SIZE', 3)
+    digests = [frets_digest(guitar(), [[i_fret] * 6]) for i_fret in range(10)]
+    with analysis_store(str(tmp_path / 'analyses.sqlite')) as store:
+        store.store(digests[::2], [[i_fret, 'analysis'] for i_fret in range(0, 10, 2)])
+        store.store(digests[:1], ['ignored'])
+        assert store.count_analyses() == 5
+        assert store.missing(digests + digests[1:2]) == digests[1::2]
+    with analysis_store(str(tmp_path / 'analyses.sqlite')) as store:
+        assert store.analyses(digests[:4]) == [[0, 'analysis'], None, [2, 'analysis'], None]
@@ -0,0 +1,44 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from approximate_matching import *
+from theory import ChordsTypes
+
+
+MATCHER = approximate_chord_matcher()
+
+def test_approximate_chord_matcher_exact_chord():
+    assert MATCHER.matches([27, 31, 34], tolerance = 0.) == [(0., ('C', ChordsTypes.MAJOR_TRIAD))]
+
+def test_approximate_chord_matcher_extra_note():
+    chord_properties = MATCHER.best_chord_properties([27, 29, 31, 34]) # C, D, E, G
+    assert (chord_properties.tonality(), chord_properties.base_type()) == ('C', ChordsTypes.MAJOR_TRIAD)
+
+def test_approximate_chord_matcher_missing_fifth_is_cheap():
+    matches = dict([(label, cost) for (cost, label) in MATCHER.matches([22, 26, 32, 39], tolerance = 2.)]) # G, B, F, C
+    assert matches[('G', ChordsTypes.SEVENTH)] == DEFAULT_MISSING_FIFTH_WEIGHT + DEFAULT_EXTRA_NOTE_WEIGHT
+
+def test_approximate_chord_matcher_costs_match_weighted_hamming():
+    matcher = approximate_chord_matcher([ChordsTypes.MINOR_SEVENTH], missing_root_weight = 3., missing_fifth_weight = .5, missing_note_weight = 1., extra_note_weight = .25)
+    mask = 0b10010101 # C, D, E, G
+    assert matcher.costs([mask])[0, 4] == .5 + .25 # E minor seventh: B, the fifth, is missing and C is extra
+    assert matcher.costs([mask])[0, 2] == 1. + .5 + .25 + .25 # D minor seventh: F and A, the fifth, are missing, E and G are extra
+
+def test_approximate_chord_matcher_zero_missing_weight():
+    matcher = approximate_chord_matcher([ChordsTypes.MAJOR_TRIAD], missing_fifth_weight = 0.)
+    assert matcher.costs([0b10010001])[0, 0] == 0. # C, E, G: G is a chord note, not an extra one
+    assert matcher.costs([0b00010001])[0, 0] == 0.
+    assert matcher.costs([0b10010101])[0, 0] == DEFAULT_EXTRA_NOTE_WEIGHT
+
+def test_approximate_chord_matcher_tolerance():
+    assert MATCHER.best_chord_properties([27, 28, 29, 30], tolerance = .5) == None
+
+def test_approximate_chord_matcher_spelled_in_key():
+    assert MATCHER.best_chord_properties([28, 32, 35], key = 'Db').tonality() == 'Db'
+
+def test_approximate_chord_matcher_best_labels_indices():
+    i_labels, costs = MATCHER.best_labels_indices([[27, 31, 34], [22, 26, 29, 32]])
+    assert [MATCHER.labels()[i_label] for i_label in i_labels] == [('C', ChordsTypes.MAJOR_TRIAD), ('G', ChordsTypes.SEVENTH)]
+    assert costs.tolist() == [0., 0.]
@@ -0,0 +1,46 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from chord_symbols import *
+from theory import TONALITIES
+
+
+def test_chord_symbol_half_diminished_eleventh():
+    assert chord_symbol(ChordHarmonicProperties('F#', ChordsTypes.HALF_DIMINISHED_SEVENTH, [IntervalsTypes.FOURTH])) == 'F#m7b5(11)'
+
+def test_chord_symbol_sorted_enrichments():
+    chord_properties = ChordHarmonicProperties('Bb', ChordsTypes.SEVENTH, [IntervalsTypes.AUGMENTED_FOURTH, IntervalsTypes.NINTH])
+    assert chord_symbol(chord_properties) == 'Bb7(9,#11)'
+
+def test_chords_symbols_no_chord():
+    assert chords_symbols([ChordHarmonicProperties('E', ChordsTypes.MINOR_TRIAD, []), None]) == ['Em', None]
+
+def test_parsed_chord_symbol():
+    chord_properties = parsed_chord_symbol('Ebmaj7(9,#11)')
+    assert chord_properties == ChordHarmonicProperties('Eb', ChordsTypes.MAJOR_SEVENTH, [IntervalsTypes.NINTH, IntervalsTypes.AUGMENTED_FOURTH])
+
+def test_parsed_chord_symbol_flat_tonality():
+    assert parsed_chord_symbol('Cb') == ChordHarmonicProperties('Cb', ChordsTypes.MAJOR_TRIAD, [])
+
+def test_parsed_chord_symbol_aliases():
+    assert [chord_properties.base_type() for chord_properties in parsed_chords_symbols(['C-7', 'Cø', 'CΔ', 'C°7', 'C+'])] == \
+           [ChordsTypes.MINOR_SEVENTH, ChordsTypes.HALF_DIMINISHED_SEVENTH, ChordsTypes.MAJOR_SEVENTH, ChordsTypes.DIMINISHED_SEVENTH, ChordsTypes.AUGMENTED_TRIAD]
+
+def test_parsed_chord_symbol_spaces_between_enrichments():
+    assert parsed_chord_symbol('G7(b9, #9)').enrichments() == [IntervalsTypes.DIMINISHED_NINTH, IntervalsTypes.AUGMENTED_NINTH]
+
+@pytest.mark.parametrize('symbol', ['', 'H7', 'Cxyz', 'C7(9', 'C7(q)'])
+def test_parsed_chord_symbol_invalid(symbol):
+    with pytest.raises(ValueError):
+        parsed_chord_symbol(symbol)
+
+def test_chord_symbol_round_trip():
+    enrichments_lists = [[], [IntervalsTypes.NINTH], [IntervalsTypes.DIMINISHED_NINTH, IntervalsTypes.SIXTH, IntervalsTypes.UNKNOWN]]
+    for tonality in TONALITIES:
+        for chord_type in ChordsTypes:
+            for enrichments in enrichments_lists:
+                chord_properties = ChordHarmonicProperties(tonality, chord_type, enrichments)
+                parsed_properties = parsed_chord_symbol(chord_symbol(chord_properties))
+                assert compact_harmonic_properties(parsed_properties) == compact_harmonic_properties(chord_properties)
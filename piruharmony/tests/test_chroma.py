@@ -0,0 +1,38 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from chroma import *
+
+
+def _chroma(pitch_classes):
+    chroma = np.zeros((1, 12))
+    chroma[0, pitch_classes] = 1.
+    return chroma
+
+def test_chroma_templates_shape():
+    assert chroma_templates().shape == (12 * len(CHROMA_CHORDS_TYPES), 12)
+
+def test_chroma_templates_unit_norm():
+    assert np.allclose(np.linalg.norm(chroma_templates(), axis = 1), 1.)
+
+def test_chroma_chord_matcher_d_major():
+    assert chroma_chord_matcher().best_labels(_chroma([2, 6, 9])) == [('D', ChordsTypes.MAJOR_TRIAD)]
+
+def test_chroma_chord_matcher_c_minor_seventh():
+    assert chroma_chord_matcher().best_labels(_chroma([0, 3, 7, 10])) == [('C', ChordsTypes.MINOR_SEVENTH)]
+
+def test_chroma_chord_matcher_exact_match_score():
+    i_labels, scores = chroma_chord_matcher().best_labels_indices(_chroma([0, 4, 7]))
+    assert np.isclose(scores[0], 1.)
+
+def test_chroma_chord_matcher_blocks_match_scores():
+    matcher = chroma_chord_matcher()
+    chroma = np.random.RandomState(0).rand(100, 12)
+    i_labels, scores = matcher.best_labels_indices(chroma, block_size = 7)
+    assert (i_labels == matcher.scores(chroma).argmax(axis = 1)).all()
+
+def test_chroma_chord_matcher_silent_frame():
+    i_labels, scores = chroma_chord_matcher().best_labels_indices(np.zeros((1, 12)))
+    assert scores[0] == 0.
@@ -0,0 +1,51 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import subprocess
+
+import pytest
+from theory import *
+
+
+PACKAGE_DIRECTORY = os.path.join(os.path.dirname(__file__), '..')
+IMPORT_TIME_BUDGET = .1 # seconds
+N_IMPORT_RUNS = 3
+
+
+def _import_report(module_name):
+    code = 'import sys, time; start = time.perf_counter(); import {}; print(time.perf_counter() - start, "numpy" in sys.modules)'.format(module_name)
+    reports = [subprocess.run([sys.executable, '-c', code], cwd = PACKAGE_DIRECTORY, capture_output = True, text = True, check = True).stdout.split() for _ in range(N_IMPORT_RUNS)]
+    return min([float(duration) for (duration, _) in reports]), reports[0][1] == 'True'
+
+@pytest.mark.parametrize('module_name', ['theory', 'instruments'])
+def test_import_time_within_budget(module_name):
+    duration, imports_numpy = _import_report(module_name)
+    assert duration < IMPORT_TIME_BUDGET
+    assert not imports_numpy
+
+def test_keys_spellings_built_on_first_use():
+    keys_spellings = LazyTable(SPELLED_KEYS, lambda key: KEYS_SPELLINGS[key])
+    assert len(dict.keys(keys_spellings)) == 0
+    assert keys_spellings['Am'][8] == 'G#'
+    assert list(dict.keys(keys_spellings)) == ['Am']
+    assert len(keys_spellings) == len(SPELLED_KEYS) and 'Am' in keys_spellings and 'H' not in keys_spellings
+    assert keys_spellings.get('H') == None
+    with pytest.raises(KeyError):
+        keys_spellings['H']
+    assert dict(keys_spellings.items()) == dict(KEYS_SPELLINGS.items())
+
+def test_prebuilt_tables_round_trip(tmp_path, monkeypatch):
+    path = str(tmp_path / 'theory_tables.json')
+    save_prebuilt_tables(path)
+    keys_spellings = LazyTable(SPELLED_KEYS, lambda key: KEYS_SPELLINGS[key])
+    monkeypatch.setitem(LAZY_TABLES, 'keys_spellings', keys_spellings)
+    load_prebuilt_tables(path)
+    assert len(dict.keys(keys_spellings)) == len(SPELLED_KEYS)
+    assert dict(keys_spellings.items()) == dict(KEYS_SPELLINGS.items())
+
+def test_prebuilt_tables_reject_other_format(tmp_path):
+    path = tmp_path / 'theory_tables.json'
+    path.write_text('{"format": 0, "tables": {}}')
+    with pytest.raises(ValueError):
+        load_prebuilt_tables(str(path))
@@ -3,7 +3,7 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from instruments import *
-from theory import ChordsTypes
+from theory import ChordsTypes, ChordHarmonicProperties, pitch_class
 
 
 def test_guitar_e_maj():
@@ -42,3 +42,18 @@ def test_open_d_guitar():
     open_d_guitar = strings_instrument(['D3', 'A3', 'D4', 'G4', 'A4', 'D5'])
     assert open_d_guitar.to_keyboard(tested_tablature) == target_key_indices
 
+
+def test_guitar_to_chord_properties_in_key():
+    tested_tablature = [0, 2, 2, 1, 0, 0]
+    expected = ChordHarmonicProperties('E', ChordsTypes.MAJOR_TRIAD, [])
+    assert guitar().to_chord_properties(tested_tablature, key = 'E') == expected
+
+def test_to_keyboard_keeps_key_index_zero():
+    assert strings_instrument(['A0', 'E1']).to_keyboard([0, None]) == [0]
+
+def test_frets_to_keyboard_matches_to_keyboard():
+    frets_vectors = [[None, 3, 2, 0, 1, 0], [0, 2, 2, 1, None, None], [None] * 6]
+    i_notes_on_keyboard, masks = guitar().frets_to_keyboard([[MUTED if i_fret == None else i_fret for i_fret in i_frets] for i_frets in frets_vectors])
+    for (i_frets, i_notes, mask) in zip(frets_vectors, i_notes_on_keyboard.tolist(), masks.tolist()):
+        assert [i_note for i_note in i_notes if i_note != MUTED] == guitar().to_keyboard(i_frets)
+        assert mask == sum(set([1 << pitch_class(i_note) for i_note in guitar().to_keyboard(i_frets)]))
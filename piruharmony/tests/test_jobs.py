@@ -0,0 +1,76 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import functools
+import multiprocessing
+
+import pytest
+from jobs import *
+from instruments import bass, guitar
+
+
+SHARDS = [[[None, 3, 2, 0, 1, 0], [3, 2, 0, 0, 0, 3]], [[0, 2, 2, 1, 0, 0]], [[None, 0, 2, 2, 2, 0], [None, None, None, None, None, None]]]
+
+
+class _Crash(Exception):
+    pass
+
+def _crashing_map(function, tasks, n_tasks_before_crash):
+    for (i_task, task) in enumerate(tasks):
+        if i_task == n_tasks_before_crash:
+            raise _Crash()
+        yield function(task)
+
+def _counting_map(function, tasks, calls):
+    for task in tasks:
+        calls.append(len(task[2]))
+        yield function(task)
+
+def test_chords_properties_shard():
+    assert chords_properties_shard(guitar(), SHARDS[0] + SHARDS[2][1:]) == [['C', 'MAJOR_TRIAD', []], ['G', 'MAJOR_TRIAD', []], None]
+
+def test_job_resumes_after_crash(tmp_path):
+    function, calls = functools.partial(chords_properties_shard, guitar()), []
+    job = checkpointed_job(function, SHARDS, str(tmp_path))
+    with pytest.raises(_Crash):
+        job.run(functools.partial(_crashing_map, n_tasks_before_crash = 2))
+    job = checkpointed_job(function, SHARDS, str(tmp_path))
+    assert job.pending_shards() == [2]
+    progress = job.run(functools.partial(_counting_map, calls = calls), report = calls.append)
+    assert calls[0] == 2 and calls[1].count_completed_shards() == 3
+    assert progress.count_voicings() == 2 and progress.eta() == 0.
+    assert list(job.results()) == [function(shard) for shard in SHARDS]
+    assert sorted(os.listdir(str(tmp_path))) == ['checkpoint.json', 'shard_000000.json', 'shard_000001.json', 'shard_000002.json']
+
+def test_job_runs_on_process_pool(tmp_path):
+    job = checkpointed_job(functools.partial(chords_properties_shard, guitar()), SHARDS, str(tmp_path))
+    with multiprocessing.get_context('spawn').Pool(2) as pool:
+        progress = job.run(pool.imap_unordered)
+    assert progress.count_completed_shards() == 3 and progress.count_voicings() == 5
+    assert list(job.results())[1] == [['E', 'MAJOR_TRIAD', []]]
+
+def test_job_rejects_other_checkpoint(tmp_path):
+    checkpointed_job(len, SHARDS, str(tmp_path)).run()
+    with pytest.raises(ValueError):
+        checkpointed_job(len, SHARDS[:2], str(tmp_path))
+    with pytest.raises(ValueError):
+        checkpointed_job(len, SHARDS[::-1], str(tmp_path))
+    with pytest.raises(ValueError):
+        checkpointed_job(sum, SHARDS, str(tmp_path))
+    assert checkpointed_job(len, SHARDS, str(tmp_path)).pending_shards() == []
+    with pytest.raises(ValueError):
+        list(checkpointed_job(len, SHARDS, str(tmp_path / 'other')).results())
+
+def test_job_digest_of_partial_functions():
+    assert job_digest(functools.partial(chords_properties_shard, guitar()), SHARDS) == job_digest(functools.partial(chords_properties_shard, guitar()), SHARDS)
+    assert job_digest(functools.partial(chords_properties_shard, guitar()), SHARDS) != job_digest(chords_properties_shard, SHARDS)
+    assert job_digest(chords_properties_shard, SHARDS) != job_digest(job_digest, SHARDS)
+    with pytest.raises(ValueError):
+        job_digest(functools.partial(chords_properties_shard, object()), SHARDS)
+    assert job_digest(functools.partial(chords_properties_shard, object()), SHARDS, job_key = 'object') != job_digest(chords_properties_shard, SHARDS, job_key = 'other')
+
+def test_job_rejects_checkpoint_of_other_instrument(tmp_path):
+    checkpointed_job(functools.partial(chords_properties_shard, guitar()), SHARDS, str(tmp_path)).run()
+    with pytest.raises(ValueError):
+        checkpointed_job(functools.partial(chords_properties_shard, bass()), SHARDS, str(tmp_path))
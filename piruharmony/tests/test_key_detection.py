@@ -0,0 +1,48 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from key_detection import *
+from theory import ChordHarmonicProperties, ChordsTypes
+
+
+def _chords_properties(progression):
+    return [ChordHarmonicProperties(tonality, base_type, []) for (tonality, base_type) in progression]
+
+def test_key_profiles_shape_and_norm():
+    profiles = key_profiles()
+    assert profiles.shape == (24, 12)
+    assert np.allclose(np.linalg.norm(profiles, axis = 1), 1.)
+
+def test_key_profiles_transposition():
+    profiles = key_profiles()
+    assert np.allclose(profiles[KEYS.index('Bbm')], np.roll(profiles[KEYS.index('Cm')], 10))
+
+def test_key_tracker_no_chord():
+    tracker = key_tracker()
+    assert tracker.push(None) == None
+
+def test_key_tracker_cadence():
+    tracker = key_tracker()
+    for chord_properties in _chords_properties([('C', ChordsTypes.MAJOR_TRIAD), ('A', ChordsTypes.MINOR_TRIAD), ('D', ChordsTypes.MINOR_SEVENTH), ('G', ChordsTypes.SEVENTH), ('C', ChordsTypes.MAJOR_SEVENTH)]):
+        tracker.push(chord_properties)
+    assert tracker.key() == 'C'
+
+def test_key_tracker_minor_cadence():
+    tracker = key_tracker()
+    for chord_properties in _chords_properties([('A', ChordsTypes.MINOR_TRIAD), ('D', ChordsTypes.MINOR_TRIAD), ('E', ChordsTypes.SEVENTH), ('A', ChordsTypes.MINOR_TRIAD)]):
+        tracker.push(chord_properties)
+    assert tracker.key() == 'Am'
+
+def test_key_tracker_window_histograms():
+    tracker = key_tracker(window_size = 2)
+    for chord_properties in _chords_properties([('C', ChordsTypes.MAJOR_TRIAD), ('F', ChordsTypes.MAJOR_TRIAD), ('G', ChordsTypes.MAJOR_TRIAD)]):
+        tracker.push(chord_properties)
+    assert tracker.roots_histogram().tolist() == [0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0]
+    assert tracker.pitch_classes_histogram().tolist() == [1, 0, 1, 0, 0, 1, 0, 1, 0, 1, 0, 1]
+
+def test_key_tracker_key_changes_modulation():
+    progression = [('C', ChordsTypes.MAJOR_TRIAD), ('F', ChordsTypes.MAJOR_TRIAD), ('G', ChordsTypes.SEVENTH), ('C', ChordsTypes.MAJOR_TRIAD),
+                   ('D', ChordsTypes.MAJOR_TRIAD), ('A', ChordsTypes.SEVENTH), ('D', ChordsTypes.MAJOR_TRIAD), ('G', ChordsTypes.MAJOR_TRIAD), ('A', ChordsTypes.SEVENTH), ('D', ChordsTypes.MAJOR_TRIAD)]
+    assert list(key_tracker(window_size = 4).key_changes(_chords_properties(progression))) == [(0, 'C'), (6, 'D')]
@@ -0,0 +1,105 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from fractions import Fraction
+from musicxml import *
+from theory import ChordsTypes
+
+
+SCORE = '''<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<score-partwise version="4.0">
+  <part-list>
+    <score-part id="P1"><part-name>Soprano</part-name></score-part>
+    <score-part id="P2"><part-name>Bass</part-name></score-part>
+  </part-list>
+  <part id="P1">
+    <measure number="1">
+      <attributes><divisions>2</divisions></attributes>
+      <note><pitch><step>E</step><octave>4</octave></pitch><duration>4</duration></note>
+      <note><chord/><pitch><step>G</step><octave>4</octave></pitch><duration>4</duration></note>
+      <note><pitch><step>F</step><octave>4</octave></pitch><duration>2</duration></note>
+      <note><chord/><pitch><step>A</step><octave>4</octave></pitch><duration>2</duration></note>
+      <note><rest/><duration>2</duration></note>
+    </measure>
+    <measure number="2">
+      <note><grace/><pitch><step>C</step><octave>5</octave></pitch></note>
+      <note><pitch><step>B</step><alter>-1</alter><octave>4</octave></pitch><duration>8</duration></note>
+    </measure>
+  </part>
+  <part id="P2">
+    <measure number="1">
+      <attributes><divisions>1</divisions></attributes>
+      <note><pitch><step>C</step><octave>3</octave></pitch><duration>4</duration></note>
+    </measure>
+    <measure number="2">
+      <note><pitch><step>C</step><octave>3</octave></pitch><duration>2</duration></note>
+      <backup><duration>2</duration></backup>
+      <forward><duration>2</duration></forward>
+      <note><pitch><step>E</step><octave>3</octave></pitch><duration>2</duration></note>
+      <note><chord/><pitch><step>G</step><octave>3</octave></pitch><duration>2</duration></note>
+    </measure>
+  </part>
+</score-partwise>
+'''
+
+def _written_score(tmp_path, text):
+    path = str(tmp_path / 'score.musicxml')
+    with open(path, 'w', encoding = 'utf-8') as score:
+        score.write(text)
+    return path
+
+def test_pitch_note_name_keeps_spelling():
+    assert pitch_note_name('E', -1, 4) == 'Eb4'
+    assert pitch_note_name('D', 1, 4) == 'D#4'
+    assert notes_references[pitch_note_name('C', -1, 4)] == notes_references['B3']
+    assert notes_references[pitch_note_name('B', 1, 3)] == notes_references['C4']
+    assert pitch_note_name('F', 2, 4) == 'G4'
+
+def test_musicxml_reader_slices(tmp_path):
+    reader = musicxml_reader(_written_score(tmp_path, SCORE))
+    assert reader.parts_ids() == ['P1', 'P2']
+    assert list(reader.slices()) == [('1', Fraction(0), ['C3', 'E4', 'G4']), ('1', Fraction(2), ['C3', 'F4', 'A4']),
+                                     ('2', Fraction(0), ['C3', 'Bb4']), ('2', Fraction(2), ['E3', 'G3', 'Bb4'])]
+
+def test_musicxml_reader_chords_properties(tmp_path):
+    chords_properties = [chord_properties for (_, _, chord_properties) in musicxml_reader(_written_score(tmp_path, SCORE)).chords_properties()]
+    assert [(chord_properties.tonality(), chord_properties.base_type()) for chord_properties in chords_properties[:2]] == \
+           [('C', ChordsTypes.MAJOR_TRIAD), ('F', ChordsTypes.MAJOR_TRIAD)]
+
+def test_musicxml_reader_merges_parts_measure_by_measure(tmp_path):
+    measure = '<measure number="{}"><attributes><divisions>1</divisions></attributes>' + \
+              '<note><pitch><step>C</step><octave>4</octave></pitch><duration>4</duration></note></measure>'
+    measures = ''.join([measure.format(i_measure + 1) for i_measure in range(3000)])
+    text = '<score-partwise><part-list><score-part id="P1"/><score-part id="P2"/></part-list>' + \
+           '<part id="P1">' + measures + '</part><part id="P2">' + measures.replace('C', 'E') + '</part></score-partwise>'
+    slices = list(musicxml_reader(_written_score(tmp_path, text)).slices())
+    assert len(slices) == 3000
+    assert slices[-1] == ('3000', Fraction(0), ['C4', 'E4'])
+
+def test_musicxml_reader_timewise_score(tmp_path):
+    with pytest.raises(ValueError):
+        musicxml_reader(_written_score(tmp_path, '<score-timewise><part-list/><measure number="1"/></score-timewise>'))
+
+def test_pitch_note_name_out_of_keyboard():
+    with pytest.raises(ValueError):
+        pitch_note_name('C', 0, 0)
+    with pytest.raises(ValueError):
+        pitch_note_name('C', 0, 9)
+
+def test_musicxml_reader_skips_notes_out_of_keyboard(tmp_path):
+    text = SCORE.replace('<step>C</step><octave>5</octave>', '<step>C</step><octave>9</octave>').replace(
+        '<note><rest/><duration>2</duration></note>', '<note><pitch><step>C</step><octave>0</octave></pitch><duration>2</duration></note>')
+    assert list(musicxml_reader(_written_score(tmp_path, text)).slices()) == list(musicxml_reader(_written_score(tmp_path, SCORE)).slices())
+
+def test_musicxml_reader_ignores_parts_in_comments_and_cdata(tmp_path):
+    text = SCORE.replace('<part id="P2">', '<!-- <part id="P3"> --><part id="P2"><![CDATA[</part><part id="P4">]]>').replace(
+        '</part-list>', '</part-list><!-- </part> -->')
+    assert list(musicxml_reader(_written_score(tmp_path, text)).slices()) == list(musicxml_reader(_written_score(tmp_path, SCORE)).slices())
+
+def test_musicxml_reader_empty_part(tmp_path):
+    text = SCORE.replace('</part-list>', '<score-part id="P0"/></part-list>').replace('</score-partwise>', '<part id="P0"/></score-partwise>')
+    reader = musicxml_reader(_written_score(tmp_path, text))
+    assert reader.parts_ids() == ['P1', 'P2', 'P0']
+    assert list(reader.slices()) == list(musicxml_reader(_written_score(tmp_path, SCORE)).slices())
@@ -0,0 +1,67 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pytest
+from progression_index import *
+from theory import ChordHarmonicProperties, ChordsTypes, PITCH_CLASSES_TONALITIES
+
+
+def _chords_properties(progression):
+    return [ChordHarmonicProperties(tonality, base_type, []) for (tonality, base_type) in progression]
+
+def _random_songs(n_songs, random_state):
+    chords_types = [ChordsTypes.MAJOR_TRIAD, ChordsTypes.MINOR_TRIAD, ChordsTypes.SEVENTH]
+    return [_chords_properties([(PITCH_CLASSES_TONALITIES[random_state.randint(12)], chords_types[random_state.randint(3)]) for _ in range(random_state.randint(12))])
+            for _ in range(n_songs)]
+
+def _scanned_occurrences(songs, pattern):
+    pattern_tokens = progression_tokens(pattern)
+    occurrences = []
+    for (i_song, song) in enumerate(songs):
+        song_tokens = progression_tokens(song)
+        for offset in range(len(song_tokens) - len(pattern_tokens) + 1):
+            same_first_type = song_tokens[offset] % len(CHORDS_TYPES) == pattern_tokens[0] % len(CHORDS_TYPES)
+            if same_first_type and list(song_tokens[offset + 1:offset + len(pattern_tokens)]) == list(pattern_tokens[1:]):
+                occurrences.append((i_song, offset))
+    return occurrences
+
+TWO_FIVE_ONE = _chords_properties([('D', ChordsTypes.MINOR_SEVENTH), ('G', ChordsTypes.SEVENTH), ('C', ChordsTypes.MAJOR_SEVENTH)])
+
+def test_progression_tokens_transposition_invariant():
+    transposed = _chords_properties([('Eb', ChordsTypes.MINOR_SEVENTH), ('Ab', ChordsTypes.SEVENTH), ('Db', ChordsTypes.MAJOR_SEVENTH)])
+    assert progression_tokens(TWO_FIVE_ONE).tolist() == progression_tokens(transposed).tolist()
+
+def test_progression_tokens_skip_no_chord():
+    assert progression_tokens([None, TWO_FIVE_ONE[0], None, TWO_FIVE_ONE[1]]).tolist() == progression_tokens(TWO_FIVE_ONE[:2]).tolist()
+
+def test_progression_index_two_five_one_any_key():
+    songs = [_chords_properties([('Bb', ChordsTypes.MAJOR_TRIAD), ('C', ChordsTypes.MINOR_SEVENTH), ('F', ChordsTypes.SEVENTH), ('Bb', ChordsTypes.MAJOR_SEVENTH)]),
+             _chords_properties([('C', ChordsTypes.MAJOR_TRIAD), ('G', ChordsTypes.SEVENTH)]),
+             TWO_FIVE_ONE + TWO_FIVE_ONE]
+    i_songs, offsets = progression_index(songs).search(TWO_FIVE_ONE)
+    assert list(zip(i_songs.tolist(), offsets.tolist())) == [(0, 1), (2, 0), (2, 3)]
+
+def test_progression_index_matches_scan():
+    random_state = np.random.RandomState(0)
+    songs = _random_songs(200, random_state)
+    for ngram_size in [1, 3]:
+        index = progression_index(songs, ngram_size)
+        for n_chords in range(1, 6):
+            pattern = songs[3][:n_chords]
+            i_songs, offsets = index.search(pattern)
+            assert list(zip(i_songs.tolist(), offsets.tolist())) == _scanned_occurrences(songs, pattern)
+
+def test_progression_index_invalid_ngram_size():
+    with pytest.raises(ValueError):
+        progression_index([TWO_FIVE_ONE], ngram_size = 0)
+
+def test_progression_index_save_and_load(tmp_path):
+    songs = _random_songs(50, np.random.RandomState(1)) + [TWO_FIVE_ONE]
+    index = progression_index(songs)
+    index.save(str(tmp_path / 'index'))
+    loaded_index = load_progression_index(str(tmp_path / 'index'))
+    assert loaded_index.count_songs() == 51
+    assert loaded_index.ngram_size() == DEFAULT_NGRAM_SIZE
+    assert [array.tolist() for array in loaded_index.search(TWO_FIVE_ONE)] == [array.tolist() for array in index.search(TWO_FIVE_ONE)]
@@ -0,0 +1,64 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from roman_numerals import *
+from theory import ChordHarmonicProperties
+
+
+def _chords_properties(progression):
+    return [ChordHarmonicProperties(tonality, base_type, []) for (tonality, base_type) in progression]
+
+def test_roman_numerals_table_covers_all_chords():
+    assert len(roman_numerals_table('Eb')) == len(TONALITIES) * len(ChordsTypes)
+
+def test_roman_numerals_table_diatonic_triads_major():
+    table = roman_numerals_table('D')
+    triads = [('D', ChordsTypes.MAJOR_TRIAD), ('E', ChordsTypes.MINOR_TRIAD), ('F#', ChordsTypes.MINOR_TRIAD), ('G', ChordsTypes.MAJOR_TRIAD),
+              ('A', ChordsTypes.MAJOR_TRIAD), ('B', ChordsTypes.MINOR_TRIAD), ('C#', ChordsTypes.DIMINISHED_TRIAD)]
+    assert [table[triad] for triad in triads] == ['I', 'ii', 'iii', 'IV', 'V', 'vi', 'vii°']
+
+def test_roman_numerals_table_diatonic_minor():
+    table = roman_numerals_table('Cm')
+    chords = [('C', ChordsTypes.MINOR_SEVENTH), ('D', ChordsTypes.HALF_DIMINISHED_SEVENTH), ('Eb', ChordsTypes.MAJOR_SEVENTH),
+              ('G', ChordsTypes.SEVENTH), ('Ab', ChordsTypes.MAJOR_TRIAD), ('Bb', ChordsTypes.MAJOR_TRIAD), ('B', ChordsTypes.DIMINISHED_SEVENTH)]
+    assert [table[chord] for chord in chords] == ['i7', 'iiø7', 'IIImaj7', 'V7', 'VI', 'VII', 'vii°7']
+
+def test_roman_numerals_table_enharmonic_roots():
+    table = roman_numerals_table('C')
+    assert table[('Ab', ChordsTypes.MAJOR_TRIAD)] == 'bVI'
+    assert table[('G#', ChordsTypes.MAJOR_TRIAD)] == '#V'
+
+def test_roman_numerals_table_applied_chords():
+    table = roman_numerals_table('G')
+    assert table[('A', ChordsTypes.SEVENTH)] == 'V7/V'
+    assert table[('B', ChordsTypes.SEVENTH)] == 'V7/vi'
+    assert table[('G', ChordsTypes.SEVENTH)] == 'V7/IV'
+    assert table[('C#', ChordsTypes.DIMINISHED_SEVENTH)] == 'vii°7/V'
+    assert table[('G#', ChordsTypes.DIMINISHED_TRIAD)] == 'vii°/ii'
+
+def test_roman_numeral():
+    assert roman_numeral(ChordHarmonicProperties('F#', ChordsTypes.MINOR_SEVENTH, [IntervalsTypes.NINTH]), 'E') == 'ii7'
+
+def test_roman_numerals_single_key():
+    progression = _chords_properties([('C', ChordsTypes.MAJOR_TRIAD), ('A', ChordsTypes.MINOR_TRIAD), ('D', ChordsTypes.MINOR_SEVENTH), ('G', ChordsTypes.SEVENTH)])
+    assert roman_numerals(progression + [None], 'C') == ['I', 'vi', 'ii7', 'V7', None]
+
+def test_roman_numerals_keys_per_chord():
+    progression = _chords_properties([('C', ChordsTypes.MAJOR_TRIAD), ('D', ChordsTypes.MAJOR_TRIAD), ('D', ChordsTypes.MAJOR_TRIAD)])
+    assert roman_numerals(progression, [None, 'C', 'D']) == [None, 'V/V', 'I']
+
+def test_roman_numerals_table_dorian():
+    table = roman_numerals_table('D', ScalesTypes.DORIAN)
+    assert (table[('D', ChordsTypes.MINOR_SEVENTH)], table[('G', ChordsTypes.SEVENTH)], table[('B', ChordsTypes.DIMINISHED_TRIAD)]) == ('i7', 'IV7', 'vi°')
+    assert table[('F#', ChordsTypes.DIMINISHED_TRIAD)] == 'vii°/IV'
+
+def test_roman_numerals_mixolydian():
+    progression = _chords_properties([('G', ChordsTypes.MAJOR_TRIAD), ('F', ChordsTypes.MAJOR_TRIAD), ('C', ChordsTypes.MAJOR_TRIAD), ('D', ChordsTypes.MINOR_TRIAD)])
+    assert roman_numerals(progression, 'G', ScalesTypes.MIXOLYDIAN) == ['I', 'VII', 'IV', 'v']
+    assert roman_numeral(progression[1], 'G') == 'bVII'
+
+def test_roman_numerals_table_rejects_non_heptatonic_mode():
+    with pytest.raises(ValueError):
+        roman_numerals_table('C', ScalesTypes.BLUES)
@@ -0,0 +1,45 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from scales import *
+from theory import ChordsTypes
+
+
+def test_scale_type_mask_c_major():
+    assert scale_type_mask(ScalesTypes.MAJOR) == 0b101010110101
+
+def test_scale_type_mask_modes_share_pitch_classes():
+    assert scale_type_mask(ScalesTypes.DORIAN, 2) == scale_type_mask(ScalesTypes.MAJOR)
+    assert scale_type_mask(ScalesTypes.NATURAL_MINOR, 9) == scale_type_mask(ScalesTypes.MAJOR)
+    assert scale_type_mask(ScalesTypes.LOCRIAN, 11) == scale_type_mask(ScalesTypes.MAJOR)
+
+def test_scale_type_mask_count_pitch_classes():
+    assert bin(scale_type_mask(ScalesTypes.WHOLE_TONE)).count('1') == 6
+    assert bin(scale_type_mask(ScalesTypes.HALF_WHOLE_DIMINISHED)).count('1') == 8
+    assert scale_type_mask(ScalesTypes.CHROMATIC) == 0b111111111111
+
+def test_scale_matcher_count_labels():
+    assert scale_matcher().count_labels() == len(SCALES_TYPES) * 12
+
+def test_scale_matcher_fitting_chords_c_major_triads():
+    matcher = scale_matcher([ScalesTypes.MAJOR], [ChordsTypes.MAJOR_TRIAD, ChordsTypes.MINOR_TRIAD])
+    fitting_chords = [(tonality, chord_type.name) for (tonality, chord_type) in matcher.fitting_chords('C', ScalesTypes.MAJOR)]
+    assert fitting_chords == [('C', 'MAJOR_TRIAD'), ('F', 'MAJOR_TRIAD'), ('G', 'MAJOR_TRIAD'), ('D', 'MINOR_TRIAD'), ('E', 'MINOR_TRIAD'), ('A', 'MINOR_TRIAD')]
+
+def test_scale_matcher_harmonic_minor_dominant():
+    matcher = scale_matcher([ScalesTypes.HARMONIC_MINOR], [ChordsTypes.SEVENTH])
+    assert [tonality for (tonality, chord_type) in matcher.fitting_chords('A', ScalesTypes.HARMONIC_MINOR)] == ['E']
+
+def test_scale_matcher_containing_scales_matches_loop():
+    matcher = scale_matcher()
+    random_state = np.random.RandomState(0)
+    voicings = [list(random_state.randint(20, 60, size = 3)) for _ in range(100)]
+    expected = [[pitch_classes_mask(voicing) & ~mask == 0 for mask in matcher.masks()] for voicing in voicings]
+    assert matcher.containing_scales(voicings).tolist() == expected
+
+def test_scale_matcher_containing_scales_labels():
+    labels = scale_matcher().containing_scales_labels([27, 30, 31, 34]) # C, D#, E, G
+    assert ('C', ScalesTypes.BLUES) not in labels
+    assert ('C', ScalesTypes.HALF_WHOLE_DIMINISHED) in labels
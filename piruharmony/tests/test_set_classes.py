@@ -0,0 +1,40 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from set_classes import *
+
+
+def test_transposed_masks_c_to_d_major():
+    assert transposed_masks(chord_type_mask(ChordsTypes.MAJOR_TRIAD), 2) == chord_type_mask(ChordsTypes.MAJOR_TRIAD, 2)
+
+def test_set_class_table_count_set_classes():
+    assert len(set(set_class_table().set_classes_names())) == 224
+
+def test_set_class_table_major_and_minor_share_set_class():
+    masks = [chord_type_mask(ChordsTypes.MAJOR_TRIAD), chord_type_mask(ChordsTypes.MINOR_TRIAD, 5)]
+    assert set_class_table().names(masks) == ['3-11', '3-11']
+
+def test_set_class_table_z_related_tetrachords():
+    masks = [0b1010011, 0b10001011] # 0146, 0137
+    assert set_class_table().names(masks) == ['4-Z15', '4-Z29']
+
+def test_set_class_table_complement_number():
+    assert set_class_table().names([(N_PITCH_CLASSES_SETS - 1) ^ 0b10010001]) == ['9-11']
+
+def test_set_class_table_interval_vector_dominant_seventh():
+    assert set_class_table().interval_vectors(chord_type_mask(ChordsTypes.SEVENTH)).tolist() == [0, 1, 2, 1, 1, 1]
+
+def test_set_class_table_prime_form():
+    assert prime_form_symbol(chord_type_mask(ChordsTypes.MINOR_TRIAD, 9)) == '037'
+
+def test_normal_form():
+    assert normal_form(0b1000010001) == [9, 0, 4]
+
+def test_set_class_table_chords_types_codes():
+    masks = voicings_masks([[27, 31, 34], [29, 32, 36, 39], [27, 28]])
+    assert set_class_table().chords_types_codes(masks).tolist() == [CHORDS_TYPES.index(ChordsTypes.MAJOR_TRIAD), CHORDS_TYPES.index(ChordsTypes.MINOR_SEVENTH), NO_CHORD_TYPE]
+
+def test_set_class_table_chords_roots():
+    assert set_class_table().chords_roots(voicings_masks([[29, 32, 36, 39]])).tolist() == [2]
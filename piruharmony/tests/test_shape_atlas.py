@@ -0,0 +1,58 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import itertools
+import multiprocessing
+
+import numpy as np
+from shape_atlas import *
+from instruments import MUTED, guitar, strings_instrument
+
+
+TRIPLE = strings_instrument(['C3', 'E3', 'G3'])
+SIX_STRINGS = strings_instrument(['D3', 'D#3', 'A3', 'A#3', 'D4', 'D#4'])
+SPAN = 2
+N_FRETS = 4
+
+
+def _brute_force_voicings(instrument, span, n_frets, min_sounding_strings):
+    voicings = []
+    for frets in itertools.product([MUTED] + list(range(n_frets + 1)), repeat = instrument.count_strings()):
+        fretted = [i_fret for i_fret in frets if i_fret > 0]
+        if len(fretted) == 0 or max(fretted) - min(fretted) < span:
+            if sum([i_fret != MUTED for i_fret in frets]) >= min_sounding_strings:
+                voicings.append(frets)
+    return voicings
+
+def test_positions_enumerate_each_voicing_once():
+    frets = np.concatenate([position_voicings(TRIPLE, position, SPAN, N_FRETS, 2) for position in range(1, N_FRETS + 1)])
+    assert sorted(map(tuple, frets.tolist())) == sorted(_brute_force_voicings(TRIPLE, SPAN, N_FRETS, 2))
+    assert len(set(map(tuple, frets.tolist()))) == len(frets)
+    first_position = position_voicings(TRIPLE, 1, SPAN, N_FRETS, 2).tolist()
+    assert first_position == sorted(first_position)
+
+def _assert_entries_match_direct_analysis(instrument, atlas):
+    for i_entry in range(atlas.count_entries()):
+        for frets in atlas.entry_shapes(i_entry).tolist():
+            assert instrument.to_chord_properties([i_fret if i_fret != MUTED else None for i_fret in frets]) == atlas.entry_properties(i_entry)
+
+def test_signatures():
+    signatures = voicings_signatures(guitar(), np.array([[MUTED, 0, 2, 2, 1, 0], [5, MUTED, 2, 2, 1, 0], [0, 0, 2, 2, 1, 0]]))
+    assert signatures.tolist()[0] == guitar().to_keyboard([None, 0, 2, 2, 1, 0]) + [MUTED]
+    assert signatures.tolist()[1] == signatures.tolist()[0]
+    assert signatures.tolist()[2] == guitar().to_keyboard([0, 0, 2, 2, 1, 0])
+
+def test_atlas_matches_direct_analysis():
+    with multiprocessing.get_context('spawn').Pool(2) as pool:
+        atlas = shape_atlas(TRIPLE, SPAN, N_FRETS, 2, map_function = pool.imap)
+    assert atlas.count_voicings() == len(_brute_force_voicings(TRIPLE, SPAN, N_FRETS, 2))
+    assert atlas.count_entries() < atlas.count_voicings()
+    assert list(map(tuple, atlas.signatures().tolist())) == sorted(set(map(tuple, atlas.signatures().tolist())))
+    _assert_entries_match_direct_analysis(TRIPLE, atlas)
+    assert [0, 0, 0] in atlas.shapes('C', ChordsTypes.MAJOR_TRIAD).tolist()
+
+def test_six_strings_atlas_matches_direct_analysis():
+    atlas = shape_atlas(SIX_STRINGS, span = 1, n_frets = 1, min_sounding_strings = 5)
+    assert atlas.count_entries() < atlas.count_voicings()
+    _assert_entries_match_direct_analysis(SIX_STRINGS, atlas)
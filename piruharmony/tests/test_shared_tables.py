@@ -0,0 +1,44 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import multiprocessing
+import pickle
+
+import numpy as np
+from shared_tables import *
+from set_classes import SET_CLASSES_TABLE, set_class_table
+
+
+def _attached_table_names(handle):
+    attach_tables(handle)
+    arrays = table(SET_CLASSES_TABLE, lambda: None)
+    return arrays['names'].tolist()[:3], arrays['prime_forms'].flags.writeable, set_class_table().names([0b10010001])
+
+def test_table_is_built_once():
+    calls = []
+    builder = lambda: calls.append(1) or {'values': np.arange(3)}
+    assert table('test_tables_built_once', builder) is table('test_tables_built_once', builder)
+    assert len(calls) == 1
+
+def test_shared_tables_handle_is_picklable():
+    table('test_tables_handle', lambda: {'values': np.arange(5, dtype = np.int16), 'names': np.array(['a', 'bc'])})
+    shared_tables = share_tables(['test_tables_handle'])
+    try:
+        handle = pickle.loads(pickle.dumps(shared_tables.handle()))
+        assert handle == shared_tables.handle()
+        assert handle.segment_name() == shared_tables.handle().segment_name()
+    finally:
+        shared_tables.unlink()
+
+def test_workers_attach_shared_tables():
+    set_class_table()
+    shared_tables = share_tables([SET_CLASSES_TABLE])
+    try:
+        with multiprocessing.get_context('spawn').Pool(1) as pool:
+            names, is_writeable, c_major_names = pool.apply(_attached_table_names, (shared_tables.handle(),))
+        assert names == table(SET_CLASSES_TABLE, lambda: None)['names'].tolist()[:3]
+        assert not is_writeable
+        assert c_major_names == ['3-11']
+    finally:
+        shared_tables.unlink()
@@ -0,0 +1,58 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from smoothing import *
+from theory import ChordsTypes, ChordHarmonicProperties
+
+
+def test_fifths_distances_fifth_is_one():
+    assert fifths_distances()[7] == 1
+
+def test_fifths_distances_tritone_is_six():
+    assert fifths_distances()[6] == 6
+
+def test_chords_types_distances_diagonal_is_zero():
+    assert (np.diag(chords_types_distances()) == 0.).all()
+
+def test_labels_segments():
+    starts, ends, labels = labels_segments(np.array([3, 3, 5, 5, 5, 3]))
+    assert starts.tolist() == [0, 2, 5] and ends.tolist() == [2, 5, 6] and labels.tolist() == [3, 5, 3]
+
+def test_viterbi_decode_removes_flicker():
+    scores = np.array([[1., 0.], [.4, .6], [1., 0.]])
+    assert viterbi_decode(scores, np.array([[0., -.5], [-.5, 0.]])).tolist() == [0, 0, 0]
+
+def test_empty_scores_decode_to_no_segment():
+    smoother = chord_sequence_smoother()
+    scores = np.zeros((0, smoother.count_labels()))
+    assert viterbi_decode(scores, smoother.transition_matrix()).tolist() == []
+    assert smoother.decoded(scores).tolist() == []
+    assert [segment_bounds.tolist() for segment_bounds in smoother.segments(scores)] == [[], [], []]
+
+def test_viterbi_decode_keeps_lasting_change():
+    scores = np.array([[1., 0.], [0., 1.], [0., 1.]])
+    assert viterbi_decode(scores, np.array([[0., -.5], [-.5, 0.]])).tolist() == [0, 1, 1]
+
+def test_chord_sequence_smoother_matches_full_viterbi():
+    smoother = chord_sequence_smoother()
+    scores = np.random.RandomState(0).rand(30, smoother.count_labels())
+    assert (smoother.decoded(scores) == viterbi_decode(scores, smoother.transition_matrix())).all()
+
+def test_chord_sequence_smoother_removes_flicker():
+    smoother = chord_sequence_smoother()
+    scores = np.zeros((3, smoother.count_labels()))
+    scores[:, 0], scores[1, 7] = .8, 1.
+    assert smoother.decoded(scores).tolist() == [0, 0, 0]
+
+def test_chord_sequence_smoother_properties_segments():
+    c_major = ChordHarmonicProperties('C', ChordsTypes.MAJOR_TRIAD, [])
+    g_major = ChordHarmonicProperties('G', ChordsTypes.MAJOR_TRIAD, [])
+    smoother = chord_sequence_smoother(self_transition_penalty = .5)
+    scores = smoother.properties_scores([c_major, c_major, c_major, g_major, g_major, g_major])
+    starts, ends, labels = smoother.segments(scores)
+    assert starts.tolist() == [0, 3] and labels.tolist() == [smoother.label_index('C', ChordsTypes.MAJOR_TRIAD), smoother.label_index('G', ChordsTypes.MAJOR_TRIAD)]
+
+def test_chord_sequence_smoother_properties_scores_none_frame():
+    assert chord_sequence_smoother().properties_scores([None]).sum() == 0.
@@ -0,0 +1,83 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import multiprocessing
+
+import numpy as np
+import pytest
+import shared_tables
+import snapshots
+import theory
+from shared_tables import share_tables
+from snapshots import *
+from theory import *
+
+
+CHORDS = [['C3', 'E3', 'G3'], ['G2', 'B3', 'D4', 'F4'], ['C3', 'Eb3', 'Gb3', 'A3'], ['D3', 'G3', 'C#4', 'E4']]
+
+
+def _chords_properties():
+    return [[(p.tonality(), p.base_type(), p.enrichments()) for p in chord_explorer(notes_names).possible_harmonic_properties()] for notes_names in CHORDS]
+
+def _attached_harmonic_properties(handle):
+    attach_harmonic_properties(handle)
+    return [shared_harmonic_properties(chord_signature(notes_names)) != None for notes_names in CHORDS], _chords_properties()
+
+def _saved_snapshot(tmp_path):
+    clear_harmonic_properties_cache()
+    expected = _chords_properties()
+    path = str(tmp_path / 'chords_snapshot.npz')
+    assert save_chords_snapshot(path) == len(CHORDS)
+    clear_harmonic_properties_cache()
+    return path, expected
+
+def test_snapshot_round_trip(tmp_path):
+    path, expected = _saved_snapshot(tmp_path)
+    assert load_chords_snapshot(path) == len(CHORDS)
+    assert [signature for (signature, _) in cached_harmonic_properties()] == [chord_signature(notes_names) for notes_names in CHORDS]
+    assert _chords_properties() == expected
+    assert len(cached_harmonic_properties()) == len(CHORDS)
+
+def test_snapshot_has_no_object_arrays(tmp_path):
+    path, _ = _saved_snapshot(tmp_path)
+    with np.load(path, allow_pickle = False) as snapshot:
+        assert all([snapshot[name].dtype != object for name in SNAPSHOT_ARRAYS_NAMES])
+
+def test_snapshot_rejected_when_definitions_change(tmp_path, monkeypatch):
+    path, _ = _saved_snapshot(tmp_path)
+    monkeypatch.setattr(snapshots, 'INTERVALS_TYPES', INTERVALS_TYPES[::-1])
+    with pytest.raises(ValueError):
+        load_chords_snapshot(path)
+    assert cached_harmonic_properties() == []
+
+def test_snapshot_rejected_when_not_a_snapshot(tmp_path):
+    path = tmp_path / 'chords_snapshot.npz'
+    path.write_bytes(b'not a snapshot')
+    with pytest.raises(ValueError):
+        load_chords_snapshot(str(path))
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(theory, 'CHORDS_CACHE_SIZE', 2)
+    clear_harmonic_properties_cache()
+    for notes_names in CHORDS[:2] + [CHORDS[0], CHORDS[2]]:
+        chord_explorer(notes_names).possible_harmonic_properties()
+    assert [signature for (signature, _) in cached_harmonic_properties()] == [chord_signature(CHORDS[0]), chord_signature(CHORDS[2])]
+
+def test_workers_look_up_shared_harmonic_properties(monkeypatch):
+    monkeypatch.setattr(shared_tables, '_TABLES', {})
+    clear_harmonic_properties_cache()
+    expected = _chords_properties()
+    clear_harmonic_properties_cache()
+    for notes_names in CHORDS[:3]:
+        chord_explorer(notes_names).possible_harmonic_properties()
+    assert len(share_harmonic_properties()['signatures_keys']) == 3
+    assert shared_harmonic_properties(chord_signature(CHORDS[0])) == tuple(chord_explorer(CHORDS[0]).possible_harmonic_properties())
+    tables = share_tables([HARMONIC_PROPERTIES_TABLE])
+    try:
+        with multiprocessing.get_context('spawn').Pool(1) as pool:
+            are_shared, chords_properties = pool.apply(_attached_harmonic_properties, (tables.handle(),))
+        assert are_shared == [True, True, True, False]
+        assert chords_properties == expected
+    finally:
+        tables.unlink()
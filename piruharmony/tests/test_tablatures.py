@@ -0,0 +1,77 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from tablatures import *
+
+
+SONG = '''Some Song - Artist
+Tuning: Standard
+
+Intro
+e|---0---3-----12--|
+B|---1---0-----12--|
+G|---0---0-----13--|
+D|---2---0-----14--|
+A|---3---2-----14--|
+E|-------3-----12--|
+
+Verse  x2
+e|--0--|--x--|
+B|--1--|--3--|
+G|--2--|--2--|
+D|--2--|--0--|
+A|--0--|-----|
+E|-----|-----|
+'''
+
+def _written_tablature(tmp_path, text, newline = '\n'):
+    path = str(tmp_path / 'song.txt')
+    with open(path, 'w', newline = newline) as tablature:
+        tablature.write(text)
+    return path
+
+GUITAR_TUNING = ['E3', 'A3', 'D4', 'G4', 'B4', 'E5']
+
+def test_parsed_tuning():
+    assert parsed_tuning('Drop D') == ['D', 'A', 'D', 'G', 'B', 'E']
+    assert parsed_tuning('DADGAD') == ['D', 'A', 'D', 'G', 'A', 'D']
+    assert parsed_tuning('Eb-Ab-Db-Gb-Bb-Eb') == ['Eb', 'Ab', 'Db', 'Gb', 'Bb', 'Eb']
+    assert parsed_tuning('standard') == None
+    assert parsed_tuning('whatever the band uses') == None
+
+def test_tablature_instrument_octaves():
+    assert tablature_instrument(['E', 'A', 'D', 'G', 'B', 'E']).tuning() == GUITAR_TUNING
+    assert tablature_instrument(['D', 'A', 'D', 'G', 'B', 'E']).tuning() == ['D3', 'A3', 'D4', 'G4', 'B4', 'E5']
+    assert tablature_instrument(['E', 'A', 'D', 'G']).tuning() == ['E1', 'A1', 'D2', 'G2']
+    assert tablature_instrument(['G', 'C', 'E', 'A']).tuning() == ['G4', 'C4', 'E4', 'A4']
+    assert tablature_instrument(['B', 'E', 'A', 'D', 'G', 'B', 'E']).tuning() == ['B2', 'E3', 'A3', 'D4', 'G4', 'B4', 'E5']
+
+def test_tablature_file_frets_vectors(tmp_path):
+    for newline in ['\n', '\r\n']:
+        tablature = tablature_file(_written_tablature(tmp_path, SONG, newline))
+        assert tablature.instrument().tuning() == GUITAR_TUNING
+        assert tablature.count_systems() == 2
+        assert list(tablature.frets_vectors()) == [[None, 3, 2, 0, 1, 0], [3, 2, 0, 0, 0, 3], [12, 14, 14, 13, 12, 12],
+                                                   [None, 0, 2, 2, 1, 0], [None, None, 0, 2, 3, None]]
+
+def test_tablature_file_tuning_header(tmp_path):
+    text = 'Tuning: Drop D\n\nD|--0--|\nA|--0--|\nF|--0--|\nD|--0--|\nA|--0--|\nD|--0--|\n'
+    tablature = tablature_file(_written_tablature(tmp_path, text))
+    assert tablature.instrument().tuning() == ['D3', 'A3', 'D4', 'G4', 'B4', 'E5']
+    assert tablature.frets().tolist() == [[0] * 6]
+
+def test_tablature_file_without_header_reads_strings_names(tmp_path):
+    text = 'A|--0--2--|\nE|--0--3--|\nC|--0--2--|\nG|--0--0--|\n'
+    tablature = tablature_file(_written_tablature(tmp_path, text))
+    assert tablature.instrument().tuning() == ['G4', 'C4', 'E4', 'A4']
+    assert tablature.frets().tolist() == [[0, 0, 0, 0], [0, 2, 3, 2]]
+
+def test_tablature_file_skips_incomplete_systems(tmp_path):
+    text = SONG + '\ne|--5--|\nB|--5--|\n'
+    assert len(tablature_file(_written_tablature(tmp_path, text)).frets()) == 5
+
+def test_tablature_file_empty(tmp_path):
+    tablature = tablature_file(_written_tablature(tmp_path, ''))
+    assert tablature.instrument() == None
+    assert list(tablature.frets_vectors()) == []
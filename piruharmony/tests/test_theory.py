@@ -592,3 +592,138 @@ def test_chord_explorer_minor_triad_second_inversion_contains_minor_triad():
     expected_true  = ChordsTypes.MINOR_TRIAD in [p.base_type() for p in chord_explorer.possible_harmonic_properties()]
     assert expected_true == True
 
+
+def test_pitch_class_of_c():
+    assert pitch_class(notes_references['C4']) == 0
+
+def test_tonality_pitch_class_enharmonics():
+    assert tonality_pitch_class('F#') == tonality_pitch_class('Gb') == 6
+
+def test_key_spelling_sharp_key():
+    assert KEYS_SPELLINGS['E'][8] == 'G#'
+
+def test_key_spelling_flat_key():
+    assert KEYS_SPELLINGS['Eb'][8] == 'Ab'
+
+def test_key_spelling_minor_leading_tone():
+    assert KEYS_SPELLINGS['Am'][8] == 'G#'
+
+def test_keyboard_to_harmonic_properties_translator_single_spelling_in_key():
+    tested_names = KeyboardToHarmonicPropertiesTranslator([38, 42, 45], key = 'E').possible_notes_names_lists()
+    assert tested_names == [['B3'], ['D#4'], ['F#4']]
+
+def test_keyboard_to_chord_properties_in_key_Bmaj():
+    tested = keyboard_to_chord_properties([38, 42, 45], key = 'E')
+    expected = ChordHarmonicProperties('B', ChordsTypes.MAJOR_TRIAD, [])
+    assert tested == expected
+
+def test_keyboard_to_chord_properties_in_key_Cbmaj():
+    tested = keyboard_to_chord_properties([38, 42, 45], key = 'Gb')
+    expected = ChordHarmonicProperties('Cb', ChordsTypes.MAJOR_TRIAD, [])
+    assert tested == expected
+
+def test_chord_properties_key_minor():
+    assert chord_properties_key(ChordHarmonicProperties('F#', ChordsTypes.MINOR_SEVENTH, [])) == 'F#m'
+
+def test_harmonic_properties_score_root_position_is_better():
+    chord_properties = ChordHarmonicProperties('C', ChordsTypes.MAJOR_TRIAD, [])
+    assert harmonic_properties_score(chord_properties, ['C']) > harmonic_properties_score(chord_properties, ['E'])
+
+def test_harmonic_properties_score_unknown_base_type_is_worse():
+    known = ChordHarmonicProperties('C', ChordsTypes.MAJOR_TRIAD, [IntervalsTypes.FOURTH])
+    unknown = ChordHarmonicProperties('C', ChordsTypes.UNKNOWN, [IntervalsTypes.FOURTH])
+    assert harmonic_properties_score(known, ['C']) > harmonic_properties_score(unknown, ['C'])
+
+def test_keyboard_to_top_chord_properties_best_is_Cmaj7():
+    tested = keyboard_to_top_chord_properties([27, 31, 34, 38], k = 3)
+    expected = ChordHarmonicProperties('C', ChordsTypes.MAJOR_SEVENTH, [])
+    assert tested[0][1] == expected
+
+def test_keyboard_to_top_chord_properties_count():
+    tested = keyboard_to_top_chord_properties([27, 31, 34, 38], k = 3)
+    assert len(tested) == 3
+
+def test_keyboard_to_top_chord_properties_no_candidate():
+    assert keyboard_to_top_chord_properties([27, 31, 34], k = 0) == []
+    assert keyboard_to_top_chord_properties([27, 31, 34], k = -1) == []
+
+def test_keyboard_to_top_chord_properties_sorted_scores():
+    tested_scores = [score for (score, _) in keyboard_to_top_chord_properties([27, 31, 34, 44], k = 5)]
+    assert tested_scores == sorted(tested_scores, reverse = True)
+
+def test_keyboard_to_top_chord_properties_matches_full_sort():
+    i_notes_on_keyboard = [27, 31, 34, 38, 44]
+    bass_tonalities = ['C', 'B#']
+    all_candidates, candidates_ids = [], set()
+    for candidate in KeyboardToHarmonicPropertiesTranslator(i_notes_on_keyboard, None).iter_harmonic_properties():
+        candidate_id = (candidate.tonality(), candidate.base_type(), tuple(candidate.enrichments()))
+        if candidate_id not in candidates_ids:
+            candidates_ids.add(candidate_id)
+            all_candidates.append((harmonic_properties_score(candidate, bass_tonalities), candidate))
+    expected = sorted(all_candidates, key = lambda item: item[0], reverse = True)[:4]
+    tested = keyboard_to_top_chord_properties(i_notes_on_keyboard, k = 4)
+    assert [(score, candidate.tonality(), candidate.base_type()) for (score, candidate) in tested] == \
+           [(score, candidate.tonality(), candidate.base_type()) for (score, candidate) in expected]
+
+def test_keyboard_to_top_chord_properties_altered_bass_is_root_position():
+    score, chord_properties = keyboard_to_top_chord_properties([28, 31, 35], k = 1)[0]
+    assert chord_properties.tonality() == 'C#' and score == KNOWN_BASE_TYPE_SCORE + VALID_ENRICHMENTS_SCORE + ROOT_POSITION_SCORE
+
+def test_pitch_classes_mask_c_major():
+    assert pitch_classes_mask([27, 31, 34, 39]) == 0b10010001
+
+def test_chord_type_mask_d_power_chord():
+    assert chord_type_mask(ChordsTypes.POWER_CHORD, root_pitch_class = 2) == 0b1000000100
+
+def test_chord_properties_mask_with_enrichment():
+    chord_properties = ChordHarmonicProperties('Bb', ChordsTypes.SEVENTH, [IntervalsTypes.NINTH, IntervalsTypes.UNKNOWN])
+    assert chord_properties_mask(chord_properties) == 0b10100100101 # C, D, F, Ab, Bb
+
+def test_enrichments_mask_round_trip():
+    enrichments = [IntervalsTypes.NINTH, IntervalsTypes.FOURTH, IntervalsTypes.SIXTH]
+    assert mask_enrichments(enrichments_mask(enrichments)) == enrichments
+
+def test_compact_harmonic_properties_accessors():
+    tested = compact_harmonic_properties(ChordHarmonicProperties('F#', ChordsTypes.MAJOR_TRIAD, [IntervalsTypes.FOURTH]))
+    assert (tested.tonality(), tested.base_type(), tested.enrichments(), tested.count_enrichments()) == ('F#', ChordsTypes.MAJOR_TRIAD, [IntervalsTypes.FOURTH], 1)
+
+def test_compact_harmonic_properties_equals_regular_properties():
+    chord_properties = ChordHarmonicProperties('Bb', ChordsTypes.MINOR_SEVENTH, [IntervalsTypes.NINTH])
+    assert compact_harmonic_properties(chord_properties) == chord_properties
+
+def test_compact_harmonic_properties_hashable():
+    chord_properties = ChordHarmonicProperties('C', ChordsTypes.MAJOR_TRIAD, [])
+    assert len({compact_harmonic_properties(chord_properties), compact_harmonic_properties(chord_properties)}) == 1
+
+def test_compact_harmonic_properties_inequality():
+    c_major = compact_harmonic_properties(ChordHarmonicProperties('C', ChordsTypes.MAJOR_TRIAD, []))
+    c_minor = compact_harmonic_properties(ChordHarmonicProperties('C', ChordsTypes.MINOR_TRIAD, []))
+    assert c_major != c_minor
+
+def test_compact_harmonic_properties_expanded():
+    chord_properties = ChordHarmonicProperties('E', ChordsTypes.SEVENTH, [IntervalsTypes.AUGMENTED_NINTH])
+    assert compact_harmonic_properties(chord_properties).expanded() == chord_properties
+
+def test_chord_signature_bass_note():
+    assert chord_signature(['G3', 'B5', 'D4', 'F4']).bass_note_name() == 'G3'
+
+def test_chord_signature_intervals_codes():
+    assert chord_signature(['G3', 'B5', 'D4', 'F4', 'G4']).intervals_codes() == ((4, 2), (7, 4), (10, 6))
+
+def test_chord_signature_matches_cleared_intervals():
+    notes_names = ['E5', 'G3', 'C2', 'E2', 'G2', 'Bb4', 'C4']
+    assert chord_signature(notes_names).intervals() == cleared_intervals(notes_names)
+
+def test_chord_signature_hashable():
+    assert len({chord_signature(['C3', 'E3', 'G3']), chord_signature(['C3', 'G4', 'E5', 'C5'])}) == 1
+
+def test_chord_signature_of_built_chord():
+    my_chord = Chord(root_note = note('C3'), chord_intervals = [IntervalsTypes.FIFTH.value, IntervalsTypes.MAJOR_THIRD.value])
+    assert my_chord.signature() == chord_signature(['C3', 'E3', 'G3'])
+
+def test_possible_harmonic_properties_are_copies_of_the_cache():
+    harmonic_properties = chord_explorer(['C3', 'E3', 'G3', 'D4']).possible_harmonic_properties()
+    expected_enrichments = [list(properties.enrichments()) for properties in harmonic_properties]
+    for properties in harmonic_properties:
+        properties.enrichments().clear()
+    assert [properties.enrichments() for properties in chord_explorer(['C3', 'E3', 'G3', 'D4']).possible_harmonic_properties()] == expected_enrichments
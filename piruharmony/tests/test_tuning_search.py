@@ -0,0 +1,51 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import multiprocessing
+
+import numpy as np
+from tuning_search import *
+from instruments import MUTED, guitar, strings_instrument
+from shape_atlas import position_voicings
+from theory import ChordHarmonicProperties, ChordsTypes, chord_properties_mask
+
+
+REFERENCE_TUNING = ['G3', 'C4', 'E4']
+SPAN = 3
+N_FRETS = 5
+PROGRESSION = [ChordHarmonicProperties(tonality, base_type, []) for (tonality, base_type) in
+               [('D', ChordsTypes.MINOR_TRIAD), ('G', ChordsTypes.MAJOR_TRIAD), ('C', ChordsTypes.MAJOR_TRIAD), ('A', ChordsTypes.POWER_CHORD)]]
+
+
+def _brute_force_difficulty(tuning, masks):
+    instrument = strings_instrument(tuning)
+    frets = np.concatenate([position_voicings(instrument, position, SPAN, N_FRETS, 1) for position in range(1, N_FRETS + 1)])
+    _, voicings_masks = instrument.frets_to_keyboard(frets)
+    difficulties = fingering_difficulties(frets)
+    return sum([difficulties[voicings_masks == mask].min() if np.any(voicings_masks == mask) else np.inf for mask in masks])
+
+def test_position_index_finds_easiest_fingerings():
+    index = tuning_position_index(guitar(), SPAN, N_FRETS)
+    c_major = chord_properties_mask(PROGRESSION[2])
+    assert index.difficulty(c_major) == _brute_force_difficulty(guitar().tuning(), [c_major])
+    frets = np.array([[MUTED if i_fret == None else i_fret for i_fret in index.voicing(c_major)]])
+    assert guitar().frets_to_keyboard(frets)[1].tolist() == [c_major]
+    assert index.voicing(0b111111111111) == None and index.difficulty(0b111111111111) == np.inf
+
+def test_lower_bounds_hold():
+    masks = [chord_properties_mask(chord_properties) for chord_properties in PROGRESSION]
+    for tuning in candidate_tunings(REFERENCE_TUNING, max_shift = 1):
+        assert progression_lower_bound(tuning, masks) <= _brute_force_difficulty(tuning, masks)
+
+def test_search_matches_brute_force():
+    tunings = candidate_tunings(REFERENCE_TUNING, max_shift = 2)
+    masks = [chord_properties_mask(chord_properties) for chord_properties in PROGRESSION]
+    expected = sorted([_brute_force_difficulty(tuning, masks) for tuning in tunings])[:3]
+    with multiprocessing.get_context('spawn').Pool(2) as pool:
+        best_tunings = tuning_search(PROGRESSION, tunings, n_results = 3, span = SPAN, n_frets = N_FRETS, map_function = pool.map)
+    assert [difficulty for (difficulty, _) in best_tunings] == expected
+    assert all([_brute_force_difficulty(tuning, masks) == difficulty for (difficulty, tuning) in best_tunings])
+
+def test_search_without_results():
+    assert tuning_search(PROGRESSION, candidate_tunings(REFERENCE_TUNING, max_shift = 1), n_results = 0, span = SPAN, n_frets = N_FRETS) == []
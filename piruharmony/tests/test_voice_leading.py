@@ -0,0 +1,39 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from itertools import product
+
+import numpy as np
+from voice_leading import *
+
+
+def _brute_force_cost(voicing_a, voicing_b):
+    if len(voicing_a) < len(voicing_b):
+        voicing_a, voicing_b = voicing_b, voicing_a
+    costs = [sum([abs(note - voicing_b[i_target]) for (note, i_target) in zip(voicing_a, targets)])
+             for targets in product(range(len(voicing_b)), repeat = len(voicing_a)) if set(targets) == set(range(len(voicing_b)))]
+    return min(costs)
+
+def test_voice_leading_cost_same_voicing():
+    assert voice_leading_cost([27, 31, 34], [34, 27, 31]) == 0
+
+def test_voice_leading_cost_c_to_f_over_c():
+    assert voice_leading_cost([27, 31, 34], [27, 32, 36]) == 3
+
+def test_voice_leading_cost_is_symmetric():
+    assert voice_leading_cost([22, 29, 34, 38], [27, 31, 34]) == voice_leading_cost([27, 31, 34], [22, 29, 34, 38]) == 11
+
+def test_voice_leading_cost_empty_voicing():
+    assert voice_leading_cost([], [27, 31, 34]) == 0
+
+def test_voice_leading_costs_match_brute_force():
+    random_state = np.random.RandomState(0)
+    voicings_a = [list(random_state.randint(20, 60, size = random_state.randint(1, 6))) for _ in range(200)]
+    voicings_b = [list(random_state.randint(20, 60, size = random_state.randint(1, 6))) for _ in range(200)]
+    expected = [_brute_force_cost(voicing_a, voicing_b) for (voicing_a, voicing_b) in zip(voicings_a, voicings_b)]
+    assert voice_leading_costs(voicings_a, voicings_b).tolist() == expected
+
+def test_progression_voice_leading_costs():
+    voicings = [[27, 31, 34], [27, 32, 36], [26, 29, 32, 34], [27, 31, 34]]
+    assert progression_voice_leading_costs(voicings).tolist() == [3, 5, 4]
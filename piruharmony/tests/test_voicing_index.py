@@ -0,0 +1,72 @@
+import os.path
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from voicing_index import *
+from instruments import guitar, ukulele
+
+
+def _random_frets(n_voicings, n_strings, random_state):
+    frets = random_state.randint(0, 8, size = (n_voicings, n_strings))
+    frets[random_state.rand(n_voicings, n_strings) < .2] = MUTED
+    return frets.astype(np.int8)
+
+def _brute_force_neighbours(index, frets, k):
+    distances = index.distances(frets, np.arange(index.count_voicings()))
+    i_voicings = np.lexsort((np.arange(len(distances)), distances))[:k]
+    return i_voicings.tolist(), distances[i_voicings].tolist()
+
+def test_frets_array_muted_strings():
+    assert frets_array([[None, 3, 2, 0, 1, 0]]).tolist() == [[MUTED, 3, 2, 0, 1, 0]]
+
+def test_frets_masks_c_major():
+    open_strings = np.array([31, 36, 41, 46, 50, 55])
+    assert frets_masks(open_strings, frets_array([[None, 3, 2, 0, 1, 0], [None] * 6])).tolist() == [0b10010001, 0]
+
+def test_voicing_distance_is_symmetric_and_zero_on_itself():
+    index = voicing_index(guitar(), [[None, 3, 2, 0, 1, 0], [3, 2, 0, 0, 0, 3]])
+    assert index.distances([None, 3, 2, 0, 1, 0], [0, 1]).tolist()[0] == 0.
+    assert index.distances([None, 3, 2, 0, 1, 0], [1])[0] == index.distances([3, 2, 0, 0, 0, 3], [0])[0]
+
+def test_voicing_index_nearest_c_major():
+    index = voicing_index(guitar(), [[None, 3, 2, 0, 1, 0], [3, 2, 0, 0, 0, 3], [None, 3, 5, 5, 5, 3]])
+    i_voicings, distances = index.nearest_voicings([[None, 3, 2, 0, 1, None]], k = 2)
+    assert i_voicings.tolist() == [[0, 1]]
+    assert distances.tolist() == [[2., 11.2]]
+
+def test_voicing_index_matches_brute_force():
+    random_state = np.random.RandomState(0)
+    catalog = _random_frets(3000, 6, random_state)
+    queries = _random_frets(30, 6, random_state)
+    index = voicing_index(guitar(), catalog, leaf_size = 16)
+    for k in [1, 7]:
+        i_voicings, distances = index.nearest_voicings(queries, k = k)
+        for (frets, query_i_voicings, query_distances) in zip(queries, i_voicings, distances):
+            expected_i_voicings, expected_distances = _brute_force_neighbours(index, frets, k)
+            assert np.allclose(query_distances, expected_distances)
+            assert query_i_voicings.tolist() == expected_i_voicings
+
+def test_voicing_index_k_larger_than_catalog():
+    index = voicing_index(ukulele(), [[0, 0, 0, 3], [2, 2, 2, 0]])
+    i_voicings, distances = index.nearest_voicings([[0, 0, 0, 3]], k = 5)
+    assert i_voicings.tolist() == [[0, 1]]
+
+def test_voicing_index_empty_catalog_and_k():
+    assert frets_array([], n_strings = 4).shape == (0, 4)
+    index = voicing_index(ukulele(), [])
+    assert index.count_voicings() == 0
+    i_voicings, distances = index.nearest_voicings([[0, 0, 0, 3]])
+    assert i_voicings.shape == (1, 0) and distances.shape == (1, 0)
+    index = voicing_index(ukulele(), [[0, 0, 0, 3], [2, 2, 2, 0]])
+    assert index.nearest_voicings([[0, 0, 0, 3]], k = 0)[0].shape == (1, 0)
+    assert index.nearest_voicings([], k = 2)[0].shape == (0, 2)
+
+def test_voicing_index_save_and_load(tmp_path):
+    random_state = np.random.RandomState(1)
+    catalog, queries = _random_frets(500, 4, random_state), _random_frets(10, 4, random_state)
+    index = voicing_index(ukulele(), catalog, leaf_size = 8)
+    index.save(str(tmp_path / 'index'))
+    loaded_index = load_voicing_index(str(tmp_path / 'index'))
+    assert loaded_index.count_voicings() == 500
+    assert [array.tolist() for array in loaded_index.nearest_voicings(queries)] == [array.tolist() for array in index.nearest_voicings(queries)]
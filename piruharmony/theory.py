@@ -3,6 +3,7 @@ from enum import Enum
 from itertools import product, chain
 from functools import reduce
 from operator import add
+import heapq
 
 
 DEFAULT_NOTE_TAG = 'A4'
@@ -784,9 +785,106 @@ def chord(notes_names):
     >>> my_chord.has_type(ChordsTypes.DIMINISHED_TRIAD)
     False
     """
-    intervals_list = cleared_intervals(notes_names)
-    bass_note = lowest_note(notes_names)
-    return Chord(root_note = bass_note, chord_intervals = intervals_list)
+    return chord_signature(notes_names).chord()
+
+
+def chord_signature(notes_names):
+    """
+    Returns the canonical signature of a chord.
+
+    Notes are parsed and sorted once: the bass note is the lowest one,
+    highest duplicated tonalities are removed and the flattened
+    intervals over the bass are sorted, as in cleared_intervals.
+
+    Parameters
+    ----------
+    notes_names : list of two or three characters.
+        Name of notes composing the chord. Tags in notes_names are
+        given in english notation.
+
+    Returns
+    -------
+    out : ChordSignature
+        The immutable and hashable signature of the chord.
+
+    See Also
+    --------
+    ChordSignature : a class that describes the canonical signature of
+        a chord.
+
+    Examples
+    --------
+    >>> my_signature = chord_signature(['G3', 'B5', 'D4', 'F4', 'G4'])
+    >>> my_signature.bass_note_name()
+    'G3'
+    >>> my_signature.intervals_codes()
+    ((4, 2), (7, 4), (10, 6))
+    >>> my_signature == chord_signature(['G3', 'D4', 'F4', 'B4'])
+    True
+    """
+    n_tones_in_scale = len(VALID_TONES)
+    sorted_keys = sorted([(notes_references[note_name], note_name) for note_name in notes_names], key = lambda key: key[0])
+    i_bass_note, bass_note_name = sorted_keys[0]
+    i_bass_tone, kept_tonalities, intervals_codes = VALID_TONES.index(bass_note_name[0]), {bass_note_name[:-1]}, []
+    for (i_note, note_name) in sorted_keys[1:]:
+        if note_name[:-1] not in kept_tonalities:
+            kept_tonalities.add(note_name[:-1])
+            delta_tones = VALID_TONES.index(note_name[0]) - i_bass_tone
+            tones_range = delta_tones if delta_tones > 0 else n_tones_in_scale + delta_tones
+            intervals_codes.append(((i_note - i_bass_note) % N_SEMITONES_IN_OCTAVE, tones_range))
+    return ChordSignature(bass_note_name, tuple(sorted(intervals_codes)))
+
+
+class ChordSignature(tuple):
+    """
+    A class that describes the canonical signature of a chord.
+
+    The signature gathers the bass note name and the sorted tuple of
+    flattened intervals over the bass, each interval being refered to
+    as a (number of semitones, tones range) pair. Instances are
+    immutable and hashable, so that they can be used as cache keys.
+
+    Parameters
+    ----------
+    bass_note_name : list of two or three characters.
+        Name of the bass note in english notation.
+    intervals_codes : tuple of tuples (int, int)
+        Sorted (number of semitones, tones range) pairs of the
+        intervals over the bass note.
+
+    Examples
+    --------
+    >>> my_signature = ChordSignature('C3', ((4, 2), (7, 4)))
+    >>> my_signature.chord().has_type(ChordsTypes.MAJOR_TRIAD)
+    True
+    >>> my_signature == chord(['C3', 'E3', 'G4']).signature()
+    True
+    """
+    __slots__ = ()
+
+    def __new__(cls, bass_note_name, intervals_codes):
+        """ Builds an instance of ChordSignature """
+        return tuple.__new__(cls, (bass_note_name, intervals_codes))
+
+    def bass_note_name(self):
+        """ Returns the name of the chord's bass note """
+        return self[0]
+
+    def intervals_codes(self):
+        """ Returns the (number of semitones, tones range) pairs of the chord's intervals """
+        return self[1]
+
+    def root_note(self):
+        """ Returns the chord's root (bass) note """
+        return note(self[0])
+
+    def intervals(self):
+        """ Returns a list containing the chord's intervals """
+        return [Interval(n_semitones, tones_range) for (n_semitones, tones_range) in self[1]]
+
+    def chord(self):
+        """ Returns the instance of Chord described by the signature """
+        return Chord(root_note = self.root_note(), chord_intervals = self.intervals(), signature = self)
 
 
 class Chord:
@@ -818,10 +916,18 @@ class Chord:
     >>> my_chord.has_type(ChordsTypes.MINOR_TRIAD)
     False
     """
-    def __init__(self, root_note, chord_intervals):
+    def __init__(self, root_note, chord_intervals, signature = None):
         """ Builds an instance of class Chord """
         self._root_note = root_note
         self._intervals = chord_intervals
+        self._signature = signature
+
+    def signature(self):
+        """ Returns the chord's canonical signature as an instance of ChordSignature """
+        if self._signature == None:
+            intervals_codes = tuple(sorted([(interval.count_semitones(), interval.tones_range()) for interval in self._intervals]))
+            self._signature = ChordSignature(self._root_note.name(), intervals_codes)
+        return self._signature
 
     def intervals(self):
         """ Returns a list containing the chord's intervals """
@@ -939,11 +1045,97 @@ class ChordExplorer:
     """
     def __init__(self, explored_chord):
         """  """
-        self._chords = [explored_chord] + inversed_chords(explored_chord)
+        self._chord = explored_chord
 
     def possible_harmonic_properties(self):
         """  """
-        return list(chain(*[StaticChordExplorer(chord).possible_harmonic_properties() for chord in self._chords]))
+        # Copies, so that callers modifying them leave the cache untouched
+        return [ChordHarmonicProperties(properties.tonality(), properties.base_type(), list(properties.enrichments()))
+                for properties in _signature_harmonic_properties(self._chord.signature())]
+
+
+"""
+Harmonic properties of chords are cached by chord signature, the least
+recently used signatures being evicted past CHORDS_CACHE_SIZE entries.
+Dictionaries keep insertion order: a signature is moved to the end of
+the cache each time it is used. Signatures missing from the cache are
+looked up with the functions added by add_harmonic_properties_lookup
+before being analyzed.
+"""
+CHORDS_CACHE_SIZE = 1 << 16
+_HARMONIC_PROPERTIES_CACHE = {}
+_HARMONIC_PROPERTIES_LOOKUPS = []
+
+
+def _signature_harmonic_properties(signature):
+    """ Returns the harmonic properties of a chord and its inversions, cached by chord signature """
+    harmonic_properties = _HARMONIC_PROPERTIES_CACHE.pop(signature, None)
+    for lookup in _HARMONIC_PROPERTIES_LOOKUPS:
+        if harmonic_properties != None:
+            break
+        harmonic_properties = lookup(signature)
+    if harmonic_properties == None:
+        explored_chord = signature.chord()
+        explored_chords = [explored_chord] + inversed_chords(explored_chord)
+        harmonic_properties = tuple(chain(*[StaticChordExplorer(chord).possible_harmonic_properties() for chord in explored_chords]))
+    cache_harmonic_properties(signature, harmonic_properties)
+    return harmonic_properties
+
+
+def cache_harmonic_properties(signature, harmonic_properties):
+    """
+    Caches the harmonic properties of a chord signature.
+
+    Parameters
+    ----------
+    signature : ChordSignature
+        The signature of the chord.
+    harmonic_properties : tuple of ChordHarmonicProperties
+        Harmonic properties of the chord and its inversions, as listed
+        by ChordExplorer.possible_harmonic_properties.
+
+    See Also
+    --------
+    cached_harmonic_properties : Returns the cached harmonic properties.
+
+    Examples
+    --------
+    >>> signature = chord_signature(['C3', 'E3', 'G3'])
+    >>> cache_harmonic_properties(signature, tuple(chord_explorer(['C3', 'E3', 'G3']).possible_harmonic_properties()))
+    """
+    _HARMONIC_PROPERTIES_CACHE[signature] = harmonic_properties
+    while len(_HARMONIC_PROPERTIES_CACHE) > CHORDS_CACHE_SIZE:
+        _HARMONIC_PROPERTIES_CACHE.pop(next(iter(_HARMONIC_PROPERTIES_CACHE)), None)
+
+
+def add_harmonic_properties_lookup(lookup):
+    """
+    Adds a function harmonic properties of chords missing from the
+    cache are looked up with.
+
+    Parameters
+    ----------
+    lookup : function
+        Called with the ChordSignature of a chord missing from the
+        cache, returns its harmonic properties as a tuple of
+        ChordHarmonicProperties, or None if it does not hold them.
+
+    Examples
+    --------
+    >>> add_harmonic_properties_lookup(shared_harmonic_properties)
+    """
+    if lookup not in _HARMONIC_PROPERTIES_LOOKUPS:
+        _HARMONIC_PROPERTIES_LOOKUPS.append(lookup)
+
+
+def cached_harmonic_properties():
+    """ Returns the cached (signature, harmonic properties) pairs, least recently used first """
+    return list(_HARMONIC_PROPERTIES_CACHE.items())
+
+
+def clear_harmonic_properties_cache():
+    """ Empties the cache of harmonic properties """
+    _HARMONIC_PROPERTIES_CACHE.clear()
 
 
 class StaticChordExplorer:
@@ -1061,6 +1253,179 @@ class ChordHarmonicProperties:
             return False
 
 
+"""
+Codes of tonalities, chords types and intervals types used by compact
+harmonic properties: each one is refered to by its index in the lists
+below.
+"""
+TONALITIES = [tone + alteration for tone in VALID_TONES for alteration in VALID_ALTERATIONS]
+CHORDS_TYPES = list(ChordsTypes)
+INTERVALS_TYPES = list(IntervalsTypes)
+_TONALITIES_CODES = {tonality: code for (code, tonality) in enumerate(TONALITIES)}
+_CHORDS_TYPES_CODES = {chord_type: code for (code, chord_type) in enumerate(CHORDS_TYPES)}
+_INTERVALS_TYPES_CODES = {interval_type: code for (code, interval_type) in enumerate(INTERVALS_TYPES)}
+_ENRICHMENTS_ORDER = sorted(IntervalsTypes, key = lambda interval_type: interval_type.value)
+
+
+def enrichments_mask(enrichments):
+    """
+    Returns a list of intervals types as a bitmask.
+
+    Parameters
+    ----------
+    enrichments : list of fields of enum IntervalsTypes
+        The encoded intervals types.
+
+    Returns
+    -------
+    out : int
+        Bitmask where bit i is set if INTERVALS_TYPES[i] belongs to
+        enrichments.
+
+    Examples
+    --------
+    >>> bin(enrichments_mask([IntervalsTypes.NINTH, IntervalsTypes.FOURTH]))
+    '0b100000010'
+    """
+    mask = 0
+    for interval_type in enrichments:
+        mask |= 1 << _INTERVALS_TYPES_CODES[interval_type]
+    return mask
+
+
+def mask_enrichments(mask):
+    """
+    Returns the intervals types encoded in a bitmask.
+
+    Parameters
+    ----------
+    mask : int
+        Bitmask where bit i is set if INTERVALS_TYPES[i] is encoded.
+
+    Returns
+    -------
+    out : list of fields of enum IntervalsTypes
+        The encoded intervals types, sorted as the intervals of a
+        chord are.
+
+    Examples
+    --------
+    >>> [interval_type.name for interval_type in mask_enrichments(0b100000010)]
+    ['NINTH', 'FOURTH']
+    """
+    return [interval_type for interval_type in _ENRICHMENTS_ORDER if (mask >> _INTERVALS_TYPES_CODES[interval_type]) & 1]
+
+
+def compact_harmonic_properties(chord_properties):
+    """
+    Returns the compact equivalent of a ChordHarmonicProperties.
+
+    Parameters
+    ----------
+    chord_properties : ChordHarmonicProperties
+        The converted instance.
+
+    Returns
+    -------
+    out : CompactChordHarmonicProperties
+        An immutable and hashable instance with the same tonality,
+        base type and enrichments.
+
+    See Also
+    --------
+    CompactChordHarmonicProperties : a compact container class that
+        describes harmonic properties of chords.
+
+    Examples
+    --------
+    >>> chord_properties = ChordHarmonicProperties('F#', ChordsTypes.MAJOR_TRIAD, [IntervalsTypes.FOURTH])
+    >>> compact_harmonic_properties(chord_properties) == chord_properties
+    True
+    """
+    return CompactChordHarmonicProperties(
+    tonality_code     = _TONALITIES_CODES[chord_properties.tonality()],
+    base_type_code    = _CHORDS_TYPES_CODES[chord_properties.base_type()],
+    enrichments_code  = enrichments_mask(chord_properties.enrichments())
+    )
+
+
+class CompactChordHarmonicProperties(tuple):
+    """
+    A compact container class that describes harmonic properties of
+    chords.
+
+    The tonality, base type and enrichments are stored as a tuple of
+    three small ints: indices in TONALITIES and CHORDS_TYPES, and a
+    bitmask over INTERVALS_TYPES. Instances are immutable, hashable
+    and compared in constant time. Repeated enrichments, which only
+    happen with IntervalsTypes.UNKNOWN, are stored once.
+
+    Parameters
+    ----------
+    tonality_code : int
+        Index of the tonality in TONALITIES.
+    base_type_code : int
+        Index of the base type in CHORDS_TYPES.
+    enrichments_code : int
+        Bitmask of the enrichments, as returned by enrichments_mask.
+
+    Examples
+    --------
+
+    Build the properties of an F#sus4
+    >>> chord_properties = compact_harmonic_properties(ChordHarmonicProperties('F#', ChordsTypes.MAJOR_TRIAD, [IntervalsTypes.FOURTH]))
+
+    Show chord's tonality and base type
+    >>> chord_properties.tonality(), chord_properties.base_type().name
+    ('F#', 'MAJOR_TRIAD')
+
+    Use as a dictionary key
+    >>> {chord_properties: 'F#sus4'}[chord_properties]
+    'F#sus4'
+    """
+    __slots__ = ()
+
+    def __new__(cls, tonality_code, base_type_code, enrichments_code):
+        """ Builds an instance of CompactChordHarmonicProperties """
+        return tuple.__new__(cls, (tonality_code, base_type_code, enrichments_code))
+
+    def __repr__(self):
+        """ Returns a readable representation of the properties """
+        return 'CompactChordHarmonicProperties({!r}, {}, {})'.format(self.tonality(), self.base_type().name, [e.name for e in self.enrichments()])
+
+    def tonality_code(self):
+        """ Returns the index of the tonality in TONALITIES """
+        return self[0]
+
+    def base_type_code(self):
+        """ Returns the index of the base type in CHORDS_TYPES """
+        return self[1]
+
+    def enrichments_code(self):
+        """ Returns the bitmask of the enrichments """
+        return self[2]
+
+    def tonality(self):
+        """ Returns the tonality of the chord """
+        return TONALITIES[self[0]]
+
+    def base_type(self):
+        """ Returns chord's base type as refered in ChordsTypes """
+        return CHORDS_TYPES[self[1]]
+
+    def enrichments(self):
+        """ Returns the chord's list of enrichments """
+        return mask_enrichments(self[2])
+
+    def count_enrichments(self):
+        """ Returns the number of enrichments in the chord """
+        return bin(self[2]).count('1')
+
+    def expanded(self):
+        """ Returns the equivalent instance of ChordHarmonicProperties """
+        return ChordHarmonicProperties(self.tonality(), self.base_type(), self.enrichments())
+
+
 def _keyboard_to_possible_notes_names(i_note):
     """
     Returns all notes names corresponding to a keyboard note index.
@@ -1085,7 +1450,418 @@ def _keyboard_to_possible_notes_names(i_note):
     >>> _keyboard_to_possible_notes_names(43)
     ['E4', 'Fb4']
     """
-    return [key for key in notes_references.keys() if notes_references[key] == i_note]
+    return list(_KEYBOARD_TO_NOTES_NAMES.get(i_note, []))
+
+
+"""
+Inverse of dictionary notes_references: keyboard's keys indices are
+mapped to all the names of the notes they can be spelled with.
+"""
+_KEYBOARD_TO_NOTES_NAMES = {}
+for _note_name, _i_note in notes_references.items():
+    _KEYBOARD_TO_NOTES_NAMES.setdefault(_i_note, []).append(_note_name)
+
+
+N_SEMITONES_IN_OCTAVE = 12
+PITCH_CLASSES_TONALITIES = ['C', 'C#', 'D', 'Eb', 'E', 'F', 'F#', 'G', 'Ab', 'A', 'Bb', 'B']
+MINOR_KEY_SUFFIX = 'm'
+
+
+def pitch_class(i_note):
+    """
+    Returns the pitch class of a keyboard note index.
+
+    Parameters
+    ----------
+    i_note : int in [0 - 88]
+        note index on keyboard.
+
+    Returns
+    -------
+    out : int in [0 - 11]
+        The pitch class of i_note, C being refered to as 0.
+
+    Examples
+    --------
+    >>> pitch_class(39) # C4
+    0
+    >>> pitch_class(48) # A4
+    9
+    """
+    return (i_note - notes_references['C4']) % N_SEMITONES_IN_OCTAVE
+
+
+def tonality_pitch_class(tonality):
+    """
+    Returns the pitch class of a tonality.
+
+    Parameters
+    ----------
+    tonality : list of one or two chars
+        Tonality in english notation, not related to an octave.
+
+    Returns
+    -------
+    out : int in [0 - 11]
+        The pitch class of tonality, C being refered to as 0.
+
+    Examples
+    --------
+    >>> tonality_pitch_class('Eb')
+    3
+    >>> tonality_pitch_class('B#')
+    0
+    """
+    return pitch_class(notes_references[tonality + '4'])
+
+
+def pitch_classes_mask(i_notes_on_keyboard):
+    """
+    Returns the pitch classes of keyboard notes indices as a bitmask.
+
+    Parameters
+    ----------
+    i_notes_on_keyboard : list of int
+        Keyboard notes indices
+
+    Returns
+    -------
+    out : int in [0 - 4095]
+        Bitmask where bit i is set if pitch class i is played.
+
+    Examples
+    --------
+    >>> bin(pitch_classes_mask([27, 31, 34, 39])) # C3, E3, G3, C4
+    '0b10010001'
+    """
+    mask = 0
+    for i_note in i_notes_on_keyboard:
+        mask |= 1 << pitch_class(i_note)
+    return mask
+
+
+def chord_type_mask(chord_type, root_pitch_class = 0):
+    """
+    Returns the pitch classes of a chord type as a bitmask.
+
+    Parameters
+    ----------
+    chord_type : one field among enum ChordsTypes
+        The chord type of which the pitch classes are requested.
+    root_pitch_class : int in [0 - 11], optional
+        Overrides the default C root. Pitch class of the chord's root.
+
+    Returns
+    -------
+    out : int in [0 - 4095]
+        Bitmask where bit i is set if pitch class i belongs to the
+        chord type built over root_pitch_class.
+
+    Examples
+    --------
+    >>> bin(chord_type_mask(ChordsTypes.MAJOR_TRIAD))
+    '0b10010001'
+    >>> bin(chord_type_mask(ChordsTypes.POWER_CHORD, root_pitch_class = 2))
+    '0b1000000100'
+    """
+    mask = 1 << root_pitch_class
+    for interval_type in chord_type.value:
+        mask |= 1 << ((root_pitch_class + interval_type.value.count_semitones()) % N_SEMITONES_IN_OCTAVE)
+    return mask
+
+
+def chord_properties_mask(chord_properties):
+    """
+    Returns the pitch classes of a chord's harmonic properties as a
+    bitmask.
+
+    Parameters
+    ----------
+    chord_properties : ChordHarmonicProperties
+        The properties of the chord.
+
+    Returns
+    -------
+    out : int in [0 - 4095]
+        Bitmask where bit i is set if pitch class i belongs to the
+        chord's base type or enrichments. UNKNOWN enrichments are
+        ignored.
+
+    Examples
+    --------
+    >>> bin(chord_properties_mask(ChordHarmonicProperties('D', ChordsTypes.MAJOR_TRIAD, [IntervalsTypes.FOURTH]))) # D, F#, G, A
+    '0b1011000100'
+    """
+    root_pitch_class = tonality_pitch_class(chord_properties.tonality())
+    mask = chord_type_mask(chord_properties.base_type(), root_pitch_class)
+    for interval_type in chord_properties.enrichments():
+        if interval_type != IntervalsTypes.UNKNOWN:
+            mask |= 1 << ((root_pitch_class + interval_type.value.count_semitones()) % N_SEMITONES_IN_OCTAVE)
+    return mask
+
+
+def _key_spelling(key):
+    """
+    Returns the tonalities used to spell each pitch class in a key.
+
+    Parameters
+    ----------
+    key : list of one to three chars
+        Tonic of the key in english notation. Minor keys are followed
+        by MINOR_KEY_SUFFIX.
+
+    Returns
+    -------
+    out : list of twelve tonalities
+        The i-th element is the tonality used to spell pitch class i
+        in key. Diatonic notes are spelled along the scale, other ones
+        are raised in sharp keys and lowered in flat keys.
+
+    Examples
+    --------
+    >>> _key_spelling('E')[8]
+    'G#'
+    >>> _key_spelling('Eb')[8]
+    'Ab'
+    >>> _key_spelling('Am')[8] # leading tone of the harmonic minor
+    'G#'
+    """
+    is_minor = key.endswith(MINOR_KEY_SUFFIX)
+    tonic = key[:-1] if is_minor else key
+    scale_semitones = [0, 2, 3, 5, 7, 8, 10] if is_minor else [0, 2, 4, 5, 7, 9, 11]
+    i_tonic_tone, tonic_pitch_class = VALID_TONES.index(tonic[0]), tonality_pitch_class(tonic)
+    spelling = [None] * N_SEMITONES_IN_OCTAVE
+    for i_degree, n_semitones in enumerate(scale_semitones):
+        tone = VALID_TONES[(i_tonic_tone + i_degree) % len(VALID_TONES)]
+        spelling[(tonic_pitch_class + n_semitones) % N_SEMITONES_IN_OCTAVE] = _altered_tonality(tone, tonic_pitch_class + n_semitones)
+    if is_minor:
+        leading_tone = VALID_TONES[(i_tonic_tone + len(VALID_TONES) - 1) % len(VALID_TONES)]
+        spelling[(tonic_pitch_class - 1) % N_SEMITONES_IN_OCTAVE] = _altered_tonality(leading_tone, tonic_pitch_class - 1)
+    alterations = [tonality[1:] for tonality in spelling if tonality != None and len(tonality) > 1]
+    for i_pitch_class in range(N_SEMITONES_IN_OCTAVE):
+        if spelling[i_pitch_class] == None and len(alterations) == 0:
+            spelling[i_pitch_class] = PITCH_CLASSES_TONALITIES[i_pitch_class]
+        elif spelling[i_pitch_class] == None:
+            spelling[i_pitch_class] = _chromatic_tonality(i_pitch_class, 'b' if 'b' in alterations else '#')
+    return spelling
+
+
+def _altered_tonality(tone, i_pitch_class):
+    """ Returns the tonality of pitch class i_pitch_class spelled with tone, if a single alteration is enough """
+    alteration_semitones = (i_pitch_class - tonality_pitch_class(tone) + 1) % N_SEMITONES_IN_OCTAVE - 1
+    if alteration_semitones not in [-1, 0, 1]:
+        return PITCH_CLASSES_TONALITIES[i_pitch_class % N_SEMITONES_IN_OCTAVE]
+    return tone + {-1: 'b', 0: '', 1: '#'}[alteration_semitones]
+
+
+def _chromatic_tonality(i_pitch_class, preferred_alteration):
+    """ Returns the tonality of a pitch class out of a key, natural tones first """
+    candidates = VALID_TONES + [tone + preferred_alteration for tone in VALID_TONES]
+    return [tonality for tonality in candidates if tonality_pitch_class(tonality) == i_pitch_class][0]
+
+
+class LazyTable(dict):
+    """
+    A dictionary whose entries are built on first access.
+
+    Heavyweight tables are not built when the module is imported: an
+    entry is computed the first time it is looked up, and the whole
+    table the first time it is iterated over. Entries can also be
+    loaded from a prebuilt file with load_prebuilt_tables.
+
+    Parameters
+    ----------
+    keys : list
+        The keys of the table.
+    builder : function
+        Returns the value of a key.
+
+    Examples
+    --------
+    >>> squares = LazyTable(range(4), lambda key: key * key)
+    >>> len(dict.keys(squares)), squares[3], len(dict.keys(squares))
+    (0, 9, 1)
+    """
+    def __init__(self, keys, builder):
+        """ Builds an instance of LazyTable """
+        dict.__init__(self)
+        self._keys = list(keys)
+        self._valid_keys = set(self._keys)
+        self._builder = builder
+
+    def __missing__(self, key):
+        """ Builds, stores and returns the value of a key of the table """
+        if key not in self._valid_keys:
+            raise KeyError(key)
+        value = self._builder(key)
+        dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default = None):
+        """ Returns the value of a key, default if it is not in the table """
+        return self[key] if key in self._valid_keys else default
+
+    def built(self):
+        """ Builds all the entries of the table and returns it """
+        for key in self._keys:
+            if not dict.__contains__(self, key):
+                self.__missing__(key)
+        return self
+
+    def __contains__(self, key):
+        """ Returns True if key is in the table """
+        return key in self._valid_keys
+
+    def __iter__(self):
+        """ Iterates over the keys of the table """
+        return iter(self._keys)
+
+    def __len__(self):
+        """ Returns the number of keys of the table """
+        return len(self._keys)
+
+    def keys(self):
+        """ Returns the keys of the table """
+        return self._keys
+
+    def values(self):
+        """ Returns the values of the table, building all of them """
+        return [self[key] for key in self._keys]
+
+    def items(self):
+        """ Returns the (key, value) pairs of the table, building all of them """
+        return [(key, self[key]) for key in self._keys]
+
+
+"""
+Dictionary KEYS_SPELLINGS gathers the spelling of each pitch class for
+every major and minor key. The spelling of a key is computed on first
+use so that spelling a note within a key is then a single lookup.
+"""
+SPELLED_KEYS = [tonic + suffix for tonic in TONALITIES for suffix in ['', MINOR_KEY_SUFFIX]]
+KEYS_SPELLINGS = LazyTable(SPELLED_KEYS, _key_spelling)
+
+
+"""
+Tables built on first use, by name in prebuilt files.
+"""
+LAZY_TABLES = {'keys_spellings': KEYS_SPELLINGS}
+PREBUILT_TABLES_FORMAT = 1
+
+
+def save_prebuilt_tables(path):
+    """
+    Builds all the lazy tables and saves them into a file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the JSON file the tables are written to.
+
+    See Also
+    --------
+    load_prebuilt_tables : Loads lazy tables from a file.
+
+    Examples
+    --------
+    >>> save_prebuilt_tables('theory_tables.json')
+    """
+    import json
+    tables = {name: [[key, value] for (key, value) in lazy_table.built().items()] for (name, lazy_table) in LAZY_TABLES.items()}
+    with open(path, 'w') as tables_file:
+        json.dump({'format': PREBUILT_TABLES_FORMAT, 'tables': tables}, tables_file)
+
+
+def load_prebuilt_tables(path):
+    """
+    Loads lazy tables from a file, so that their entries are not
+    built on first use.
+
+    Parameters
+    ----------
+    path : str
+        Path of a JSON file written by save_prebuilt_tables.
+
+    Raises
+    ------
+    ValueError
+        If the file was written in another format, or holds keys that
+        are not keys of the tables.
+
+    Examples
+    --------
+    >>> load_prebuilt_tables('theory_tables.json')
+    >>> KEYS_SPELLINGS['Am'][8]
+    'G#'
+    """
+    import json
+    with open(path) as tables_file:
+        prebuilt = json.load(tables_file)
+    if prebuilt.get('format') != PREBUILT_TABLES_FORMAT:
+        raise ValueError('Unsupported prebuilt tables format: ' + path)
+    for (name, entries) in prebuilt['tables'].items():
+        lazy_table = LAZY_TABLES[name]
+        if any([key not in lazy_table for (key, _) in entries]):
+            raise ValueError('Prebuilt table {} holds unknown keys: {}'.format(name, path))
+        for (key, value) in entries:
+            dict.__setitem__(lazy_table, key, value)
+
+
+def _keyboard_to_key_notes_names(i_note, key):
+    """
+    Returns the notes names corresponding to a keyboard note index
+    spelled within a key.
+
+    Parameters
+    ----------
+    i_note : int in [0 - 88]
+        note index on keyboard.
+    key : list of one to three chars
+        Tonic of the key in english notation. Minor keys are followed
+        by MINOR_KEY_SUFFIX.
+
+    Returns
+    -------
+    out : List of two or three chars
+        The name of the note spelled in key. All possible names are
+        returned if the spelling of the key is not available.
+
+    Examples
+    --------
+    >>> _keyboard_to_key_notes_names(38, 'C')
+    ['B3']
+    >>> _keyboard_to_key_notes_names(38, 'Gb')
+    ['Cb3']
+    """
+    possible_notes_names = _keyboard_to_possible_notes_names(i_note)
+    key_tonality = KEYS_SPELLINGS[key][pitch_class(i_note)]
+    spelled_notes_names = [name for name in possible_notes_names if name[:-1] == key_tonality]
+    return spelled_notes_names if len(spelled_notes_names) > 0 else possible_notes_names
+
+
+def chord_properties_key(chord_properties):
+    """
+    Returns the key suggested by a chord, so that it can be used as a
+    context to spell the next one.
+
+    Parameters
+    ----------
+    chord_properties : ChordHarmonicProperties
+        The properties of the context chord.
+
+    Returns
+    -------
+    out : list of one to three chars
+        The key whose tonic is the chord's tonality, minor if the
+        chord's base type contains a minor third.
+
+    Examples
+    --------
+    >>> chord_properties_key(ChordHarmonicProperties('F#', ChordsTypes.MINOR_SEVENTH, []))
+    'F#m'
+    """
+    is_minor = IntervalsTypes.MINOR_THIRD in chord_properties.base_type().value
+    return chord_properties.tonality() + (MINOR_KEY_SUFFIX if is_minor else '')
 
 
 class KeyboardToHarmonicPropertiesTranslator:
@@ -1097,6 +1873,9 @@ class KeyboardToHarmonicPropertiesTranslator:
     ----------
     i_notes_on_keyborad : list of intergers in range(0, 88)
         List of notes indices on kyboard composing a chord.
+    key : list of one to three chars, optional
+        Key used to spell the notes, as refered to in KEYS_SPELLINGS.
+        All possible spellings are explored if key is None.
 
     Examples
     --------
@@ -1135,12 +1914,15 @@ class KeyboardToHarmonicPropertiesTranslator:
     Base type  : UNKNOWN
     Enrichments: ['DIMINISHED_FOURTH', 'FIFTH']
     """
-    def __init__(self, i_notes_on_keyboard):
+    def __init__(self, i_notes_on_keyboard, key = None):
         """ Builds an instance of KeyboardToHarmonicPropertiesTranslator """
         self._i_notes = i_notes_on_keyboard
+        self._key = key
 
     def possible_notes_names_lists(self):
         """ Returns all possible notes names corresponding to each note index """
+        if self._key != None:
+            return [_keyboard_to_key_notes_names(i_note, self._key) for i_note in self._i_notes]
         return [_keyboard_to_possible_notes_names(i_note) for i_note in self._i_notes]
 
     def possible_chords(self):
@@ -1153,6 +1935,12 @@ class KeyboardToHarmonicPropertiesTranslator:
         possible_chords = self.possible_chords()
         return reduce(add, [ChordExplorer(chord).possible_harmonic_properties() for chord in possible_chords])
 
+    def iter_harmonic_properties(self):
+        """ Yields possible ChordHarmonicProperties one by one, without building the whole list """
+        for notes_names in product(*self.possible_notes_names_lists()):
+            for harmonic_properties in ChordExplorer(chord(notes_names)).possible_harmonic_properties():
+                yield harmonic_properties
+
 
 def has_known_base_type(chord_properties):
     """
@@ -1397,7 +2185,7 @@ def guess_most_likely_harmonic_properties(chords_properties):
     return properties_filter.filtered()
 
 
-def keyboard_to_chord_properties(i_notes_on_keyboard):
+def keyboard_to_chord_properties(i_notes_on_keyboard, key = None):
     """
     Transforms a list of keyboard notes indices into the most likely
     ChordHarmonicProperties if it exists.
@@ -1406,6 +2194,11 @@ def keyboard_to_chord_properties(i_notes_on_keyboard):
     ----------
     i_notes_on_keyboard : list of int
         Keyboard notes indices
+    key : list of one to three chars, optional
+        Key used to spell the notes, for instance the key signature
+        or chord_properties_key(previous_chord_properties). Providing
+        it collapses the spelling search to a single spelling in most
+        cases. All spellings are explored if key is None.
 
     Returns
     -------
@@ -1422,8 +2215,10 @@ def keyboard_to_chord_properties(i_notes_on_keyboard):
     MAJOR_TRIAD
     >>> [i.name for i in chord_properties.enrichments()]
     ['FOURTH']
+    >>> keyboard_to_chord_properties([38, 42, 45], key = 'E').tonality()
+    'B'
     """
-    all_possible = KeyboardToHarmonicPropertiesTranslator(i_notes_on_keyboard).possible_harmonic_properties()
+    all_possible = KeyboardToHarmonicPropertiesTranslator(i_notes_on_keyboard, key).possible_harmonic_properties()
     most_likely = guess_most_likely_harmonic_properties(all_possible)
     bass_tonalities = [n.tone() for n in notes(_keyboard_to_possible_notes_names(min(i_notes_on_keyboard)))]
     fundamentals = list(filter(lambda properties: properties.tonality() in bass_tonalities, most_likely))
@@ -1436,6 +2231,118 @@ def keyboard_to_chord_properties(i_notes_on_keyboard):
         return None
 
 
+KNOWN_BASE_TYPE_SCORE   = 4.
+VALID_ENRICHMENTS_SCORE = 2.
+ENRICHMENT_SCORE        = -1.
+ROOT_POSITION_SCORE     = .5
+def harmonic_properties_score(chord_properties, bass_tonalities):
+    """
+    Returns the plausibility of a ChordHarmonicProperties.
+
+    Parameters
+    ----------
+    chord_properties : ChordHarmonicProperties
+        The scored instance of ChordHarmonicProperties.
+    bass_tonalities : list of one or two chars
+        Tonalities the bass note of the chord can be spelled with.
+
+    Returns
+    -------
+    out : float
+        The plausibility of chord_properties. A known base type,
+        valid enrichments and a root position increase the score,
+        each enrichment decreases it.
+
+    See Also
+    --------
+    keyboard_to_top_chord_properties : Returns the k most plausible
+        ChordHarmonicProperties of a list of keyboard notes indices.
+
+    Examples
+    --------
+    >>> harmonic_properties_score(ChordHarmonicProperties('C', ChordsTypes.MAJOR_TRIAD, []), ['C', 'B#'])
+    6.5
+    >>> harmonic_properties_score(ChordHarmonicProperties('C', ChordsTypes.POWER_CHORD, [IntervalsTypes.MAJOR_THIRD]), ['C', 'B#'])
+    3.5
+    """
+    score = ENRICHMENT_SCORE * chord_properties.count_enrichments()
+    score += KNOWN_BASE_TYPE_SCORE if has_known_base_type(chord_properties) else 0.
+    score += VALID_ENRICHMENTS_SCORE if has_valid_enrichments(chord_properties) else 0.
+    score += ROOT_POSITION_SCORE if chord_properties.tonality() in bass_tonalities else 0.
+    return score
+
+
+DEFAULT_N_CANDIDATES = 3
+def keyboard_to_top_chord_properties(i_notes_on_keyboard, k = DEFAULT_N_CANDIDATES, key = None):
+    """
+    Transforms a list of keyboard notes indices into the k most
+    plausible ChordHarmonicProperties, with their scores.
+
+    Candidates are scored while they are generated and only the best
+    k of them are kept in a bounded heap, so that the whole list of
+    candidates is neither stored nor sorted. Duplicates are only
+    checked against the candidates in the heap.
+
+    Parameters
+    ----------
+    i_notes_on_keyboard : list of int
+        Keyboard notes indices
+    k : int, optional
+        Overrides DEFAULT_N_CANDIDATES. Maximum number of returned
+        candidates.
+    key : list of one to three chars, optional
+        Key used to spell the notes, as in keyboard_to_chord_properties.
+
+    Returns
+    -------
+    out : list of tuples (float, ChordHarmonicProperties)
+        Distinct candidates sorted by decreasing score. Candidates
+        with equal scores keep their generation order.
+
+    See Also
+    --------
+    harmonic_properties_score : Returns the plausibility of a
+        ChordHarmonicProperties.
+
+    Examples
+    --------
+    >>> for score, p in keyboard_to_top_chord_properties([27, 31, 34, 38], k = 2):
+    ...     print(score, p.tonality(), p.base_type().name)
+    6.5 C MAJOR_SEVENTH
+    5.0 E MINOR_TRIAD
+    """
+    if k <= 0:
+        return []
+    bass_tonalities = _bass_tonalities(i_notes_on_keyboard)
+    translator = KeyboardToHarmonicPropertiesTranslator(i_notes_on_keyboard, key)
+    best_candidates, heap_candidates_ids = [], {}
+    for i_candidate, candidate in enumerate(translator.iter_harmonic_properties()):
+        # A duplicate scores as its first occurrence, generated before it: it can only replace it if it is in the heap
+        candidate_id = _harmonic_properties_id(candidate)
+        if candidate_id in heap_candidates_ids:
+            continue
+        heap_item = (harmonic_properties_score(candidate, bass_tonalities), -i_candidate, candidate)
+        if len(best_candidates) < k:
+            heapq.heappush(best_candidates, heap_item)
+        elif heap_item[:2] > best_candidates[0][:2]:
+            _, _, replaced_candidate = heapq.heapreplace(best_candidates, heap_item)
+            del heap_candidates_ids[_harmonic_properties_id(replaced_candidate)]
+        else:
+            continue
+        heap_candidates_ids[candidate_id] = i_candidate
+    return [(score, candidate) for (score, _, candidate) in sorted(best_candidates, key = lambda item: item[:2], reverse = True)]
+
+
+def _harmonic_properties_id(chord_properties):
+    """ Returns a hashable identifier of a ChordHarmonicProperties """
+    return (chord_properties.tonality(), chord_properties.base_type(), tuple(chord_properties.enrichments()))
+
+
+def _bass_tonalities(i_notes_on_keyboard):
+    """ Returns the tonalities the bass note of keyboard notes indices can be spelled with """
+    return [n.tonality() for n in notes(_keyboard_to_possible_notes_names(min(i_notes_on_keyboard)))]
+
+
 def count_inversions(base_chord):
     """
     Returns the number of possible inversions of base_chord.
@@ -0,0 +1,288 @@
+import heapq
+from functools import lru_cache, partial
+from itertools import product
+
+import numpy as np
+
+from instruments import MUTED, strings_instrument
+from keyboard import notes_references
+from set_classes import N_PITCH_CLASSES_SETS
+from shape_atlas import DEFAULT_N_FRETS, DEFAULT_SPAN, position_voicings
+from theory import _keyboard_to_possible_notes_names, chord_properties_mask, pitch_class
+
+
+"""
+The difficulty of a fingering adds up the stretch of the hand between
+its lowest and highest fretted notes, the number of fretted strings and
+the position of the hand on the neck, each one weighted below.
+"""
+STRETCH_WEIGHT = 1.
+FRETTED_STRING_WEIGHT = 1.
+POSITION_WEIGHT = .25
+DEFAULT_MAX_SHIFT = 2
+DEFAULT_N_RESULTS = 5
+EVALUATION_BATCH_SIZE = 64
+
+
+def fingering_difficulties(frets):
+    """
+    Returns the difficulty of fret vectors.
+
+    Parameters
+    ----------
+    frets : numpy array of shape (n_voicings, n_strings)
+        Frets of each voicing, muted strings being set to MUTED.
+
+    Returns
+    -------
+    out : numpy array of n_voicings floats
+        STRETCH_WEIGHT times the number of frets between the lowest and
+        highest fretted notes, plus FRETTED_STRING_WEIGHT times the
+        number of fretted strings, plus POSITION_WEIGHT times the lowest
+        fretted fret. Open and muted strings cost nothing.
+
+    Examples
+    --------
+    >>> fingering_difficulties(np.array([[MUTED, 3, 2, 0, 1, 0], [0, 0, 0, 0, 0, 0]]))
+    array([5.25, 0.  ])
+    """
+    is_fretted = frets > 0
+    highest_frets = np.where(is_fretted, frets, 0).max(axis = 1)
+    lowest_frets = np.where(is_fretted, frets, highest_frets[:, np.newaxis]).min(axis = 1)
+    return STRETCH_WEIGHT * (highest_frets - lowest_frets) + FRETTED_STRING_WEIGHT * np.count_nonzero(is_fretted, axis = 1) + POSITION_WEIGHT * lowest_frets
+
+
+@lru_cache(maxsize = None)
+def _easiest_first_fingerings(n_strings, span, n_frets):
+    """ Returns every fret vector within span on n_strings strings, easiest first, and their difficulties """
+    instrument = strings_instrument(['A0'] * n_strings) # fret vectors do not depend on the tuning
+    frets = np.concatenate([position_voicings(instrument, position, span, n_frets, min_sounding_strings = 1) for position in range(1, n_frets + 1)])
+    difficulties = fingering_difficulties(frets)
+    order = np.argsort(difficulties, kind = 'stable')
+    return frets[order], difficulties[order]
+
+
+def tuning_position_index(instrument, span = DEFAULT_SPAN, n_frets = DEFAULT_N_FRETS):
+    """
+    Returns an instance of class TuningPositionIndex.
+
+    Parameters
+    ----------
+    instrument : StringsInstrument
+        The instrument, that is the tuning, the index is built for.
+    span : int, optional
+        Overrides DEFAULT_SPAN. Number of frets under the hand.
+    n_frets : int, optional
+        Overrides DEFAULT_N_FRETS. Highest fret of the instrument.
+
+    Returns
+    -------
+    out : TuningPositionIndex
+        The instance of class TuningPositionIndex of the instrument.
+
+    See Also
+    --------
+    TuningPositionIndex : a class that finds the easiest fingering of
+        each pitch classes set on a tuning.
+
+    Examples
+    --------
+    >>> index = tuning_position_index(guitar())
+    >>> index.voicing(chord_properties_mask(ChordHarmonicProperties('E', ChordsTypes.MINOR_TRIAD, [])))
+    [None, None, None, 0, 0, 0]
+    """
+    frets, difficulties = _easiest_first_fingerings(instrument.count_strings(), span, n_frets)
+    # The pitch class of each fret of each string, MUTED frets reading the last item
+    strings_bits = np.left_shift(1, pitch_class(instrument.open_strings()[:, np.newaxis] + np.arange(n_frets + 2)))
+    strings_bits[:, -1] = 0
+    masks = np.bitwise_or.reduce(strings_bits[np.arange(instrument.count_strings()), frets], axis = 1)
+    # Fingerings being sorted easiest first, the first one of each mask is the easiest
+    unique_masks, i_first_fingerings = np.unique(masks, return_index = True)
+    i_easiest = np.full(N_PITCH_CLASSES_SETS, -1)
+    i_easiest[unique_masks] = i_first_fingerings
+    best_difficulties = np.where(i_easiest >= 0, difficulties[i_easiest], np.inf)
+    best_frets = np.where(i_easiest[:, np.newaxis] >= 0, frets[i_easiest], MUTED).astype(np.int8)
+    return TuningPositionIndex(best_difficulties, best_frets)
+
+
+class TuningPositionIndex:
+    """
+    A class that finds the easiest fingering of each pitch classes set
+    on a tuning.
+
+    Every fret vector within a span is enumerated once, position by
+    position, and the easiest one of each of the 4096 pitch classes
+    sets is kept, so that the difficulty of a chord on the tuning is a
+    single lookup. A chord is played by the fingerings whose pitch
+    classes are exactly the chord's, whatever their bass.
+
+    Parameters
+    ----------
+    best_difficulties : numpy array of N_PITCH_CLASSES_SETS floats
+        Difficulty of the easiest fingering of each pitch classes
+        bitmask, inf if none is found.
+    best_frets : numpy array of shape (N_PITCH_CLASSES_SETS, n_strings)
+        Frets of the easiest fingering of each pitch classes bitmask.
+
+    Examples
+    --------
+    >>> index = tuning_position_index(strings_instrument(['D3', 'A3', 'D4', 'G4', 'A4', 'D5']))
+    >>> index.difficulty(0b000010000100) # D and A: open strings
+    0.0
+    """
+    def __init__(self, best_difficulties, best_frets):
+        """ Builds an instance of TuningPositionIndex """
+        self._best_difficulties = best_difficulties
+        self._best_frets = best_frets
+
+    def difficulty(self, mask):
+        """ Returns the difficulty of the easiest fingering of a pitch classes bitmask, inf if none is found """
+        return float(self._best_difficulties[mask])
+
+    def voicing(self, mask):
+        """ Returns the frets, None standing for muted strings, of the easiest fingering of a pitch classes bitmask, None if none is found """
+        if self._best_difficulties[mask] == np.inf:
+            return None
+        return [i_fret if i_fret != MUTED else None for i_fret in self._best_frets[mask].tolist()]
+
+    def progression_difficulty(self, masks):
+        """ Returns the sum of the difficulties of the easiest fingerings of pitch classes bitmasks """
+        return float(self._best_difficulties[np.asarray(masks, dtype = np.intp)].sum())
+
+
+def candidate_tunings(reference_tuning, max_shift = DEFAULT_MAX_SHIFT):
+    """
+    Returns the tunings within a few semitones of a reference tuning.
+
+    Parameters
+    ----------
+    reference_tuning : list of two to three characters
+        Notes names of the open strings, as given to StringsInstrument.
+    max_shift : int, optional
+        Overrides DEFAULT_MAX_SHIFT. Each string is tuned up to
+        max_shift semitones down or up.
+
+    Returns
+    -------
+    out : list of lists of two to three characters
+        The tunings whose strings are sorted from lowest to highest
+        without unisons, as given to StringsInstrument.
+
+    Examples
+    --------
+    >>> len(candidate_tunings(['E3', 'A3', 'D4', 'G4', 'B4', 'E5'], max_shift = 1))
+    729
+    """
+    reference_notes = [notes_references[note_name] for note_name in reference_tuning]
+    all_notes = set(notes_references.values())
+    tunings = []
+    for shifts in product(range(-max_shift, max_shift + 1), repeat = len(reference_notes)):
+        i_notes = [i_note + shift for (i_note, shift) in zip(reference_notes, shifts)]
+        if all([i_note in all_notes for i_note in i_notes]) and all([low < high for (low, high) in zip(i_notes[:-1], i_notes[1:])]):
+            tunings.append([min(_keyboard_to_possible_notes_names(i_note), key = len) for i_note in i_notes])
+    return tunings
+
+
+def progression_lower_bound(tuning, masks):
+    """
+    Returns a lower bound of the difficulty of a progression on a
+    tuning, without enumerating its fingerings.
+
+    Each pitch class of a chord which is not the one of an open string
+    takes a fretted string at least, in the first position at least,
+    and a chord of more pitch classes than strings cannot be played.
+
+    Parameters
+    ----------
+    tuning : list of two to three characters
+        Notes names of the open strings.
+    masks : list of ints
+        Pitch classes bitmask of each chord of the progression.
+
+    Returns
+    -------
+    out : float
+        The lower bound, inf if a chord cannot be played.
+
+    Examples
+    --------
+    >>> progression_lower_bound(['D3', 'A3', 'D4', 'G4', 'A4', 'D5'], [0b000010010100]) # D major: F# is fretted
+    1.25
+    """
+    open_mask = 0
+    for note_name in tuning:
+        open_mask |= 1 << pitch_class(notes_references[note_name])
+    lower_bound = 0.
+    for mask in masks:
+        n_fretted_pitch_classes = bin(mask & ~open_mask).count('1')
+        if bin(mask).count('1') > len(tuning):
+            return float('inf')
+        lower_bound += FRETTED_STRING_WEIGHT * n_fretted_pitch_classes + (POSITION_WEIGHT if n_fretted_pitch_classes > 0 else 0.)
+    return lower_bound
+
+
+def tuning_search(progression, tunings, n_results = DEFAULT_N_RESULTS, span = DEFAULT_SPAN, n_frets = DEFAULT_N_FRETS, map_function = map):
+    """
+    Returns the tunings a chord progression is the easiest to play on.
+
+    Tunings are evaluated from the lowest lower bound of their
+    difficulty, by batches of EVALUATION_BATCH_SIZE mapped with
+    map_function. The search stops as soon as the lower bound of the
+    remaining tunings reaches the difficulty of the n_results-th best
+    tuning found, so that most tunings are never indexed.
+
+    Parameters
+    ----------
+    progression : list of ChordHarmonicProperties
+        The chords of the progression.
+    tunings : list of lists of two to three characters
+        Candidate tunings, as given to StringsInstrument, such as
+        returned by candidate_tunings.
+    n_results : int, optional
+        Overrides DEFAULT_N_RESULTS. Number of returned tunings.
+    span : int, optional
+        Overrides DEFAULT_SPAN. Number of frets under the hand.
+    n_frets : int, optional
+        Overrides DEFAULT_N_FRETS. Highest fret of the instrument.
+    map_function : function, optional
+        Overrides map. Execution backend tunings are evaluated with,
+        such as Pool.map to distribute them across cores.
+
+    Returns
+    -------
+    out : list of tuples (float, list of two to three characters)
+        The difficulty and tuning of the easiest tunings, easiest
+        first. Tunings the progression cannot be played on are left
+        out.
+
+    Examples
+    --------
+    >>> progression = [ChordHarmonicProperties(tonality, ChordsTypes.MAJOR_TRIAD, []) for tonality in ['D', 'G', 'A']]
+    >>> with multiprocessing.Pool() as pool:
+    ...     best_tunings = tuning_search(progression, candidate_tunings(guitar().tuning()), map_function = pool.map)
+    """
+    if n_results <= 0:
+        return []
+    masks = [chord_properties_mask(chord_properties) for chord_properties in progression]
+    bounds = [progression_lower_bound(tuning, masks) for tuning in tunings]
+    order = sorted([i_tuning for i_tuning in range(len(tunings)) if bounds[i_tuning] != float('inf')], key = lambda i_tuning: bounds[i_tuning])
+    evaluate = partial(_tuning_difficulty, masks = masks, span = span, n_frets = n_frets)
+    best = [] # heap of (-difficulty, -i_tuning) of the n_results easiest tunings found
+    i_next = 0
+    while i_next < len(order):
+        threshold = -best[0][0] if len(best) == n_results else float('inf')
+        batch = [i_tuning for i_tuning in order[i_next:i_next + EVALUATION_BATCH_SIZE] if bounds[i_tuning] < threshold]
+        if len(batch) == 0:
+            break
+        for (i_tuning, difficulty) in zip(batch, map_function(evaluate, [tunings[i_tuning] for i_tuning in batch])):
+            if difficulty != float('inf'):
+                heapq.heappush(best, (-difficulty, -i_tuning))
+                if len(best) > n_results:
+                    heapq.heappop(best)
+        i_next += EVALUATION_BATCH_SIZE
+    return [(-difficulty, tunings[-i_tuning]) for (difficulty, i_tuning) in sorted(best, reverse = True)]
+
+
+def _tuning_difficulty(tuning, masks, span, n_frets):
+    """ Returns the difficulty of a progression, given by its pitch classes bitmasks, on a tuning """
+    return tuning_position_index(strings_instrument(tuning), span, n_frets).progression_difficulty(masks)
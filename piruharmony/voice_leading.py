@@ -0,0 +1,147 @@
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+
+@lru_cache(maxsize = None)
+def _monotone_assignments(n_voices, n_targets):
+    """
+    Returns all non-decreasing onto assignments of voices to targets.
+
+    Parameters
+    ----------
+    n_voices : int
+        Number of voices of the larger voicing, at least n_targets.
+    n_targets : int
+        Number of voices of the smaller voicing.
+
+    Returns
+    -------
+    out : numpy array of shape (n_assignments, n_voices)
+        Row i gives, for each sorted voice, the index of the sorted
+        target it moves to. Every target receives a voice.
+
+    Examples
+    --------
+    >>> _monotone_assignments(3, 2)
+    array([[0, 1, 1],
+           [0, 0, 1]])
+    """
+    assignments = []
+    for breaks in combinations(range(1, n_voices), n_targets - 1):
+        assignment = np.zeros(n_voices, dtype = np.intp)
+        for i_break in breaks:
+            assignment[i_break:] += 1
+        assignments.append(assignment)
+    return np.array(assignments, dtype = np.intp).reshape(-1, n_voices)
+
+
+def _sorted_voicings_costs(voicings_a, voicings_b):
+    """ Returns the voice leading costs between rows of two sorted (n_pairs, n_voices) arrays """
+    if voicings_a.shape[1] < voicings_b.shape[1]:
+        voicings_a, voicings_b = voicings_b, voicings_a
+    assignments = _monotone_assignments(voicings_a.shape[1], voicings_b.shape[1])
+    movements = np.abs(voicings_a[:, np.newaxis, :] - voicings_b[:, assignments])
+    return movements.sum(axis = 2).min(axis = 1)
+
+
+def voice_leading_cost(voicing_a, voicing_b):
+    """
+    Returns the minimal voice leading cost between two voicings.
+
+    Parameters
+    ----------
+    voicing_a : list of int
+        Keyboard notes indices of the first voicing.
+    voicing_b : list of int
+        Keyboard notes indices of the second voicing.
+
+    Returns
+    -------
+    out : int
+        Smallest total number of semitones the voices move when each
+        note of the larger voicing moves to a note of the smaller one,
+        every note of the smaller voicing being reached. Voicings
+        without notes cost 0.
+
+    See Also
+    --------
+    voice_leading_costs : Returns the costs between two batches of
+        voicings.
+
+    Examples
+    --------
+    >>> voice_leading_cost([27, 31, 34], [27, 32, 36]) # C to F/C
+    3
+    >>> voice_leading_cost([22, 29, 34, 38], [27, 31, 34]) # G to C
+    11
+    """
+    return int(voice_leading_costs([voicing_a], [voicing_b])[0])
+
+
+def voice_leading_costs(voicings_a, voicings_b):
+    """
+    Returns the minimal voice leading costs between two batches of
+    voicings.
+
+    For distances along the keyboard, an optimal assignment never
+    crosses voices, so only the non-decreasing assignments between
+    sorted voicings are evaluated. Pairs are grouped by number of
+    voices and each group is scored with array operations.
+
+    Parameters
+    ----------
+    voicings_a : list of lists of int
+        Keyboard notes indices of the first voicing of each pair.
+    voicings_b : list of lists of int
+        Keyboard notes indices of the second voicing of each pair.
+
+    Returns
+    -------
+    out : numpy array of ints
+        Voice leading cost of each pair, as in voice_leading_cost.
+
+    See Also
+    --------
+    voice_leading_cost : Returns the cost between two voicings.
+
+    Examples
+    --------
+    >>> voice_leading_costs([[27, 31, 34], [27, 31, 34]], [[27, 32, 36], [26, 29, 32, 34]])
+    array([3, 4])
+    """
+    costs = np.zeros(len(voicings_a), dtype = np.int64)
+    pairs_by_sizes = {}
+    for (i_pair, (voicing_a, voicing_b)) in enumerate(zip(voicings_a, voicings_b)):
+        if len(voicing_a) > 0 and len(voicing_b) > 0:
+            pairs_by_sizes.setdefault((len(voicing_a), len(voicing_b)), []).append(i_pair)
+    for i_pairs in pairs_by_sizes.values():
+        sorted_a = np.sort(np.array([voicings_a[i_pair] for i_pair in i_pairs], dtype = np.int64), axis = 1)
+        sorted_b = np.sort(np.array([voicings_b[i_pair] for i_pair in i_pairs], dtype = np.int64), axis = 1)
+        costs[i_pairs] = _sorted_voicings_costs(sorted_a, sorted_b)
+    return costs
+
+
+def progression_voice_leading_costs(voicings):
+    """
+    Returns the voice leading costs between consecutive voicings of a
+    progression.
+
+    Parameters
+    ----------
+    voicings : list of lists of int
+        Keyboard notes indices of each voicing of the progression.
+
+    Returns
+    -------
+    out : numpy array of len(voicings) - 1 ints
+        Element i is the cost of moving from voicings[i] to
+        voicings[i + 1].
+
+    Examples
+    --------
+    >>> progression_voice_leading_costs([[27, 31, 34], [27, 32, 36], [26, 29, 32, 34], [27, 31, 34]])
+    array([3, 5, 4])
+    """
+    return voice_leading_costs(voicings[:-1], voicings[1:])
@@ -0,0 +1,303 @@
+import heapq
+import os.path
+
+import numpy as np
+
+from instruments import MUTED, keyboard_masks
+from set_classes import N_PITCH_CLASSES_SETS
+
+
+DEFAULT_N_NEIGHBOURS = 5
+DEFAULT_PITCH_CLASSES_WEIGHT = 4.
+DEFAULT_MUTED_STRING_DISTANCE = 2.
+DEFAULT_LEAF_SIZE = 64
+NO_NODE = -1
+INDEX_ARRAYS_NAMES = ['open_strings', 'parameters', 'frets', 'masks', 'order', 'vantages', 'inside_radii', 'outside_radii', 'insides', 'outsides', 'leaves_starts', 'leaves_ends']
+_POPCOUNTS = np.array([bin(mask).count('1') for mask in range(N_PITCH_CLASSES_SETS)], dtype = np.float64)
+
+
+def frets_array(frets_vectors, n_strings = None):
+    """
+    Returns fret vectors as an integer array.
+
+    Parameters
+    ----------
+    frets_vectors : list of lists of int or None
+        Fret of each string, None standing for a muted string.
+    n_strings : int, optional
+        Overrides None. Number of strings, which sets the shape of the
+        array of an empty list of fret vectors, (0, 0) if None.
+
+    Returns
+    -------
+    out : numpy array of shape (len(frets_vectors), n_strings)
+        The frets, muted strings being set to MUTED.
+
+    Examples
+    --------
+    >>> frets_array([[None, 3, 2, 0, 1, 0]])
+    array([[-1,  3,  2,  0,  1,  0]], dtype=int8)
+    >>> frets_array([], n_strings = 6).shape
+    (0, 6)
+    """
+    if len(frets_vectors) == 0:
+        return np.zeros((0, n_strings if n_strings != None else 0), dtype = np.int8)
+    return np.array([[MUTED if i_fret == None else i_fret for i_fret in i_frets] for i_frets in frets_vectors], dtype = np.int8).reshape(len(frets_vectors), -1)
+
+
+def frets_masks(open_strings, frets):
+    """
+    Returns the pitch classes bitmask of fret vectors.
+
+    Parameters
+    ----------
+    open_strings : numpy array of n_strings ints
+        Keyboard note index of each open string.
+    frets : numpy array of shape (n_voicings, n_strings)
+        Frets of each voicing, muted strings being set to MUTED.
+
+    Returns
+    -------
+    out : numpy array of n_voicings ints
+        Bitmask where bit i is set if pitch class i is played.
+
+    Examples
+    --------
+    >>> frets_masks(np.array([31, 36, 41, 46, 50, 55]), frets_array([[None, 3, 2, 0, 1, 0]])) # C major on a guitar
+    array([145])
+    """
+    return keyboard_masks(np.where(frets != MUTED, open_strings + frets.astype(np.int64), MUTED))
+
+
+def voicing_index(instrument, frets_vectors, pitch_classes_weight = DEFAULT_PITCH_CLASSES_WEIGHT, muted_string_distance = DEFAULT_MUTED_STRING_DISTANCE,
+                  leaf_size = DEFAULT_LEAF_SIZE):
+    """
+    Returns an instance of class VoicingIndex built over a catalog of
+    voicings.
+
+    Parameters
+    ----------
+    instrument : StringsInstrument
+        The instrument the voicings are played on.
+    frets_vectors : list of lists of int or None, or numpy array
+        Fret of each string of each voicing of the catalog, as given
+        to StringsInstrument.to_keyboard, or an array of them where
+        muted strings are set to MUTED.
+    pitch_classes_weight : float, optional
+        Overrides DEFAULT_PITCH_CLASSES_WEIGHT. Weight of the Jaccard
+        distance between pitch classes.
+    muted_string_distance : float, optional
+        Overrides DEFAULT_MUTED_STRING_DISTANCE. Distance on a string
+        played in one voicing and muted in the other. Fret distances
+        on a string are capped to twice this distance.
+    leaf_size : int, optional
+        Overrides DEFAULT_LEAF_SIZE. Largest number of voicings in a
+        leaf of the tree.
+
+    Returns
+    -------
+    out : VoicingIndex
+        The instance of class VoicingIndex of the catalog, voicing i
+        being the i-th fret vector.
+
+    See Also
+    --------
+    VoicingIndex : a class that finds the voicings of a catalog most
+        similar to a voicing.
+    load_voicing_index : Loads an instance of class VoicingIndex saved
+        on disk.
+
+    Examples
+    --------
+    >>> index = voicing_index(guitar(), [[None, 3, 2, 0, 1, 0], [3, 2, 0, 0, 0, 3], [None, 3, 5, 5, 5, 3]])
+    >>> index.nearest_voicings([[None, 3, 2, 0, 1, None]], k = 2)[0]
+    array([[0, 1]])
+    """
+    open_strings = instrument.open_strings()
+    frets = np.asarray(frets_vectors, dtype = np.int8) if isinstance(frets_vectors, np.ndarray) else frets_array(frets_vectors, instrument.count_strings())
+    masks = frets_masks(open_strings, frets)
+    parameters = np.array([pitch_classes_weight, muted_string_distance])
+    return VoicingIndex(open_strings, parameters, frets, masks, *_built_tree_arrays(frets, masks, parameters, leaf_size))
+
+
+def _voicings_distances(frets, masks, other_frets, other_masks, parameters):
+    """ Returns the distances between voicings, broadcasting over their first axis """
+    pitch_classes_weight, muted_string_distance = parameters
+    frets, other_frets = frets.astype(np.int64), other_frets.astype(np.int64)
+    played, other_played = frets != MUTED, other_frets != MUTED
+    strings_distances = np.where(played & other_played, np.minimum(np.abs(frets - other_frets), 2 * muted_string_distance), 0.)
+    strings_distances += muted_string_distance * (played != other_played)
+    unions = _POPCOUNTS[masks | other_masks]
+    jaccard_distances = np.where(unions > 0, 1. - _POPCOUNTS[masks & other_masks] / np.maximum(unions, 1.), 0.)
+    return strings_distances.sum(axis = -1) + pitch_classes_weight * jaccard_distances
+
+
+def _built_tree_arrays(frets, masks, parameters, leaf_size):
+    """ Returns the arrays of the vantage-point tree of voicings, in the order of INDEX_ARRAYS_NAMES """
+    order = np.arange(len(frets))
+    vantages, inside_radii, outside_radii, insides, outsides, leaves_starts, leaves_ends = [], [], [], [], [], [], []
+    stack = [(0, len(frets), NO_NODE, False)] # range of order, parent node, is an inside child
+    while len(stack) > 0:
+        start, end, parent, is_inside = stack.pop()
+        i_node = len(vantages)
+        if parent != NO_NODE:
+            (insides if is_inside else outsides)[parent] = i_node
+        vantages.append(NO_NODE); inside_radii.append(0.); outside_radii.append(0.)
+        insides.append(NO_NODE); outsides.append(NO_NODE); leaves_starts.append(start); leaves_ends.append(end)
+        if end - start <= leaf_size:
+            continue
+        # The vantage point is the node's first voicing, the others are split around their median distance to it
+        vantage = order[start]
+        others = order[start + 1:end]
+        distances = _voicings_distances(frets[others], masks[others], frets[vantage], masks[vantage], parameters)
+        i_median = len(others) // 2
+        partition = np.argpartition(distances, i_median)
+        order[start + 1:end] = others[partition]
+        vantages[i_node] = vantage
+        inside_radii[i_node] = distances[partition[:i_median]].max() if i_median > 0 else 0.
+        outside_radii[i_node] = distances[partition[i_median:]].min()
+        stack.append((start + 1, start + 1 + i_median, i_node, True))
+        stack.append((start + 1 + i_median, end, i_node, False))
+    return (order, np.array(vantages, dtype = np.int64), np.array(inside_radii), np.array(outside_radii), np.array(insides, dtype = np.int64),
+            np.array(outsides, dtype = np.int64), np.array(leaves_starts, dtype = np.int64), np.array(leaves_ends, dtype = np.int64))
+
+
+def load_voicing_index(directory, mmap_mode = 'r'):
+    """
+    Loads an instance of class VoicingIndex saved on disk.
+
+    Parameters
+    ----------
+    directory : str
+        Directory the index was saved into by VoicingIndex.save.
+    mmap_mode : str or None, optional
+        Overrides 'r'. Memory-map mode of the arrays, as in numpy.load,
+        so that a query only reads the pages of the nodes it visits.
+        None loads the whole index in memory.
+
+    Returns
+    -------
+    out : VoicingIndex
+        The loaded instance of class VoicingIndex.
+
+    Examples
+    --------
+    >>> voicing_index(guitar(), [[None, 3, 2, 0, 1, 0]]).save('voicings_directory')
+    >>> load_voicing_index('voicings_directory').count_voicings()
+    1
+    """
+    return VoicingIndex(*[np.load(os.path.join(directory, name + '.npy'), mmap_mode = mmap_mode) for name in INDEX_ARRAYS_NAMES])
+
+
+class VoicingIndex:
+    """
+    A class that finds the voicings of a catalog most similar to a
+    voicing.
+
+    The distance between two voicings sums, string by string, their
+    fret distances, a fixed distance on strings played in only one of
+    them, and the weighted Jaccard distance between their pitch
+    classes. This distance is a metric, so that voicings are arranged
+    in a vantage-point tree: each node splits its voicings around the
+    median distance to a vantage voicing, and queries skip the nodes
+    that cannot hold a closer voicing than the k best found so far.
+
+    Parameters
+    ----------
+    open_strings : numpy array of n_strings ints
+        Keyboard note index of each open string.
+    parameters : numpy array of two floats
+        Pitch classes weight and muted string distance.
+    frets : numpy array of shape (n_voicings, n_strings)
+        Frets of the catalog, muted strings being set to MUTED.
+    masks : numpy array of n_voicings ints
+        Pitch classes bitmask of each voicing of the catalog.
+    order, vantages, inside_radii, outside_radii, insides, outsides,
+    leaves_starts, leaves_ends : numpy arrays
+        The vantage-point tree, as built by voicing_index.
+
+    Examples
+    --------
+    >>> index = voicing_index(guitar(), catalog)
+    >>> i_voicings, distances = index.nearest_voicings([[None, 3, 2, 0, 1, 0], [0, 2, 2, 1, 0, 0]], k = 10)
+    """
+    def __init__(self, open_strings, parameters, frets, masks, order, vantages, inside_radii, outside_radii, insides, outsides, leaves_starts, leaves_ends):
+        """ Builds an instance of VoicingIndex """
+        self._open_strings = open_strings
+        self._parameters = parameters
+        self._frets = frets
+        self._masks = masks
+        self._order = order
+        self._vantages = vantages
+        self._inside_radii = inside_radii
+        self._outside_radii = outside_radii
+        self._insides = insides
+        self._outsides = outsides
+        self._leaves_starts = leaves_starts
+        self._leaves_ends = leaves_ends
+
+    def count_voicings(self):
+        """ Returns the number of voicings of the catalog """
+        return len(self._frets)
+
+    def frets(self):
+        """ Returns the (n_voicings, n_strings) frets of the catalog """
+        return self._frets
+
+    def distances(self, i_frets, i_voicings):
+        """ Returns the distances between a fret vector and voicings of the catalog """
+        frets = frets_array([i_frets]) if not isinstance(i_frets, np.ndarray) else np.asarray(i_frets, dtype = np.int8).reshape(1, -1)
+        mask = frets_masks(self._open_strings, frets)[0]
+        return _voicings_distances(self._frets[i_voicings], self._masks[i_voicings], frets[0], mask, self._parameters)
+
+    def _nearest_voicings(self, frets, mask, k):
+        """ Returns the k nearest voicings to a voicing, as (distance, index) pairs sorted by distance """
+        best = [] # heap of (-distance, -index)
+        if k <= 0:
+            return best
+        nodes = [0]
+        while len(nodes) > 0:
+            i_node = nodes.pop()
+            vantage = self._vantages[i_node]
+            if vantage == NO_NODE:
+                i_voicings = self._order[self._leaves_starts[i_node]:self._leaves_ends[i_node]]
+            else:
+                i_voicings = [vantage]
+            distances = _voicings_distances(self._frets[i_voicings], self._masks[i_voicings], frets, mask, self._parameters)
+            for (distance, i_voicing) in zip(distances.tolist(), np.asarray(i_voicings).tolist()):
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, -i_voicing))
+                elif (-distance, -i_voicing) > best[0]:
+                    heapq.heapreplace(best, (-distance, -i_voicing))
+            if vantage == NO_NODE:
+                continue
+            vantage_distance = distances[0]
+            tau = -best[0][0] if len(best) == k else np.inf
+            children = []
+            if vantage_distance - tau <= self._inside_radii[i_node]:
+                children.append((vantage_distance - self._inside_radii[i_node], self._insides[i_node]))
+            if vantage_distance + tau >= self._outside_radii[i_node]:
+                children.append((self._outside_radii[i_node] - vantage_distance, self._outsides[i_node]))
+            # The most promising child is pushed last, so that it is visited first
+            nodes += [i_child for (_, i_child) in sorted(children, reverse = True)]
+        return sorted([(-distance, -i_voicing) for (distance, i_voicing) in best])
+
+    def nearest_voicings(self, frets_vectors, k = DEFAULT_N_NEIGHBOURS):
+        """ Returns the (n_queries, k) indices and distances of the k voicings of the catalog nearest to each fret vector """
+        frets = frets_vectors if isinstance(frets_vectors, np.ndarray) else frets_array(frets_vectors, len(self._open_strings))
+        masks = frets_masks(self._open_strings, frets)
+        k = max(0, min(k, self.count_voicings()))
+        i_voicings, distances = np.empty((len(frets), k), dtype = np.int64), np.empty((len(frets), k))
+        for i_query in range(len(frets)):
+            neighbours = self._nearest_voicings(frets[i_query], masks[i_query], k)
+            distances[i_query], i_voicings[i_query] = zip(*neighbours) if k > 0 else ((), ())
+        return i_voicings, distances
+
+    def save(self, directory):
+        """ Saves the index arrays into a directory, created if needed """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        arrays = [self._open_strings, self._parameters, self._frets, self._masks, self._order, self._vantages, self._inside_radii, self._outside_radii,
+                  self._insides, self._outsides, self._leaves_starts, self._leaves_ends]
+        for (name, array) in zip(INDEX_ARRAYS_NAMES, arrays):
+            np.save(os.path.join(directory, name + '.npy'), np.asarray(array))